@@ -1,21 +1,73 @@
 # backend/app.py
-from fastapi import FastAPI, File, UploadFile
+import time
+_import_started = time.perf_counter()
+import asyncio
+import contextvars
+import io
+import json
+import math
+import os
+import weakref
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from functools import partial
+from typing import List, Optional
+# before anything loads numpy / torch / faiss: split the cores across workers
+from backend import thread_budget
+thread_budget.apply()
+import anyio.to_thread
+from fastapi import Depends, FastAPI, File, Header, HTTPException, UploadFile
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
 from fastapi.middleware.cors import CORSMiddleware
-from backend.retrieval import retrieve_top_facts
+from backend.retrieval import embed_queries, retrieve_top_facts, snapshots
 from backend.reranker import rerank_with_cross_encoder
 from backend.utils import normalize_text, extract_text_from_pdf
-from backend.stance_ml import classify_stance_ml, aggregate_ml_verdict
-from backend.ml_fallback import MLFallbackClassifier
+from backend.stance_ml import classify_stance_ml, aggregate_ml_verdict, is_low_information_claim, ensure_tokenizers
+from backend.ml_fallback import MLFallbackClassifier, SpeculativeFallback, is_weak_evidence
+from backend import metrics, profiling
+from backend.metrics import stage
+from backend.models import current_rss_bytes, registry
+from backend.startup import Startup
+from backend.verdict_cache import VerdictCache, claim_key
 from backend.translate import (
     detect_lang,
     safe_lang,
-    translate_to_english,
-    translate_from_english
+    translate_to_english_async,
+    translate_many_from_english_async
 )
 
 fallback_classifier = MLFallbackClassifier()
-app = FastAPI()
+# FALLBACK_SPECULATION: run the fallback next to RAG instead of after it
+speculation = SpeculativeFallback(fallback_classifier)
+
+# nothing above loads data or a model; the lifespan warms them up in the
+# background while /healthz already answers
+startup = Startup()
+startup.record("imports", time.perf_counter() - _import_started)
+MODEL_WARMUP = os.getenv("MODEL_WARMUP", "1") == "1"
+
+def _warmup_steps():
+    steps = [
+        ("tokenizers", ensure_tokenizers),
+        ("snapshot", lambda: f"version {snapshots.current().version}"),
+    ]
+    steps += [(f"model:{m}", partial(registry.warmup, [m])) for m in registry.registered()]
+    steps.append(("retrieval", lambda: retrieve_top_facts("warmup", top_k=1)))
+    return steps
+
+@asynccontextmanager
+async def lifespan(app):
+    layout = thread_budget.apply()
+    if layout["enabled"]:
+        print(f"[startup] worker {os.getpid()}: {layout['cores_per_worker']} of {layout['cores']} cores, "
+              f"{layout['model_concurrency']} model slot(s) x {layout['intra_op_threads']} thread(s)")
+    startup.start(_warmup_steps(), enabled=MODEL_WARMUP)
+    yield
+
+app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -26,162 +78,490 @@ app.add_middleware(
 class ClaimRequest(BaseModel):
     claim: str
 
+class BatchClaimRequest(BaseModel):
+    claims: List[str]
+
+class ProfilingRequest(BaseModel):
+    enabled: Optional[bool] = None
+    sample_rate: Optional[float] = None
+    interval_ms: Optional[float] = None
+    torch: Optional[bool] = None
+
+# CPU-bound model stages run here, off the event loop. Threads mostly wait
+# on the model micro-batchers, so this can be larger than the batch count;
+# it bounds how many requests are inside model stages at once.
+MODEL_EXECUTOR_WORKERS = int(os.getenv("MODEL_EXECUTOR_WORKERS", "16"))
+_model_pool = ThreadPoolExecutor(max_workers=MODEL_EXECUTOR_WORKERS, thread_name_prefix="model")
+
+async def run_model(fn, *args, **kwargs):
+    loop = asyncio.get_running_loop()
+    # the request's context (metrics breakdown) goes along into the thread
+    ctx = contextvars.copy_context()
+    return await loop.run_in_executor(_model_pool, partial(ctx.run, profiling.wrap(fn), *args, **kwargs))
+
+# finished results by claim (exact + near-duplicate), dropped on snapshot swap
+verdict_cache = VerdictCache()
+snapshots.on_swap(lambda snap: verdict_cache.invalidate(snap.version))
+
+metrics.Gauge("factcheck_verdict_cache_items", "Entries in the verdict cache", lambda: verdict_cache.stats()["items"])
+metrics.Gauge("factcheck_loaded_model_bytes", "Memory of loaded models", lambda: registry.memory_report()["loaded_model_bytes"])
+metrics.Gauge("factcheck_process_rss_bytes", "Resident set size of this worker", current_rss_bytes)
+_in_flight = [0]        # claims inside _verify_claim (event loop only)
+metrics.Gauge("factcheck_claims_in_flight", "Claims being verified", lambda: _in_flight[0])
+metrics.Gauge("factcheck_ready", "1 once the startup warmup finished", lambda: int(startup.ready))
+
+# an X-Debug-Timing header on /verify or /verify/stream returns the claim's
+# stage timings + counts in a `debug` field
+def _debug_requested(value) -> bool:
+    return value is not None and value.lower() not in ("", "0", "false", "no")
+
+@app.get("/metrics")
+def metrics_endpoint():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
 @app.get("/")
 def root():
     return {"status": "ok"}
 
+@app.get("/healthz")
+def healthz():
+    return {"status": "alive"}
+
+@app.get("/readyz")
+def readyz():
+    # 503 until the warmup finished, so traffic only reaches warm replicas
+    report = startup.report()
+    return JSONResponse(report, status_code=200 if report["ready"] else 503)
+
+@app.get("/models")
+def models():
+    return registry.memory_report()
+
+@app.get("/admin/snapshot")
+def snapshot_info():
+    snap = snapshots.current()
+    return {
+        "version": snap.version,
+        "rows": snap.ntotal,
+        "segments": [{"start": s.start, "end": s.end} for s in snap.segments],
+    }
+
+@app.get("/admin/verdict-cache")
+def verdict_cache_info():
+    return verdict_cache.stats()
+
+@app.get("/admin/fallback")
+def fallback_info():
+    return speculation.stats()
+
+@app.get("/admin/threads")
+def threads_info():
+    return thread_budget.layout()
+
+@app.post("/admin/snapshot/reload")
+def snapshot_reload():
+    # the watcher also polls; this makes a fresh ingest visible right away
+    swapped = snapshots.reload()
+    return {"swapped": swapped, "version": snapshots.version()}
+
+def _profiling_admin():
+    # off unless PROFILING_ADMIN=1: no auth here, and profiles hold claim text
+    if not profiling.PROFILING_ADMIN:
+        raise HTTPException(status_code=404)
+
+@app.get("/admin/profiling", dependencies=[Depends(_profiling_admin)])
+def profiling_info():
+    return {"settings": profiling.settings(), "profiles": [p.summary() for p in profiling.profiles()]}
+
+@app.post("/admin/profiling", dependencies=[Depends(_profiling_admin)])
+def profiling_configure(req: ProfilingRequest):
+    return profiling.configure(enabled=req.enabled, sample_rate=req.sample_rate,
+                               interval_ms=req.interval_ms, torch=req.torch)
+
+@app.get("/admin/profiles/collapsed", dependencies=[Depends(_profiling_admin)])
+def profiles_collapsed(stage: Optional[str] = None):
+    # every kept profile merged; pipe into flamegraph.pl or load in speedscope
+    return PlainTextResponse(profiling.merged_collapsed(stage))
+
+@app.get("/admin/profiles/{profile_id}", dependencies=[Depends(_profiling_admin)])
+def profile_detail(profile_id: int):
+    prof = profiling.get(profile_id)
+    if prof is None:
+        return JSONResponse({"detail": "unknown profile"}, status_code=404)
+    return {**prof.summary(), "torch_ops": prof.torch_report()}
+
+@app.get("/admin/profiles/{profile_id}/collapsed", dependencies=[Depends(_profiling_admin)])
+def profile_collapsed(profile_id: int, stage: Optional[str] = None):
+    prof = profiling.get(profile_id)
+    if prof is None:
+        return JSONResponse({"detail": "unknown profile"}, status_code=404)
+    return PlainTextResponse(prof.collapsed(stage))
+
 @app.post("/upload-pdf")
 async def upload_pdf(file: UploadFile = File(...)):
     try:
         contents = await file.read()
-        tmp_path = "tmp_uploaded.pdf"
-        with open(tmp_path, "wb") as f:
-            f.write(contents)
-        text = extract_text_from_pdf(tmp_path)
+        # off the event loop (starlette's threadpool), and no shared temp
+        # file between concurrent uploads
+        text = await anyio.to_thread.run_sync(extract_text_from_pdf, io.BytesIO(contents))
         return {"text": text}
     except Exception as e:
         return {"error": str(e)}
 
 @app.post("/verify")
-def verify(req: ClaimRequest):
+async def verify(req: ClaimRequest, x_debug_timing: Optional[str] = Header(None),
+                 x_profile: Optional[str] = Header(None)):
+    return await _verify_claim(req.claim, debug=_debug_requested(x_debug_timing),
+                               profile=_debug_requested(x_profile))
+
+# ----------------------------
+# Streaming /verify (NDJSON)
+# ----------------------------
+# events that show the user something: the time to the first of them is
+# the stream's time-to-first-useful-byte
+USEFUL_EVENTS = {"evidence", "verdict", "result"}
+_ttfub_ms = deque(maxlen=1000)
+
+@app.post("/verify/stream")
+async def verify_stream(req: ClaimRequest, x_debug_timing: Optional[str] = Header(None),
+                        x_profile: Optional[str] = Header(None)):
+    """
+    One JSON object per line, as each stage finishes:
+    language, claim, evidence, stance (one per item), verdict,
+    translation (one per segment, as it arrives), then result (the same
+    body /verify returns).
+    """
+    started = time.perf_counter()
+    queue = asyncio.Queue()
+
+    def emit(event, **data):
+        queue.put_nowait({"event": event, **data})
+
+    async def run():
+        try:
+            result = await _verify_claim(req.claim, emit, debug=_debug_requested(x_debug_timing),
+                                         profile=_debug_requested(x_profile), endpoint="stream")
+            emit("result", **result)
+        finally:
+            queue.put_nowait(None)
+
+    async def lines():
+        task = asyncio.ensure_future(run())
+        first_useful = None
+        try:
+            while True:
+                item = await queue.get()
+                if item is None:
+                    break
+                if first_useful is None and item["event"] in USEFUL_EVENTS:
+                    first_useful = (time.perf_counter() - started) * 1000
+                    _ttfub_ms.append(first_useful)
+                    metrics.STREAM_TTFUB.observe(first_useful / 1000)
+                    item["ttfub_ms"] = round(first_useful, 1)
+                yield json.dumps(jsonable_encoder(item), ensure_ascii=False) + "\n"
+        finally:
+            # client went away: stop the pipeline
+            task.cancel()
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+@app.get("/admin/stream")
+def stream_info():
+    xs = sorted(_ttfub_ms)
+    pct = lambda q: round(xs[max(0, math.ceil(q * len(xs)) - 1)], 1) if xs else None
+    return {"streams": len(xs), "ttfub_ms": {"p50": pct(0.5), "p95": pct(0.95), "max": pct(1.0)}}
+
+# where requests queue under load (benchmarks/load_test.py polls this)
+@app.get("/admin/load")
+async def load_info():
+    # async: anyio's limiter (starlette's threadpool for sync endpoints) lives on the event loop
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    slots = thread_budget.layout()
+    return {
+        "claims_in_flight": _in_flight[0],
+        "threadpool": {"busy": limiter.borrowed_tokens, "size": limiter.total_tokens},
+        "model_executor": {"queued": _model_pool._work_queue.qsize(), "size": MODEL_EXECUTOR_WORKERS},
+        "model_slots": {"active": slots["model_slots_active"], "size": slots["model_concurrency"],
+                        "waits": slots["model_slot_waits"]},
+    }
+
+# claims of /verify-batch requests inside the pipeline at once (all batches
+# of this worker together), so one large batch cannot fill the model
+# executor and the translation pool ahead of other requests
+VERIFY_BATCH_CONCURRENCY = int(os.getenv("VERIFY_BATCH_CONCURRENCY", str(MODEL_EXECUTOR_WORKERS * 2)))
+_batch_slots = weakref.WeakKeyDictionary()      # event loop -> asyncio.Semaphore
+
+async def _verify_batch_claim(claim: str):
+    loop = asyncio.get_running_loop()
+    slots = _batch_slots.get(loop)
+    if slots is None:
+        slots = _batch_slots[loop] = asyncio.Semaphore(max(1, VERIFY_BATCH_CONCURRENCY))
+    async with slots:
+        return await _verify_claim(claim, endpoint="batch")
+
+@app.post("/verify-batch")
+async def verify_batch(req: BatchClaimRequest):
+    # claims run side by side (up to VERIFY_BATCH_CONCURRENCY) so the model
+    # micro-batchers can merge their forward passes
+    results = await asyncio.gather(*(_verify_batch_claim(c) for c in req.claims))
+    return {"results": list(results)}
+
+def _no_emit(event, **data):
+    pass
+
+async def _verify_claim(claim: str, emit=_no_emit, debug: bool = False, profile: bool = False,
+                        endpoint: str = "verify"):
+    """
+    `emit(event, **data)` receives stage results as they finish (see
+    /verify/stream). `debug` adds the claim's stage timings and counts;
+    `profile` profiles the claim if profiling is on (see /admin/profiling).
+    """
+    metrics.CLAIMS.inc(endpoint=endpoint)
+    _in_flight[0] += 1
+    try:
+        with metrics.request_scope() as timing, profiling.request(claim, forced=profile) as prof:
+            result = await _verify_one(claim, emit)
+    finally:
+        _in_flight[0] -= 1
+    if prof is not None:
+        prof.timing = timing
+        if debug:
+            timing["profile_id"] = prof.id
+    if debug:
+        result = {**result, "debug": timing}
+    return result
+
+async def _verify_one(claim: str, emit=_no_emit):
     try:
         # 1) original + detect language
-        original_claim = req.claim.strip()
-        user_lang = detect_lang(original_claim) or "en"     # from translate.py
+        original_claim = claim.strip()
+        with stage("language"):
+            user_lang = await run_model(detect_lang, original_claim) or "en"     # from translate.py
         user_lang = safe_lang(user_lang)                    # ensure valid code
+        emit("language", lang=user_lang)
 
-        # 2) translate claim -> English (for RAG + NLI)
-        claim_en = translate_to_english(original_claim)
+        if not verdict_cache.enabled:
+            return await _verify_uncached(original_claim, user_lang, emit=emit)
 
-        print(f"[verify] user_lang={user_lang} claim_en={claim_en[:150]}")
+        # exact repeat → cached result; identical claims in flight → one run
+        key = claim_key(original_claim, user_lang)
+        cached = verdict_cache.get(key)
+        if cached is not None:
+            metrics.CACHE_LOOKUPS.inc(result="exact")
+            metrics.VERDICTS.inc(verdict=cached.get("verdict"), source="exact")
+            return cached
+        # every caller's emit gets the stage events, whichever one runs it
+        return await verdict_cache.single_flight(
+            key, lambda shared_emit: _verify_uncached(original_claim, user_lang, key, shared_emit), emit)
 
+    except Exception as e:
+        metrics.ERRORS.inc()
+        print("ERROR in /verify:", e)
+        import traceback
+        traceback.print_exc()
+        return {
+            "error": str(e),
+            "verdict": "ERROR",
+            "confidence": 0
+        }
+
+async def _verify_uncached(original_claim: str, user_lang: str, key=None, emit=_no_emit):
+    version = snapshots.version()
+
+    # 2) translate claim -> English (for RAG + NLI); language detected once above
+    with stage("translate_claim"):
+        claim_en = await translate_to_english_async(original_claim, source=user_lang)
+
+    print(f"[verify] user_lang={user_lang} claim_en={claim_en[:150]}")
+    emit("claim", claim_en=claim_en)
+
+    # the English claim is embedded once: semantic cache lookup, retrieval, stance
+    with stage("embed"):
+        claim_vec = (await run_model(embed_queries, [claim_en]))[0]
+
+    if key is not None:
+        similar = verdict_cache.get_similar(claim_vec, user_lang)
+        if similar is not None:
+            metrics.CACHE_LOOKUPS.inc(result="semantic")
+            metrics.VERDICTS.inc(verdict=similar.get("verdict"), source="semantic")
+            print(f"[verify] near-duplicate of a cached claim (sim={similar['cache_similarity']})")
+            return similar
+
+        metrics.CACHE_LOOKUPS.inc(result="miss")
+
+    result = await _run_pipeline(claim_en, claim_vec, user_lang, emit)
+    if key is not None:
+        verdict_cache.put(key, result, vec=claim_vec, version=version)
+    return result
+
+async def _run_pipeline(claim_en: str, claim_vec, user_lang: str, emit=_no_emit):
+    speculative = None
+    if speculation.policy == "always":
+        speculative = speculation.start(run_model, claim_en)
+    try:
         # 3) retrieve + rerank (EN)
-        retrieved = retrieve_top_facts(claim_en)
-        reranked = rerank_with_cross_encoder(claim_en, retrieved)
+        with stage("retrieve"):
+            retrieved = await run_model(retrieve_top_facts, claim_en, q_vec=claim_vec)
+        if (speculative is None and speculation.policy == "weak"
+                and is_weak_evidence(retrieved, is_low_information_claim(claim_en))):
+            speculative = speculation.start(run_model, claim_en)
+        with stage("rerank"):
+            reranked = await run_model(rerank_with_cross_encoder, claim_en, retrieved)
 
         print(f"[verify] retrieved {len(reranked)} docs (top idxs: {[d.get('idx') for d in reranked]})")
 
         # 4) add English summary field (ensure consistent naming)
         for ev in reranked:
             # some docs might already have 'summary' or 'fact_text'
-            summary_en = ev.get("summary") or ev.get("fact_text") or ev.get("text") or ""
+            summary_en = ev.get("summary_en") or ev.get("summary") or ev.get("fact_text") or ev.get("text") or ""
             ev["summary_en"] = str(summary_en)
             # initialise translated field (fill later)
             ev["summary_translated"] = None
+        emit("evidence", items=[
+            {"idx": ev.get("idx"), "score": ev.get("score"), "rerank_score": ev.get("_rerank_score"),
+             "summary_en": ev["summary_en"]}
+            for ev in reranked
+        ])
 
         # 5) sentence-level stance classification (works on English)
-        stance_results = classify_stance_ml(claim_en, reranked)  # returns enriched items with best_sentence (EN)
+        with stage("stance"):
+            stance_results = await run_model(classify_stance_ml, claim_en, reranked, claim_emb=claim_vec)  # returns enriched items with best_sentence (EN)
 
         print(f"[verify] stance_results len={len(stance_results)} example_stance={stance_results[0].get('stance','?') if stance_results else 'n/a'}")
+        for s in stance_results:
+            emit("stance", idx=s.get("idx"), stance=s.get("stance"),
+                 stance_confidence=s.get("stance_confidence"), best_sentence_en=s.get("best_sentence"))
 
         # 6) Aggregate verdict
         verdict, conf = aggregate_ml_verdict(stance_results)
+    except BaseException:
+        if speculative is not None:
+            speculation.discard(speculative)
+        raise
+
+    # --- Fallback Detector (stronger) ---
+    weak_evidence = (
+        len(stance_results) == 0 or
+        max([s.get("stance_confidence", 0) for s in stance_results]) < 60 or
+        all(s.get("stance") == "neutral" for s in stance_results) or
+        (all(s.get("stance") == "support" for s in stance_results) and max([d.get("score", 0) for d in reranked]) < 0.30)
+    )
+
+    if verdict != "USE_ML_MODEL" and speculative is not None:
+        speculation.discard(speculative)
+
+    if verdict == "USE_ML_MODEL":
+        with stage("fallback"):
+            if speculative is not None:
+                fb = await speculation.result(speculative)
+            else:
+                speculation.missed()
+                fb = await run_model(fallback_classifier.predict, claim_en)
+        metrics.FALLBACKS.inc()
+        metrics.VERDICTS.inc(verdict=fb["fallback_pred"], source="fallback")
+        emit("verdict", verdict=fb["fallback_pred"], confidence=fb["fallback_confidence"], fallback=True)
+
+        # ML fallback should always provide its own reasoning
+        fb_reason = fb.get("reason", "ML fallback model used due to weak evidence.")
+        with stage("translate_output"):
+            fb_reason = (await translate_many_from_english_async([fb_reason], user_lang))[0]
 
-        # --- Fallback Detector (stronger) ---
-        weak_evidence = (
-            len(stance_results) == 0 or
-            max([s.get("stance_confidence", 0) for s in stance_results]) < 60 or
-            all(s.get("stance") == "neutral" for s in stance_results) or
-            (all(s.get("stance") == "support" for s in stance_results) and max([d.get("score", 0) for d in reranked]) < 0.30)
-        )
-
-        if verdict == "USE_ML_MODEL":
-            fb = fallback_classifier.predict(claim_en)
-
-            # ML fallback should always provide its own reasoning
-            fb_reason = fb.get("reason", "ML fallback model used due to weak evidence.")
-            fb_reason = translate_from_english(fb_reason, user_lang)
-
-            return {
-                "verdict": fb["fallback_pred"],
-                "confidence": fb["fallback_confidence"],
-                "reason": fb_reason,
-                "evidence": []
-            }
+        return {
+            "verdict": fb["fallback_pred"],
+            "confidence": fb["fallback_confidence"],
+            "reason": fb_reason,
+            "evidence": []
+        }
     
-        # 7) pick best sentence (english) and translate it
-        best_item = max(stance_results, key=lambda x: x.get("stance_confidence", 0))
-        best_sentence_en = best_item.get("best_sentence", "") or ""
-        best_sentence_translated = translate_from_english(best_sentence_en, user_lang) if best_sentence_en else ""
+    emit("verdict", verdict=verdict, confidence=conf, fallback=False)
+    metrics.VERDICTS.inc(verdict=verdict, source="rag")
 
-        # 8) translate each evidence summary back to user's language, robustly
-        translated_evidence = []
-        for ev in reranked:
-            summary_en = ev.get("summary_en", "")
-            # try translate; catch failures and mark as unavailable
-            try:
-                # Always provide translated field (even for English)
-                if user_lang == "en":
-                    translated = summary_en   # direct passthrough
-                else:
-                    try:
-                        translated = translate_from_english(summary_en, user_lang)
-                        if not translated or translated.strip() == summary_en.strip():
-                            translated = summary_en
-                    except:
-                        translated = summary_en
-            except Exception as e:
-                print(f"[verify] translation failed for idx={ev.get('idx')} error={e}")
-                translated = None
-
-            # fallback: if translated is None, keep original English summary so UI can still show something
-            translated_evidence.append({
-                "idx": ev.get("idx"),
-                "score": ev.get("score"),
-                "summary_en": summary_en,
-                "summary_translated": translated,
-                "rerank_score": ev.get("_rerank_score", None),
-                # include stance/result if available from stance_results mapping
-                "stance": None,
-                "stance_confidence": None
-            })
-
-        # 9) attach stance info from stance_results (they align by idx in most pipelines)
-        # build a quick map by idx to stance result
-        stance_map = {}
-        for s in stance_results:
-            idx = s.get("idx")
-            if idx is not None:
-                stance_map[int(idx)] = s
-
-        for te in translated_evidence:
-            idx = te.get("idx")
-            s = stance_map.get(int(idx)) if idx is not None else None
-            if s:
-                te["stance"] = s.get("stance")
-                te["stance_confidence"] = s.get("stance_confidence")
-                te["best_sentence_en"] = s.get("best_sentence")
-                # Also include best_sentence translated if possible
+    # 7) pick best sentence (english) and translate every user-facing
+    #    segment (best sentences + summaries) concurrently, each call
+    #    with its own timeout, so latency ≈ the slowest translation
+    best_item = max(stance_results, key=lambda x: x.get("stance_confidence", 0))
+    best_sentence_en = best_item.get("best_sentence", "") or ""
+
+    segments = [best_sentence_en]
+    segments += [ev.get("summary_en", "") for ev in reranked]
+    segments += [s.get("best_sentence") or "" for s in stance_results]
+    segments = [t for t in dict.fromkeys(segments) if t]
+    with stage("translate_output"):
+        translations = dict(zip(segments, await translate_many_from_english_async(
+            segments, user_lang,
+            on_result=lambda i, t: emit("translation", text_en=segments[i], translated=t),
+        )))
+
+    best_sentence_translated = translations.get(best_sentence_en, "") if best_sentence_en else ""
+
+    # 8) translate each evidence summary back to user's language, robustly
+    translated_evidence = []
+    for ev in reranked:
+        summary_en = ev.get("summary_en", "")
+        # try translate; catch failures and mark as unavailable
+        try:
+            # Always provide translated field (even for English)
+            if user_lang == "en":
+                translated = summary_en   # direct passthrough
+            else:
                 try:
-                    te["best_sentence_translated"] = translate_from_english(s.get("best_sentence",""), user_lang) if s.get("best_sentence") else None
+                    translated = translations.get(summary_en, summary_en)
+                    if not translated or translated.strip() == summary_en.strip():
+                        translated = summary_en
                 except:
-                    te["best_sentence_translated"] = None
-            else:
-                te["stance"] = None
-                te["stance_confidence"] = None
-                te["best_sentence_en"] = None
-                te["best_sentence_translated"] = None
+                    translated = summary_en
+        except Exception as e:
+            print(f"[verify] translation failed for idx={ev.get('idx')} error={e}")
+            translated = None
 
-        # 10) Sort evidence by similarity / rerank (optional)
-        translated_evidence = sorted(translated_evidence, key=lambda x: (x.get("rerank_score") or 0, -x.get("score", 0)), reverse=True)
+        # fallback: if translated is None, keep original English summary so UI can still show something
+        translated_evidence.append({
+            "idx": ev.get("idx"),
+            "score": ev.get("score"),
+            "summary_en": summary_en,
+            "summary_translated": translated,
+            "rerank_score": ev.get("_rerank_score", None),
+            # include stance/result if available from stance_results mapping
+            "stance": None,
+            "stance_confidence": None
+        })
 
-        # 11) final response (reason in user language if possible)
-        reason_text = best_sentence_translated or translate_from_english(best_sentence_en, user_lang) or ""
+    # 9) attach stance info from stance_results (they align by idx in most pipelines)
+    # build a quick map by idx to stance result
+    stance_map = {}
+    for s in stance_results:
+        idx = s.get("idx")
+        if idx is not None:
+            stance_map[int(idx)] = s
 
-        return {
-            "verdict": verdict,
-            "confidence": conf,
-            "reason": reason_text,
-            "evidence": translated_evidence
-        }
+    for te in translated_evidence:
+        idx = te.get("idx")
+        s = stance_map.get(int(idx)) if idx is not None else None
+        if s:
+            te["stance"] = s.get("stance")
+            te["stance_confidence"] = s.get("stance_confidence")
+            te["best_sentence_en"] = s.get("best_sentence")
+            # Also include best_sentence translated if possible
+            try:
+                te["best_sentence_translated"] = translations.get(s.get("best_sentence")) if s.get("best_sentence") else None
+            except:
+                te["best_sentence_translated"] = None
+        else:
+            te["stance"] = None
+            te["stance_confidence"] = None
+            te["best_sentence_en"] = None
+            te["best_sentence_translated"] = None
 
-    except Exception as e:
-        print("ERROR in /verify:", e)
-        import traceback
-        traceback.print_exc()
-        return {
-            "error": str(e),
-            "verdict": "ERROR",
-            "confidence": 0
-        }
+    # 10) Sort evidence by similarity / rerank (optional)
+    translated_evidence = sorted(translated_evidence, key=lambda x: (x.get("rerank_score") or 0, -x.get("score", 0)), reverse=True)
+
+    # 11) final response (reason in user language if possible)
+    reason_text = best_sentence_translated or best_sentence_en or ""
+
+    return {
+        "verdict": verdict,
+        "confidence": conf,
+        "reason": reason_text,
+        "evidence": translated_evidence
+    }
 
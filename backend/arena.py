@@ -0,0 +1,48 @@
+# backend/arena.py
+import os
+import numpy as np
+
+
+# ----------------------------
+# String arena: all strings concatenated as UTF-8 in one .bin file plus
+# an int64 offsets array (len = n + 1). Both are memory-mapped, so many
+# processes reading the same arena share the page cache.
+# ----------------------------
+def write_string_arena(strings, prefix: str):
+    """Write `strings` to <prefix>.bin + <prefix>.offsets.npy"""
+    os.makedirs(os.path.dirname(prefix) or ".", exist_ok=True)
+    offsets = np.zeros(len(strings) + 1, dtype=np.int64)
+    with open(prefix + ".bin", "wb") as f:
+        pos = 0
+        for i, s in enumerate(strings):
+            b = ("" if s is None else str(s)).encode("utf-8")
+            f.write(b)
+            pos += len(b)
+            offsets[i + 1] = pos
+    np.save(prefix + ".offsets.npy", offsets)
+
+
+class StringArena:
+    def __init__(self, prefix: str):
+        self.offsets = np.load(prefix + ".offsets.npy", mmap_mode="r")
+        size = int(self.offsets[-1])
+        # np.memmap refuses empty files
+        self._buf = np.memmap(prefix + ".bin", dtype=np.uint8, mode="r") if size else np.zeros(0, np.uint8)
+
+    @staticmethod
+    def exists(prefix: str) -> bool:
+        return os.path.exists(prefix + ".bin") and os.path.exists(prefix + ".offsets.npy")
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def raw(self, i: int) -> memoryview:
+        """Zero-copy view of the UTF-8 bytes of string i."""
+        start, end = int(self.offsets[i]), int(self.offsets[i + 1])
+        return memoryview(self._buf)[start:end]
+
+    def __getitem__(self, i: int) -> str:
+        return str(self.raw(i), "utf-8")
+
+    def slice(self, start: int, end: int):
+        return [self[i] for i in range(start, end)]
@@ -0,0 +1,122 @@
+# backend/batching.py
+import os
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, List, Sequence
+from backend import profiling
+from backend.metrics import BATCH_SECONDS, BATCH_SIZE
+from backend.thread_budget import model_slot
+
+# =========================
+# DEFAULTS (env overridable)
+# =========================
+BATCH_MAX_SIZE = int(os.getenv("BATCH_MAX_SIZE", "64"))
+BATCH_MAX_WAIT_MS = float(os.getenv("BATCH_MAX_WAIT_MS", "5"))
+
+
+class MicroBatcher:
+    """
+    Collects concurrent calls for the same model and runs them as one
+    forward pass.
+
+    Every caller submits a list of inputs and blocks until its own slice of
+    the batched output is ready. The worker thread waits at most
+    `max_wait_ms` after the first pending request for more requests to
+    arrive, and never puts more than `max_batch_size` inputs in one batch
+    (a single oversized request still runs on its own).
+    """
+
+    def __init__(self, fn: Callable[[List], Sequence], name: str = "batcher",
+                 max_batch_size: int = BATCH_MAX_SIZE, max_wait_ms: float = BATCH_MAX_WAIT_MS):
+        self.fn = fn
+        self.name = name
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, float(max_wait_ms)) / 1000.0
+
+        self._pending = []          # list of (items, future, profiling tag)
+        self._cond = threading.Condition()
+        self._worker = None
+
+    # ----------------------------
+    # Public API
+    # ----------------------------
+    def submit(self, items: Sequence) -> List:
+        """Run `items` through the model (possibly batched with others)."""
+        items = list(items)
+        if not items:
+            return []
+
+        fut = Future()
+        with self._cond:
+            self._ensure_worker()
+            self._pending.append((items, fut, profiling.tag()))
+            self._cond.notify()
+        return fut.result()
+
+    # ----------------------------
+    # Worker
+    # ----------------------------
+    def _ensure_worker(self):
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(
+                target=self._loop, name=f"{self.name}-worker", daemon=True
+            )
+            self._worker.start()
+
+    def _take_batch(self):
+        """Wait for the batch window and pop as many requests as fit."""
+        with self._cond:
+            while not self._pending:
+                self._cond.wait()
+
+            deadline = time.monotonic() + self.max_wait
+            while sum(len(p[0]) for p in self._pending) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+
+            batch, size = [], 0
+            while self._pending:
+                items = self._pending[0][0]
+                if batch and size + len(items) > self.max_batch_size:
+                    break
+                batch.append(self._pending.pop(0))
+                size += len(items)
+            return batch
+
+    def _loop(self):
+        while True:
+            batch = self._take_batch()
+            flat = [x for items, _, _ in batch for x in items]
+            tags = [t for _, _, t in batch if t is not None]
+            try:
+                # one forward pass = one of the worker's model slots
+                with model_slot(), profiling.section(tags):
+                    t0 = time.perf_counter()
+                    outputs = self.fn(flat)
+                BATCH_SECONDS.observe(time.perf_counter() - t0, batcher=self.name)
+                BATCH_SIZE.observe(len(flat), batcher=self.name)
+            except Exception as e:
+                for _, fut, _ in batch:
+                    fut.set_exception(e)
+                continue
+            except BaseException as e:
+                # KeyboardInterrupt / SystemExit in the model call ends this
+                # worker: nobody may be left waiting on it, and the next
+                # submit() starts a new one
+                with self._cond:
+                    batch += self._pending
+                    self._pending = []
+                    self._worker = None
+                for _, fut, _ in batch:
+                    fut.set_exception(e)
+                raise
+
+            # hand every caller its own slice
+            start = 0
+            for items, fut, _ in batch:
+                end = start + len(items)
+                fut.set_result(outputs[start:end])
+                start = end
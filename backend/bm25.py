@@ -0,0 +1,295 @@
+# backend/bm25.py
+"""
+BM25 inverted index over a fact store, memory-mapped at startup.
+
+Layout of <fact store>/bm25/:
+    meta.json       {"num_docs", "num_terms", "avgdl", "k1", "b", "block"}
+    lexicon.npy     one record per term, sorted by `hash`:
+                    hash (u64 of the term), offset (into postings.bin),
+                    skip (into skips.npy), df, width (1/2/4), max_impact
+    postings.bin    per term: doc id gaps as u8/u16/u32 (the smallest
+                    width that holds the list's largest gap), then one u8
+                    impact per posting; both parts padded to 4 bytes
+    skips.npy       u32 last doc id of every BLOCK postings of a list
+
+Impacts are the BM25 term-frequency part tf*(k1+1)/(tf + k1*(1-b+b*dl/avgdl))
+quantized to 1..255 at build time; idf comes from the whole snapshot at
+query time, so segments built at different times score alike. A posting
+list decodes with one np.cumsum over its gaps (or over one block of them,
+starting from the previous block's last doc id).
+
+Top-k uses MaxScore: terms are taken in order of their score upper bound
+(idf * max impact). Once the bounds of the terms still to come add up to
+no more than the current k-th best score, no new document can make the
+top k: the remaining (long, low-idf) lists are only probed, block by
+block, for the candidates that can still make it.
+
+Built with the fact store on first start, for ingested segments by
+backend/ingest.py, or for every segment that lacks one with:
+    python -m backend.bm25
+"""
+import hashlib
+import json
+import math
+import os
+import re
+from collections import Counter
+import numpy as np
+
+BM25_K1 = float(os.getenv("BM25_K1", "1.2"))
+BM25_B = float(os.getenv("BM25_B", "0.75"))
+BLOCK = 128
+
+LEXICON_DTYPE = np.dtype([
+    ("hash", "<u8"), ("offset", "<i8"), ("skip", "<i8"),
+    ("df", "<u4"), ("width", "u1"), ("max_impact", "u1"),
+])
+_WIDTHS = {1: np.uint8, 2: np.uint16, 4: np.uint32}
+
+STOPWORDS = frozenset("""
+a an and are as at be been but by for from had has have he her his i in is it its of on or she
+so that the their them they this to was were which who will with you your
+""".split())
+
+_token_re = re.compile(r"\w+")
+
+
+def tokenize(text: str):
+    return [t for t in _token_re.findall((text or "").lower()) if t not in STOPWORDS]
+
+
+def term_hash(term: str) -> int:
+    return int.from_bytes(hashlib.blake2b(term.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def _pad4(n: int) -> int:
+    return (n + 3) & ~3
+
+
+def exists(store_dir: str) -> bool:
+    return os.path.exists(os.path.join(store_dir, "bm25", "meta.json"))
+
+
+class BM25Index:
+    """One segment's index; doc ids are the segment's row numbers."""
+
+    def __init__(self, directory: str):
+        with open(os.path.join(directory, "meta.json"), encoding="utf-8") as f:
+            self.meta = json.load(f)
+        self.num_docs = int(self.meta["num_docs"])
+        self.k1 = float(self.meta["k1"])
+        self.block = int(self.meta["block"])
+        self.lexicon = np.load(os.path.join(directory, "lexicon.npy"), mmap_mode="r")
+        self.skips = np.load(os.path.join(directory, "skips.npy"), mmap_mode="r")
+        self._hashes = self.lexicon["hash"]
+        size = os.path.getsize(os.path.join(directory, "postings.bin"))
+        # np.memmap refuses empty files
+        self._buf = np.memmap(os.path.join(directory, "postings.bin"), dtype=np.uint8, mode="r") \
+            if size else np.zeros(0, np.uint8)
+
+    @classmethod
+    def open(cls, store_dir: str):
+        """Index of the fact store in `store_dir`, or None if it has none."""
+        return cls(os.path.join(store_dir, "bm25")) if exists(store_dir) else None
+
+    def term(self, h: int):
+        """Lexicon row of a term hash, or None."""
+        i = int(np.searchsorted(self._hashes, np.uint64(h)))
+        return i if i < len(self._hashes) and int(self._hashes[i]) == h else None
+
+    def df(self, t: int) -> int:
+        return int(self.lexicon[t]["df"])
+
+    # ----------------------------
+    # Posting lists
+    # ----------------------------
+    def _parts(self, t: int):
+        rec = self.lexicon[t]
+        df, width, offset = int(rec["df"]), int(rec["width"]), int(rec["offset"])
+        gaps = np.frombuffer(self._buf, dtype=_WIDTHS[width], count=df, offset=offset)
+        impacts = np.frombuffer(self._buf, dtype=np.uint8, count=df, offset=offset + _pad4(df * width))
+        nblocks = -(-df // self.block)
+        skips = self.skips[int(rec["skip"]):int(rec["skip"]) + nblocks]
+        return gaps, impacts, skips
+
+    def postings(self, t: int):
+        """(doc ids int64, impacts u8) of the whole list."""
+        gaps, impacts, _ = self._parts(t)
+        return np.cumsum(gaps, dtype=np.int64), impacts
+
+    def probe(self, t: int, docs):
+        """Impacts of the list at the sorted doc ids `docs` (0 where absent), decoding only their blocks."""
+        gaps, impacts, skips = self._parts(t)
+        blocks = np.searchsorted(skips, docs)      # first block whose last doc id is >= doc
+        out = np.zeros(len(docs), dtype=np.uint8)
+        wanted = np.unique(blocks[blocks < len(skips)])
+        if len(wanted) * self.block * 2 >= len(gaps):
+            # most of the list anyway: one decode
+            ids = np.cumsum(gaps, dtype=np.int64)
+            pos = np.minimum(np.searchsorted(ids, docs), len(ids) - 1)
+            hit = ids[pos] == docs
+            out[hit] = impacts[pos[hit]]
+            return out
+        for b in wanted:
+            lo, hi = int(b) * self.block, min((int(b) + 1) * self.block, len(gaps))
+            base = int(skips[b - 1]) if b else 0
+            ids = base + np.cumsum(gaps[lo:hi], dtype=np.int64)
+            sel = np.flatnonzero(blocks == b)
+            pos = np.minimum(np.searchsorted(ids, docs[sel]), len(ids) - 1)
+            hit = ids[pos] == docs[sel]
+            out[sel[hit]] = impacts[lo:hi][pos[hit]]
+        return out
+
+    # ----------------------------
+    # Top-k
+    # ----------------------------
+    def search(self, weighted_terms, k: int, theta: float = 0.0, prune: bool = True):
+        """
+        `weighted_terms`: [(lexicon row, weight)], weight = idf * query tf.
+        Returns (doc ids, scores) of the documents scoring at least `theta`,
+        at most k of them (unsorted). prune=False scores every posting.
+        """
+        scale = (self.k1 + 1) / 255
+        lists = sorted(((w * scale * int(self.lexicon[t]["max_impact"]), t, w * scale)
+                        for t, w in weighted_terms), reverse=True)
+        rest = sum(bound for bound, _, _ in lists)
+        docs, scores = np.zeros(0, dtype=np.int64), np.zeros(0)
+        for bound, t, w in lists:
+            if prune and len(scores) >= k:
+                theta = max(theta, float(np.partition(scores, len(scores) - k)[len(scores) - k]))
+            if prune and rest <= theta:
+                # no document outside the candidates can pass theta any more
+                keep = scores + rest > theta
+                docs, scores = docs[keep], scores[keep]
+                if not len(docs):
+                    break
+                scores = scores + w * self.probe(t, docs)
+            else:
+                ids, impacts = self.postings(t)
+                docs, inverse = np.unique(np.concatenate([docs, ids]), return_inverse=True)
+                scores = np.bincount(inverse, weights=np.concatenate([scores, w * impacts]), minlength=len(docs))
+            rest -= bound
+
+        # the k-th best itself can sit right at theta
+        keep = scores >= theta
+        docs, scores = docs[keep], scores[keep]
+        if len(docs) > k:
+            top = np.argpartition(-scores, k - 1)[:k]
+            docs, scores = docs[top], scores[top]
+        return docs, scores
+
+
+class SparseIndex:
+    """BM25 over every segment of a snapshot: [(global start, BM25Index)]."""
+
+    def __init__(self, parts):
+        self.parts = list(parts)
+        self.num_docs = sum(idx.num_docs for _, idx in self.parts)
+
+    def search(self, query: str, k: int, prune: bool = True):
+        """(scores desc, global ids) of the top k documents for `query`."""
+        qtf = Counter(term_hash(t) for t in tokenize(query))
+        rows = [{h: idx.term(h) for h in qtf} for _, idx in self.parts]
+        weights = {}
+        for h, tf in qtf.items():
+            df = sum(idx.df(r[h]) for (_, idx), r in zip(self.parts, rows) if r[h] is not None)
+            if df:
+                weights[h] = tf * math.log(1 + (self.num_docs - df + 0.5) / (df + 0.5))
+
+        found_ids, found_scores, theta = [], [], 0.0
+        for (start, idx), r in zip(self.parts, rows):
+            terms = [(r[h], w) for h, w in weights.items() if r[h] is not None]
+            if not terms:
+                continue
+            docs, scores = idx.search(terms, k, theta, prune)
+            found_ids.append(docs + start)
+            found_scores.append(scores)
+            if prune:
+                merged = np.concatenate(found_scores)
+                if len(merged) >= k:
+                    # the next segments only have to beat the k-th best so far
+                    theta = float(np.partition(merged, len(merged) - k)[len(merged) - k])
+        if not found_ids:
+            return np.zeros(0), np.zeros(0, dtype=np.int64)
+        ids, scores = np.concatenate(found_ids), np.concatenate(found_scores)
+        order = np.lexsort((ids, -scores))[:k]
+        return scores[order], ids[order]
+
+
+# =========================
+# BUILD STEP
+# =========================
+def build_bm25(texts, out_dir: str, k1: float = BM25_K1, b: float = BM25_B, block: int = BLOCK):
+    """Write the index of `texts` (doc i = texts[i]) to out_dir."""
+    os.makedirs(out_dir, exist_ok=True)
+    vocab = {}
+    term_ids, doc_ids, tfs = [], [], []
+    doc_len = np.zeros(len(texts), dtype=np.float64)
+    for d, text in enumerate(texts):
+        tokens = tokenize(text)
+        doc_len[d] = len(tokens)
+        for term, tf in Counter(tokens).items():
+            term_ids.append(vocab.setdefault(term, len(vocab)))
+            doc_ids.append(d)
+            tfs.append(tf)
+    term_ids = np.asarray(term_ids, dtype=np.int64)
+    doc_ids = np.asarray(doc_ids, dtype=np.int64)
+    tfs = np.asarray(tfs, dtype=np.float64)
+
+    avgdl = float(doc_len.mean()) if len(texts) and doc_len.sum() else 1.0
+    tf_part = tfs * (k1 + 1) / (tfs + k1 * (1 - b + b * doc_len[doc_ids] / avgdl))
+    impacts = np.clip(np.rint(tf_part / (k1 + 1) * 255), 1, 255).astype(np.uint8)
+
+    hashes = np.array([term_hash(t) for t in vocab], dtype=np.uint64)
+    if len(np.unique(hashes)) != len(hashes):
+        raise ValueError("term hash collision; cannot build the BM25 lexicon")
+    by_term = np.argsort(term_ids, kind="stable")      # doc ids stay ascending within a term
+    bounds = np.searchsorted(term_ids[by_term], np.arange(len(vocab) + 1))
+
+    lexicon = np.zeros(len(vocab), dtype=LEXICON_DTYPE)
+    skips = []
+    offset = 0
+    with open(os.path.join(out_dir, "postings.bin"), "wb") as f:
+        for row, t in enumerate(np.argsort(hashes)):
+            sel = by_term[bounds[t]:bounds[t + 1]]
+            docs = doc_ids[sel]
+            gaps = np.diff(docs, prepend=0)
+            width = 1 if gaps.max() < 1 << 8 else 2 if gaps.max() < 1 << 16 else 4
+            payload = gaps.astype(_WIDTHS[width]).tobytes()
+            f.write(payload + b"\0" * (_pad4(len(payload)) - len(payload)))
+            f.write(impacts[sel].tobytes() + b"\0" * (_pad4(len(sel)) - len(sel)))
+            lexicon[row] = (hashes[t], offset, sum(map(len, skips)), len(docs), width, impacts[sel].max())
+            offset += _pad4(len(payload)) + _pad4(len(sel))
+            skips.append(docs[block - 1::block] if len(docs) % block == 0
+                         else np.append(docs[block - 1::block], docs[-1]))
+
+    np.save(os.path.join(out_dir, "lexicon.npy"), lexicon)
+    np.save(os.path.join(out_dir, "skips.npy"),
+            np.concatenate(skips).astype(np.uint32) if skips else np.zeros(0, np.uint32))
+    with open(os.path.join(out_dir, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump({"num_docs": len(texts), "num_terms": len(vocab), "avgdl": avgdl,
+                   "k1": k1, "b": b, "block": block}, f)
+
+
+def index_texts(store):
+    """What gets indexed per row: the English summary, else the original one."""
+    en = store.has("summary_en")
+    return [(en and store.text("summary_en", i)) or store.text("summary", i) for i in range(len(store))]
+
+
+def build_for_store(store):
+    """Index a FactStore into <its directory>/bm25."""
+    build_bm25(index_texts(store), os.path.join(store.directory, "bm25"))
+    print(f"✅ BM25 index over {len(store)} rows saved in {os.path.join(store.directory, 'bm25')}")
+
+
+if __name__ == "__main__":
+    from backend.fact_store import FactStore
+    from backend.ingest import current_manifest
+    from backend.paths import SNAPSHOT_DIR
+
+    # the base fact store and every ingested segment that has no index yet
+    for spec in current_manifest()["segments"]:
+        path = spec["store"] if os.path.isabs(spec["store"]) else os.path.join(SNAPSHOT_DIR, spec["store"])
+        if not exists(path):
+            build_for_store(FactStore(path))
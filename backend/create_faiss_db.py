@@ -3,6 +3,7 @@ import faiss
 import numpy as np
 import pandas as pd
 import os
+from backend.index_factory import build_index
 
 # ---- 1. Load or create dataset ----
 DATA_PATH = "data/fact_dataset.csv"
@@ -29,10 +30,8 @@ print("Encoding sentences...")
 model = SentenceTransformer("sentence-transformers/all-MiniLM-L6-v2")
 embeddings = model.encode(sentences, convert_to_numpy=True, show_progress_bar=True)
 
-# ---- 4. Create FAISS index ----
-dimension = embeddings.shape[1]
-index = faiss.IndexFlatL2(dimension)
-index.add(embeddings)
+# ---- 4. Create FAISS index (type from FAISS_INDEX_TYPE, see index_factory.py) ----
+index = build_index(embeddings)
 
 # ---- 5. Save index and model info ----
 faiss.write_index(index, "data/fact_index.faiss")
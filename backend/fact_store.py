@@ -0,0 +1,136 @@
+# backend/fact_store.py
+"""
+Compact on-disk fact store, memory-mapped at startup.
+
+Layout of FACT_STORE_DIR:
+    meta.json                 {"num_rows", "columns", "dim"}
+    <column>.bin / .offsets.npy   one string arena per text column
+    embeddings.npy            float32 (num_rows, dim), opened with mmap
+
+Only the columns the request path needs are stored (no `full_text`), and
+FactStore opens a column the first time it is read. Pages come from the OS
+page cache, so several worker processes share one copy.
+
+Build once with:
+    python -m backend.fact_store
+"""
+import json
+import os
+import threading
+import numpy as np
+from backend.arena import StringArena, write_string_arena
+from backend.paths import EMB_PATH, PARQUET_PATH, FACT_STORE_DIR
+
+# columns looked up by idx on the request path
+STORE_COLUMNS = ("summary", "summary_en", "lang")
+
+
+class FactStore:
+    def __init__(self, directory: str = FACT_STORE_DIR):
+        self.directory = directory
+        with open(os.path.join(directory, "meta.json"), encoding="utf-8") as f:
+            self.meta = json.load(f)
+        self.num_rows = int(self.meta["num_rows"])
+        self.columns = list(self.meta["columns"])
+        self._arenas = {}
+        self._embeddings = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def exists(directory: str = FACT_STORE_DIR) -> bool:
+        return os.path.exists(os.path.join(directory, "meta.json"))
+
+    def __len__(self):
+        return self.num_rows
+
+    def has(self, column: str) -> bool:
+        return column in self.columns
+
+    def _arena(self, column: str) -> StringArena:
+        arena = self._arenas.get(column)
+        if arena is None:
+            if column not in self.columns:
+                raise KeyError(f"column not in fact store: {column}")
+            with self._lock:
+                arena = self._arenas.get(column)
+                if arena is None:
+                    arena = StringArena(os.path.join(self.directory, column))
+                    self._arenas[column] = arena
+        return arena
+
+    def raw(self, column: str, idx: int) -> memoryview:
+        """Zero-copy UTF-8 bytes of one cell."""
+        return self._arena(column).raw(idx)
+
+    def text(self, column: str, idx: int, default: str = "") -> str:
+        if not 0 <= idx < self.num_rows or column not in self.columns:
+            return default
+        return self._arena(column)[idx]
+
+    @property
+    def embeddings(self):
+        """float32 (num_rows, dim) memmap, or None if not stored."""
+        if self._embeddings is None:
+            path = os.path.join(self.directory, "embeddings.npy")
+            if os.path.exists(path):
+                self._embeddings = np.load(path, mmap_mode="r")
+        return self._embeddings
+
+
+# =========================
+# BUILD STEP
+# =========================
+def write_fact_store(columns: dict, out_dir: str, embeddings=None, chunk: int = 100_000):
+    """Write {column: list of str} (+ optional (n, dim) vectors) as a fact store."""
+    os.makedirs(out_dir, exist_ok=True)
+    num_rows = len(next(iter(columns.values())))
+
+    for col, values in columns.items():
+        if len(values) != num_rows:
+            raise ValueError(f"column {col} has {len(values)} rows, expected {num_rows}")
+        write_string_arena(["" if v is None else str(v) for v in values], os.path.join(out_dir, col))
+
+    dim = None
+    if embeddings is not None:
+        if len(embeddings) != num_rows:
+            raise ValueError(f"{len(embeddings)} embeddings for {num_rows} rows")
+        out = np.lib.format.open_memmap(
+            os.path.join(out_dir, "embeddings.npy"), mode="w+", dtype=np.float32, shape=embeddings.shape
+        )
+        for start in range(0, num_rows, chunk):
+            out[start:start + chunk] = embeddings[start:start + chunk]
+        out.flush()
+        dim = int(embeddings.shape[1])
+        del out
+
+    with open(os.path.join(out_dir, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump({"num_rows": num_rows, "columns": list(columns), "dim": dim}, f)
+
+
+def build_fact_store(parquet_path: str = PARQUET_PATH, out_dir: str = FACT_STORE_DIR,
+                     embeddings_path: str = EMB_PATH, columns=STORE_COLUMNS):
+    import pyarrow.parquet as pq
+
+    # column projection: never read full_text & co.
+    available = set(pq.read_schema(parquet_path).names)
+    # older bases keep the evidence text in `text` instead of `summary`
+    source = {c: c for c in columns if c in available}
+    if "summary" not in source and "text" in available:
+        source["summary"] = "text"
+    if not source:
+        raise ValueError(f"none of {columns} found in {parquet_path}")
+    table = pq.read_table(parquet_path, columns=sorted(set(source.values())))
+
+    embeddings = None
+    if embeddings_path and os.path.exists(embeddings_path):
+        embeddings = np.load(embeddings_path, mmap_mode="r")
+
+    write_fact_store(
+        {col: table.column(src).to_pylist() for col, src in source.items()},
+        out_dir, embeddings,
+    )
+    print(f"✅ fact store with {table.num_rows} rows ({', '.join(source)}) saved in {out_dir}")
+
+
+if __name__ == "__main__":
+    build_fact_store()
@@ -0,0 +1,161 @@
+# backend/index_factory.py
+"""
+Builds and queries the FAISS index with the configured index type.
+
+FAISS_INDEX_TYPE   flat | ivf_flat | ivf_pq | hnsw
+FAISS_METRIC       l2 | ip   (ip = inner product on L2-normalized vectors)
+FAISS_NLIST        IVF cells                         (ivf_*)
+FAISS_NPROBE       cells visited per query           (ivf_*)
+FAISS_PQ_M         PQ code size in bytes per vector  (ivf_pq, must divide dim)
+FAISS_PQ_NBITS     bits per PQ sub-quantizer         (ivf_pq)
+FAISS_HNSW_M       graph neighbours per node         (hnsw)
+FAISS_EF_CONSTRUCTION / FAISS_EF_SEARCH              (hnsw)
+
+Whatever the metric, search() returns squared-L2-style distances (smaller
+is better), so `score` keeps its meaning for the rest of the pipeline.
+
+Rebuild the index of the fact store with:
+    python -m backend.index_factory        (FAISS_SHARDS > 1 → sharded layout)
+"""
+import os
+import faiss
+import numpy as np
+
+INDEX_TYPES = ("flat", "ivf_flat", "ivf_pq", "hnsw")
+
+DEFAULT_PARAMS = {
+    "kind": os.getenv("FAISS_INDEX_TYPE", "flat"),
+    "metric": os.getenv("FAISS_METRIC", "l2"),
+    "nlist": int(os.getenv("FAISS_NLIST", "1024")),
+    "nprobe": int(os.getenv("FAISS_NPROBE", "16")),
+    "pq_m": int(os.getenv("FAISS_PQ_M", "64")),
+    "pq_nbits": int(os.getenv("FAISS_PQ_NBITS", "8")),
+    "hnsw_m": int(os.getenv("FAISS_HNSW_M", "32")),
+    "ef_construction": int(os.getenv("FAISS_EF_CONSTRUCTION", "200")),
+    "ef_search": int(os.getenv("FAISS_EF_SEARCH", "64")),
+}
+
+# faiss wants >= 39 training points per IVF cell
+MIN_POINTS_PER_CELL = 39
+MAX_TRAIN_POINTS = 256 * 1024
+
+
+def index_params(**overrides):
+    params = dict(DEFAULT_PARAMS)
+    params.update({k: v for k, v in overrides.items() if v is not None})
+    if params["kind"] not in INDEX_TYPES:
+        raise ValueError(f"unknown FAISS index type {params['kind']!r}, expected one of {INDEX_TYPES}")
+    if params["metric"] not in ("l2", "ip"):
+        raise ValueError(f"unknown FAISS metric {params['metric']!r}, expected 'l2' or 'ip'")
+    return params
+
+
+def _factory_string(params, n):
+    kind = params["kind"]
+    if kind == "flat":
+        return "Flat"
+    if kind == "hnsw":
+        return f"HNSW{params['hnsw_m']},Flat"
+    nlist = max(1, min(params["nlist"], n // MIN_POINTS_PER_CELL))
+    if kind == "ivf_flat":
+        return f"IVF{nlist},Flat"
+    return f"IVF{nlist},PQ{params['pq_m']}x{params['pq_nbits']}"
+
+
+def uses_inner_product(index) -> bool:
+    return index.metric_type == faiss.METRIC_INNER_PRODUCT
+
+
+def _as_float32(x):
+    return np.ascontiguousarray(x, dtype="float32")
+
+
+def new_index(dim: int, n_train: int, **overrides):
+    """Empty (untrained) index for vectors of `dim`; `n_train` sizes the IVF."""
+    params = index_params(**overrides)
+    metric = faiss.METRIC_INNER_PRODUCT if params["metric"] == "ip" else faiss.METRIC_L2
+    index = faiss.index_factory(dim, _factory_string(params, n_train), metric)
+    if params["kind"] == "hnsw":
+        faiss.downcast_index(index).hnsw.efConstruction = params["ef_construction"]
+    return index
+
+
+def train_index(index, vectors, seed: int = 0):
+    if index.is_trained:
+        return
+    vectors = _as_float32(vectors)
+    if uses_inner_product(index):
+        vectors = vectors.copy()
+        faiss.normalize_L2(vectors)
+    if len(vectors) > MAX_TRAIN_POINTS:
+        rng = np.random.default_rng(seed)
+        vectors = vectors[np.sort(rng.choice(len(vectors), MAX_TRAIN_POINTS, replace=False))]
+    index.train(vectors)
+
+
+def add_vectors(index, vectors, ids=None, chunk: int = 100_000):
+    """Add in chunks (normalizing for IP) so huge memmaps never load at once."""
+    for start in range(0, len(vectors), chunk):
+        x = _as_float32(vectors[start:start + chunk])
+        if uses_inner_product(index):
+            x = x.copy()
+            faiss.normalize_L2(x)
+        if ids is None:
+            index.add(x)
+        else:
+            index.add_with_ids(x, np.asarray(ids[start:start + chunk], dtype="int64"))
+
+
+def build_index(vectors, **overrides):
+    """Train (if needed) + fill an index of the configured type."""
+    index = new_index(vectors.shape[1], len(vectors), **overrides)
+    train_index(index, vectors)
+    add_vectors(index, vectors)
+    configure_search(index, **overrides)
+    return index
+
+
+def configure_search(index, nprobe=None, ef_search=None, **_):
+    """Apply query-time knobs (nprobe / efSearch) to a built or loaded index."""
+    params = index_params(nprobe=nprobe, ef_search=ef_search)
+    base = faiss.downcast_index(index)
+    if isinstance(base, (faiss.IndexIDMap, faiss.IndexIDMap2)):      # shards / segments
+        base = faiss.downcast_index(base.index)
+    ivf = faiss.try_extract_index_ivf(base)
+    if ivf is not None:
+        ivf.nprobe = params["nprobe"]
+    if hasattr(base, "hnsw"):
+        base.hnsw.efSearch = params["ef_search"]
+    return index
+
+
+def search(index, queries, k: int):
+    """(distances, ids); inner-product scores are mapped to squared L2."""
+    q = _as_float32(queries)
+    if uses_inner_product(index):
+        q = q.copy()
+        faiss.normalize_L2(q)
+        D, I = index.search(q, k)
+        # |a - b|^2 = 2 - 2 a.b for unit vectors
+        return 2.0 - 2.0 * D, I
+    return index.search(q, k)
+
+
+def index_nbytes(index) -> int:
+    return int(faiss.serialize_index(index).nbytes)
+
+
+if __name__ == "__main__":
+    from backend.fact_store import FactStore
+    from backend.paths import FACT_STORE_DIR, FAISS_INDEX_PATH, SHARD_DIR
+    from backend.shards import FAISS_SHARDS, build_shards
+
+    store = FactStore(FACT_STORE_DIR)
+    params = index_params()
+    if FAISS_SHARDS > 1:
+        build_shards(store.embeddings, SHARD_DIR, FAISS_SHARDS)
+        print(f"✅ {FAISS_SHARDS} {params['kind']}/{params['metric']} shards saved in {SHARD_DIR}")
+    else:
+        index = build_index(store.embeddings)
+        faiss.write_index(index, FAISS_INDEX_PATH)
+        print(f"✅ {params['kind']}/{params['metric']} index with {index.ntotal} vectors saved to {FAISS_INDEX_PATH}")
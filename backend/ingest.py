@@ -0,0 +1,213 @@
+# backend/ingest.py
+"""
+Incremental fact-base ingestion.
+
+    python -m backend.ingest new_factchecks.parquet     # append rows
+    python -m backend.ingest --compact                  # merge all segments
+    python -m backend.ingest --prune                    # delete retired segments
+
+New rows (cleaned like prepare_factbase.py output: `summary`, optionally
+`summary_en` / `lang`) are embedded and written as a new immutable segment
+with an id-mapped flat index and a BM25 index. Then a new manifest is
+published. Once there are more than SNAPSHOT_MAX_SEGMENTS segments, all
+of them are merged into one segment with the configured index type. A
+running server picks up each new manifest without a restart (see
+snapshots.py).
+"""
+import glob
+import json
+import os
+import shutil
+import time
+import faiss
+import numpy as np
+from backend import bm25, index_factory
+from backend.fact_store import FactStore, STORE_COLUMNS, write_fact_store
+from backend.paths import FACT_STORE_DIR, FAISS_INDEX_PATH, SHARD_DIR, SNAPSHOT_DIR
+from backend.shards import has_shards
+from backend.snapshots import SNAPSHOT_POLL_SECONDS, SNAPSHOT_RETIRE_SECONDS
+
+SNAPSHOT_MAX_SEGMENTS = int(os.getenv("SNAPSHOT_MAX_SEGMENTS", "8"))
+SNAPSHOT_KEEP = int(os.getenv("SNAPSHOT_KEEP", "3"))
+EMBED_COLUMN = os.getenv("INGEST_EMBED_COLUMN", "summary")
+
+# a server swaps to a new manifest within SNAPSHOT_POLL_SECONDS and keeps
+# the old snapshot (and its lazily opened files) for SNAPSHOT_RETIRE_SECONDS
+SEGMENT_GRACE_SECONDS = SNAPSHOT_POLL_SECONDS + SNAPSHOT_RETIRE_SECONDS
+RETIRED_FILE = "RETIRED"
+
+
+# ----------------------------
+# Manifests
+# ----------------------------
+def base_manifest():
+    """Version 0: the fact base built by the offline pipeline."""
+    store = FactStore(FACT_STORE_DIR)
+    spec = {"id": "base", "store": os.path.abspath(FACT_STORE_DIR), "start": 0, "end": len(store)}
+    if has_shards(SHARD_DIR):
+        spec["shards"] = os.path.abspath(SHARD_DIR)
+    else:
+        spec["index"] = os.path.abspath(FAISS_INDEX_PATH)
+    return {"version": 0, "dim": store.meta.get("dim"), "ntotal": len(store), "segments": [spec]}
+
+
+def current_manifest(directory=SNAPSHOT_DIR):
+    path = os.path.join(directory, "CURRENT")
+    if not os.path.exists(path):
+        return base_manifest()
+    with open(path, encoding="utf-8") as f:
+        name = f.read().strip()
+    with open(os.path.join(directory, name), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _atomic_write(path, text):
+    tmp = f"{path}.tmp{os.getpid()}"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def publish(manifest, directory=SNAPSHOT_DIR):
+    """Write the manifest, then atomically point CURRENT at it."""
+    os.makedirs(directory, exist_ok=True)
+    name = f"manifest_{manifest['version']:06d}.json"
+    _atomic_write(os.path.join(directory, name), json.dumps(manifest, indent=2))
+    _atomic_write(os.path.join(directory, "CURRENT"), name)
+    print(f"📦 published snapshot version {manifest['version']} ({manifest['ntotal']} rows)")
+    prune(directory)
+
+
+def prune(directory=SNAPSHOT_DIR, keep=SNAPSHOT_KEEP, grace_seconds=SEGMENT_GRACE_SECONDS):
+    """
+    Drop old manifests and segments no kept manifest refers to. An unused
+    segment is first marked RETIRED and only deleted by a later prune
+    once `grace_seconds` have passed, since a running server may still be
+    reading it through a retiring snapshot.
+    """
+    manifests = sorted(glob.glob(os.path.join(directory, "manifest_*.json")))
+    for path in manifests[:-keep]:
+        os.remove(path)
+    used = set()
+    for path in manifests[-keep:]:
+        with open(path, encoding="utf-8") as f:
+            used.update(s["id"] for s in json.load(f)["segments"])
+    now = time.time()
+    for seg_dir in glob.glob(os.path.join(directory, "segments", "*")):
+        if os.path.basename(seg_dir) in used:
+            continue
+        marker = os.path.join(seg_dir, RETIRED_FILE)
+        if not os.path.exists(marker):
+            _atomic_write(marker, str(now))
+        elif now - os.path.getmtime(marker) >= grace_seconds:
+            shutil.rmtree(seg_dir, ignore_errors=True)
+
+
+# ----------------------------
+# Segments
+# ----------------------------
+def _new_segment_dir(directory, start):
+    seg_id = f"seg_{start:010d}_{int(time.time() * 1000)}"
+    path = os.path.join(directory, "segments", seg_id)
+    os.makedirs(path)
+    return seg_id, path
+
+
+def _write_segment(directory, columns, vectors, start, index=None):
+    """Store + index for rows start..start+n-1; flat id-mapped index by default."""
+    seg_id, path = _new_segment_dir(directory, start)
+    write_fact_store(columns, os.path.join(path, "store"), vectors)
+    bm25.build_for_store(FactStore(os.path.join(path, "store")))
+    if index is None:
+        index = faiss.IndexIDMap(index_factory.new_index(vectors.shape[1], len(vectors), kind="flat"))
+        index_factory.add_vectors(index, vectors, ids=np.arange(start, start + len(vectors)))
+    faiss.write_index(index, os.path.join(path, "index.faiss"))
+    rel = os.path.relpath(path, directory)
+    return {
+        "id": seg_id,
+        "store": os.path.join(rel, "store"),
+        "index": os.path.join(rel, "index.faiss"),
+        "start": start,
+        "end": start + len(vectors),
+    }
+
+
+def _embed(texts):
+    from backend.models import EMB_MODEL, get_model
+    return get_model(EMB_MODEL).encode(texts, batch_size=64, show_progress_bar=True).astype("float32")
+
+
+def append_rows(df, directory=SNAPSHOT_DIR):
+    """Add new fact rows as a segment and publish the next snapshot."""
+    if df.empty:
+        return current_manifest(directory)
+    if "summary_en" not in df.columns or "lang" not in df.columns:
+        from backend.prepare_factbase import add_english_summaries
+        ckpt = os.path.join(directory, f"ingest_{int(time.time())}.jsonl")
+        os.makedirs(directory, exist_ok=True)
+        df = add_english_summaries(df, checkpoint_path=ckpt)
+        os.remove(ckpt)
+
+    manifest = current_manifest(directory)
+    start = manifest["ntotal"]
+    vectors = _embed(df[EMBED_COLUMN].fillna("").astype(str).tolist())
+    columns = {c: df[c].fillna("").astype(str).tolist() for c in STORE_COLUMNS if c in df.columns}
+
+    seg = _write_segment(directory, columns, vectors, start)
+    manifest = {
+        "version": manifest["version"] + 1,
+        "dim": int(vectors.shape[1]),
+        "ntotal": start + len(df),
+        "segments": manifest["segments"] + [seg],
+    }
+    if len(manifest["segments"]) > SNAPSHOT_MAX_SEGMENTS:
+        manifest = compact(manifest, directory, publish_result=False)
+    publish(manifest, directory)
+    return manifest
+
+
+def compact(manifest=None, directory=SNAPSHOT_DIR, publish_result=True):
+    """Merge every segment into one, indexed with the configured index type."""
+    manifest = manifest or current_manifest(directory)
+    resolve = lambda p: p if os.path.isabs(p) else os.path.join(directory, p)
+    stores = [FactStore(resolve(s["store"])) for s in sorted(manifest["segments"], key=lambda s: s["start"])]
+    if any(st.embeddings is None for st in stores):
+        raise RuntimeError("compaction needs embeddings in every segment's fact store")
+
+    columns = [c for c in STORE_COLUMNS if all(st.has(c) for st in stores)]
+    merged = {c: [st.text(c, i) for st in stores for i in range(len(st))] for c in columns}
+    vectors = np.concatenate([np.asarray(st.embeddings, dtype="float32") for st in stores])
+
+    index = index_factory.build_index(vectors)
+    seg = _write_segment(directory, merged, vectors, 0, index=index)
+    print(f"🗜 compacted {len(stores)} segments into {seg['id']}")
+
+    manifest = {
+        "version": manifest["version"] + 1,
+        "dim": int(vectors.shape[1]),
+        "ntotal": len(vectors),
+        "segments": [seg],
+    }
+    if publish_result:
+        publish(manifest, directory)
+    return manifest
+
+
+if __name__ == "__main__":
+    import argparse
+    import pandas as pd
+
+    ap = argparse.ArgumentParser()
+    ap.add_argument("parquet", nargs="?", help="cleaned new fact rows")
+    ap.add_argument("--compact", action="store_true", help="merge all segments now")
+    ap.add_argument("--prune", action="store_true", help="delete retired segments past the grace period")
+    args = ap.parse_args()
+
+    if args.parquet:
+        append_rows(pd.read_parquet(args.parquet))
+    if args.compact:
+        compact()
+    if args.prune:
+        prune()
@@ -0,0 +1,236 @@
+# backend/langid.py
+"""
+Language identification, memoized by text hash.
+
+1. Script fast path: most FactDrill languages (Tamil, Telugu, Gujarati,
+   Odia, ...) each have their own Unicode script, so counting letters per
+   script settles them without a model. This also covers Odia and
+   Assamese, which langdetect does not know.
+2. n-gram model: langdetect (seeded, so results are deterministic) for
+   Latin text, and for scripts shared by several languages (Devanagari:
+   hi/mr/ne, Arabic: ar/ur/fa, Cyrillic). For a shared script, only that
+   script's languages are allowed as answers.
+
+Codes follow langdetect ("he", "zh-cn"); translate.safe_lang maps them
+to translator codes. Thread-safe, unlike langdetect's lazy global
+factory.
+"""
+import bisect
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+LANGID_CACHE_ITEMS = int(os.getenv("LANGID_CACHE_ITEMS", "20000"))
+LANGID_SEED = 0
+
+# share of letters that must be in one non-Latin script for the fast path
+SCRIPT_SHARE = 0.5
+
+# (first code point, last code point, script)
+SCRIPT_RANGES = sorted([
+    (0x0370, 0x03FF, "greek"),
+    (0x0400, 0x052F, "cyrillic"),
+    (0x0530, 0x058F, "armenian"),
+    (0x0590, 0x05FF, "hebrew"),
+    (0x0600, 0x06FF, "arabic"),
+    (0x0750, 0x077F, "arabic"),
+    (0x0900, 0x097F, "devanagari"),
+    (0x0980, 0x09FF, "bengali"),
+    (0x0A00, 0x0A7F, "gurmukhi"),
+    (0x0A80, 0x0AFF, "gujarati"),
+    (0x0B00, 0x0B7F, "oriya"),
+    (0x0B80, 0x0BFF, "tamil"),
+    (0x0C00, 0x0C7F, "telugu"),
+    (0x0C80, 0x0CFF, "kannada"),
+    (0x0D00, 0x0D7F, "malayalam"),
+    (0x0D80, 0x0DFF, "sinhala"),
+    (0x0E00, 0x0E7F, "thai"),
+    (0x0E80, 0x0EFF, "lao"),
+    (0x1000, 0x109F, "myanmar"),
+    (0x10A0, 0x10FF, "georgian"),
+    (0x1200, 0x137F, "ethiopic"),
+    (0x1780, 0x17FF, "khmer"),
+    (0x3040, 0x30FF, "kana"),
+    (0x4E00, 0x9FFF, "han"),
+    (0xAC00, 0xD7AF, "hangul"),
+])
+_RANGE_STARTS = [r[0] for r in SCRIPT_RANGES]
+
+# scripts used by a single language
+SCRIPT_LANG = {
+    "greek": "el",
+    "armenian": "hy",
+    "hebrew": "he",
+    "gurmukhi": "pa",
+    "gujarati": "gu",
+    "oriya": "or",
+    "tamil": "ta",
+    "telugu": "te",
+    "kannada": "kn",
+    "malayalam": "ml",
+    "sinhala": "si",
+    "thai": "th",
+    "lao": "lo",
+    "myanmar": "my",
+    "georgian": "ka",
+    "ethiopic": "am",
+    "khmer": "km",
+    "kana": "ja",
+    "hangul": "ko",
+}
+
+# scripts shared by several languages: the n-gram model picks among these
+SCRIPT_CANDIDATES = {
+    "devanagari": ("hi", "mr", "ne"),
+    "arabic": ("ar", "ur", "fa"),
+    "cyrillic": ("ru", "uk", "bg", "mk"),
+}
+
+# letters only Assamese uses in the Bengali script (ৰ, ৱ)
+ASSAMESE_LETTERS = frozenset("ৰৱ")
+
+
+def _script(ch):
+    cp = ord(ch)
+    i = bisect.bisect_right(_RANGE_STARTS, cp) - 1
+    if i >= 0 and cp <= SCRIPT_RANGES[i][1]:
+        return SCRIPT_RANGES[i][2]
+    return None
+
+
+def script_counts(text: str):
+    """(letters per non-Latin script, total letters)."""
+    counts = {}
+    letters = 0
+    for ch in text:
+        if ch < "\u0370":
+            letters += ch.isalpha()
+            continue
+        script = _script(ch)
+        if script is not None:
+            counts[script] = counts.get(script, 0) + 1
+            letters += 1
+        else:
+            letters += ch.isalpha()
+    return counts, letters
+
+
+def detect_script(text: str):
+    """
+    (language or None, dominant script or None). The language is set when
+    the script alone decides it; for a shared script only the script is.
+    """
+    counts, letters = script_counts(text)
+    if not counts:
+        return None, None
+    script, n = max(counts.items(), key=lambda kv: kv[1])
+    if n < SCRIPT_SHARE * letters:
+        return None, None
+    if script == "bengali":
+        return ("as" if ASSAMESE_LETTERS & set(text) else "bn"), script
+    if script == "han":
+        return ("ja" if counts.get("kana") else "zh-cn"), script
+    return SCRIPT_LANG.get(script), script
+
+
+# ----------------------------
+# n-gram model (langdetect)
+# ----------------------------
+_factory = None
+_factory_lock = threading.Lock()
+
+
+def _get_factory():
+    global _factory
+    if _factory is None:
+        with _factory_lock:
+            if _factory is None:
+                from langdetect.detector_factory import DetectorFactory, PROFILES_DIRECTORY
+                factory = DetectorFactory()
+                factory.load_profile(PROFILES_DIRECTORY)
+                factory.set_seed(LANGID_SEED)
+                _factory = factory
+    return _factory
+
+
+def ngram_detect(text: str, candidates=None) -> str:
+    """langdetect, optionally restricted to `candidates`; raises on no features."""
+    detector = _get_factory().create()
+    if candidates:
+        detector.set_prior_map({c: 1.0 for c in candidates})
+    detector.append(text)
+    return detector.detect()
+
+
+# ----------------------------
+# Memoized entry point
+# ----------------------------
+class LangIdCache:
+    """Thread-safe LRU of text hash → language."""
+
+    def __init__(self, max_items: int = LANGID_CACHE_ITEMS):
+        self.max_items = max_items
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(text: str) -> bytes:
+        return hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+    def get(self, key):
+        with self._lock:
+            lang = self._items.get(key)
+            if lang is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return lang
+
+    def put(self, key, lang):
+        with self._lock:
+            self._items[key] = lang
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_items:
+                self._items.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            return {"items": len(self._items), "hits": self.hits, "misses": self.misses}
+
+
+_cache = LangIdCache()
+
+
+def identify(text: str) -> str:
+    """Uncached detection; raises ValueError when nothing can be detected."""
+    lang, script = detect_script(text)
+    if lang is not None:
+        return lang
+    try:
+        return ngram_detect(text, SCRIPT_CANDIDATES.get(script))
+    except Exception as e:
+        raise ValueError(f"no language detected: {e}") from None
+
+
+def detect(text: str, default: str = "en") -> str:
+    """Language of `text` (memoized by text hash), or `default` if unknown."""
+    text = (text or "").strip()
+    if not text:
+        return default
+    key = LangIdCache.key(text)
+    lang = _cache.get(key)
+    if lang is None:
+        try:
+            lang = identify(text)
+        except ValueError:
+            lang = ""           # remembered as undetectable
+        _cache.put(key, lang)
+    return lang or default
+
+
+def cache_stats():
+    return _cache.stats()
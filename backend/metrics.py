@@ -0,0 +1,194 @@
+# backend/metrics.py
+"""
+In-process metrics in Prometheus text format (no client library needed).
+
+    with stage("rerank"):                  # latency histogram per pipeline stage
+        reranked = await run_model(...)
+    count("translation_calls", n)          # per-request counter (debug breakdown)
+    FALLBACKS.inc()                        # plain counters / histograms
+
+Every /verify claim runs inside request_scope(): stage timings and
+per-request counts land in a dict that app.py returns as the `debug`
+field when the X-Debug-Timing header is set. The dict lives in a
+ContextVar, so it follows the request into run_model's threads.
+
+Each uvicorn worker keeps its own numbers; a scrape sees one worker.
+"""
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from backend import profiling
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+
+
+def _label_str(names, values):
+    if not names:
+        return ""
+    pairs = ",".join(f'{n}="{str(v)}"' for n, v in zip(names, values))
+    return "{" + pairs + "}"
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name: str, help: str, labels=()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def _key(self, labels):
+        return tuple(labels.get(n, "") for n in self.labels)
+
+    def render(self):
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"] + self._samples()
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name, help, labels=()):
+        super().__init__(name, help, labels)
+        self._values = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def _samples(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_label_str(self.labels, k)} {v}" for k, v in items]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help, labels=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(buckets)
+        self._values = {}           # key -> [bucket counts..., sum, count]
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            row = self._values.get(key)
+            if row is None:
+                row = self._values[key] = [0] * len(self.buckets) + [0.0, 0]
+            for i, b in enumerate(self.buckets):
+                if value <= b:
+                    row[i] += 1
+            row[-2] += value
+            row[-1] += 1
+
+    def _samples(self):
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._values.items())
+        out = []
+        names = self.labels + ("le",)
+        for key, row in items:
+            for b, n in zip(self.buckets, row):
+                out.append(f"{self.name}_bucket{_label_str(names, key + (b,))} {n}")
+            out.append(f"{self.name}_bucket{_label_str(names, key + ('+Inf',))} {row[-1]}")
+            out.append(f"{self.name}_sum{_label_str(self.labels, key)} {row[-2]}")
+            out.append(f"{self.name}_count{_label_str(self.labels, key)} {row[-1]}")
+        return out
+
+
+class Gauge(_Metric):
+    """Read when scraped: `fn()` returns a number, or {label value: number} for one label."""
+    kind = "gauge"
+
+    def __init__(self, name, help, fn, labels=()):
+        super().__init__(name, help, labels)
+        self.fn = fn
+
+    def _samples(self):
+        try:
+            value = self.fn()
+        except Exception:
+            return []
+        if isinstance(value, dict):
+            return [f"{self.name}{_label_str(self.labels, (k,))} {v}" for k, v in sorted(value.items())]
+        return [] if value is None else [f"{self.name} {value}"]
+
+
+REGISTRY = []
+
+
+def render() -> str:
+    return "\n".join(line for m in REGISTRY for line in m.render()) + "\n"
+
+
+# =========================
+# Pipeline metrics
+# =========================
+CLAIMS = Counter("factcheck_claims_total", "Claims verified", ["endpoint"])
+VERDICTS = Counter("factcheck_verdicts_total", "Verdicts by label and source (rag, fallback, exact, semantic)",
+                   ["verdict", "source"])
+FALLBACKS = Counter("factcheck_fallback_total", "Claims answered by the ML fallback")
+CACHE_LOOKUPS = Counter("factcheck_verdict_cache_total", "Verdict cache lookups", ["result"])
+ERRORS = Counter("factcheck_errors_total", "Claims that ended in an error")
+STAGE_SECONDS = Histogram("factcheck_stage_seconds", "Latency per pipeline stage", ["stage"])
+TRANSLATION_CALLS = Counter("factcheck_translation_calls_total", "Translator calls (cache misses)", ["direction"])
+TRANSLATION_CACHED = Counter("factcheck_translation_cached_total", "Segments served by the translation cache",
+                             ["direction"])
+TRANSLATION_CALLS_PER_CLAIM = Histogram("factcheck_translation_calls_per_claim", "Translator calls per claim",
+                                        buckets=(0, 1, 2, 4, 8, 16, 32))
+NLI_SENTENCES = Counter("factcheck_nli_sentences_total", "Evidence sentences considered for NLI")
+NLI_PAIRS = Counter("factcheck_nli_pairs_total", "(claim, sentence) pairs scored by NLI")
+BATCH_SIZE = Histogram("factcheck_batch_size", "Inputs per micro-batched forward pass", ["batcher"],
+                       buckets=SIZE_BUCKETS)
+BATCH_SECONDS = Histogram("factcheck_batch_seconds", "Forward pass time per micro-batch", ["batcher"])
+STREAM_TTFUB = Histogram("factcheck_stream_ttfub_seconds", "/verify/stream time to the first useful event")
+
+
+# =========================
+# Per-request breakdown
+# =========================
+_request = ContextVar("factcheck_request", default=None)
+
+
+@contextmanager
+def request_scope():
+    """Collect stage timings + counts of one claim; yields the dict."""
+    data = {"stages_ms": {}, "counts": {}}
+    token = _request.set(data)
+    t0 = time.perf_counter()
+    try:
+        yield data
+    finally:
+        data["total_ms"] = round((time.perf_counter() - t0) * 1000, 2)
+        _request.reset(token)
+        TRANSLATION_CALLS_PER_CLAIM.observe(data["counts"].get("translation_calls", 0))
+
+
+@contextmanager
+def stage(name: str):
+    token = profiling.enter_stage(name)
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        dt = time.perf_counter() - t0
+        profiling.exit_stage(token)
+        STAGE_SECONDS.observe(dt, stage=name)
+        data = _request.get()
+        if data is not None:
+            data["stages_ms"][name] = round(data["stages_ms"].get(name, 0) + dt * 1000, 2)
+
+
+def count(name: str, amount: int = 1):
+    """Add to the current request's breakdown (no-op outside a request)."""
+    data = _request.get()
+    if data is not None:
+        data["counts"][name] = data["counts"].get(name, 0) + amount
@@ -1,29 +1,37 @@
 # backend/ml_fallback.py
+import asyncio
+import os
+import threading
+import time
 import torch
-from transformers import AutoTokenizer, AutoModelForSequenceClassification
+from backend import profiling
+from backend.models import FALLBACK_MODEL, registry
+from backend.thread_budget import model_slot
 
-class MLFallbackClassifier:
-    _tokenizer = None
-    _model = None
+# Start the fallback before RAG knows it needs it:
+#   never   only after aggregate_ml_verdict says USE_ML_MODEL (default)
+#   weak    when is_weak_evidence() flags the retrieval results
+#   always  for every claim, next to retrieval
+FALLBACK_SPECULATION = os.getenv("FALLBACK_SPECULATION", "never")
+# top retrieval hit below this cosine similarity counts as weak evidence
+FALLBACK_WEAK_SIM = float(os.getenv("FALLBACK_WEAK_SIM", "0.4"))
 
-    def __init__(self, model_name="MoritzLaurer/DeBERTa-v3-base-mnli-fever-anli"):
+class MLFallbackClassifier:
+    def __init__(self, model_name=FALLBACK_MODEL):
         self.model_name = model_name
         self.THRESHOLD = 0.60   # Confidence threshold for TRUE/FAKE
+        # rarely used → evictable under the registry memory cap
+        registry.register(model_name, "sequence-classifier", evictable=True)
 
     def _load_model(self):
-        """Lazy-load + cache tokenizer/model"""
-        if MLFallbackClassifier._model is None:
-            print(f"⚡ Loading factuality model: {self.model_name}")
-            MLFallbackClassifier._tokenizer = AutoTokenizer.from_pretrained(self.model_name)
-            MLFallbackClassifier._model     = AutoModelForSequenceClassification.from_pretrained(self.model_name)
-            MLFallbackClassifier._model.eval()
-        return self._tokenizer, self._model
+        """Lazy-load tokenizer/model through the shared registry"""
+        return registry.get(self.model_name)
 
     def predict(self, claim_en: str):
         """Return a clean fallback verdict independent of RAG."""
         tok, model = self._load_model()
 
-        with torch.no_grad():
+        with model_slot(), profiling.forward_pass(), torch.no_grad():
             inputs = tok(claim_en, return_tensors="pt", truncation=True, padding=True)
             logits = model(**inputs).logits[0]
             probs = torch.softmax(logits, dim=0).tolist()
@@ -53,4 +61,102 @@ class MLFallbackClassifier:
             "fallback_confidence": round(max(probs) * 100, 2),
             "probs": {"contr": contr, "neutral": neutral, "entail": entail}
         }
-    
\ No newline at end of file
+    
+
+# ---------------------------------------------------------
+# Speculative fallback
+# ---------------------------------------------------------
+def is_weak_evidence(retrieved, low_information: bool = False) -> bool:
+    """
+    Cheap guess, before rerank + stance, that RAG will end in USE_ML_MODEL.
+    Retrieval scores are squared L2 distances of unit vectors, so
+    cosine = 1 - d / 2.
+    """
+    if low_information or not retrieved:
+        return True
+    best = min(r["score"] for r in retrieved)
+    return 1 - best / 2 < FALLBACK_WEAK_SIM
+
+
+class SpeculativeFallback:
+    """
+    Runs the fallback prediction while RAG is still working.
+
+    start() schedules predict() through the given executor-backed
+    coroutine runner. result() hands the prediction over when RAG ends in
+    USE_ML_MODEL. discard() skips it if no thread has picked it up yet,
+    or lets it finish and throws the result away (a running forward pass
+    cannot be interrupted).
+
+    Compute is accounted as:
+      saved   fallback seconds that overlapped RAG instead of adding to it
+      wasted  fallback seconds whose result was thrown away
+    """
+
+    def __init__(self, classifier: MLFallbackClassifier, policy: str = FALLBACK_SPECULATION):
+        if policy not in ("never", "weak", "always"):
+            raise ValueError(f"unknown FALLBACK_SPECULATION {policy!r}, expected never, weak or always")
+        self.classifier = classifier
+        self.policy = policy
+        self._lock = threading.Lock()
+        self._stats = {"started": 0, "used": 0, "discarded": 0, "cancelled": 0,
+                       "missed": 0, "saved_seconds": 0.0, "wasted_seconds": 0.0}
+
+    def _run(self, spec: dict, claim_en: str):
+        with self._lock:
+            if spec["dropped"]:
+                return None             # discarded before it got a thread
+            spec["started"] = True
+        t0 = time.perf_counter()
+        out = self.classifier.predict(claim_en)
+        t1 = time.perf_counter()
+        with self._lock:
+            spec["span"] = (t0, t1)
+            if spec["dropped"]:
+                self._stats["wasted_seconds"] += t1 - t0
+        return out
+
+    def start(self, run, claim_en: str):
+        """`run(fn, *args)`: coroutine that runs fn off the event loop. Returns a handle."""
+        self._count("started")
+        spec = {"started": False, "dropped": False, "span": None}
+        spec["task"] = asyncio.ensure_future(run(self._run, spec, claim_en))
+        # nobody may await a discarded run: keep asyncio from warning about its exception
+        spec["task"].add_done_callback(lambda t: t.cancelled() or t.exception())
+        return spec
+
+    async def result(self, spec):
+        """The speculative prediction (waits for it if still running)."""
+        needed = time.perf_counter()
+        out = await spec["task"]
+        t0, t1 = spec["span"]
+        with self._lock:
+            self._stats["used"] += 1
+            # the part of the fallback that ran before RAG asked for it
+            self._stats["saved_seconds"] += max(0.0, min(t1, needed) - t0)
+        return out
+
+    def discard(self, spec):
+        """RAG produced a verdict: skip the prediction if not started, else ignore its result."""
+        with self._lock:
+            spec["dropped"] = True
+            key = "discarded" if spec["started"] else "cancelled"
+            if spec["span"] is not None:
+                self._stats["wasted_seconds"] += spec["span"][1] - spec["span"][0]
+            self._stats[key] += 1
+
+    def missed(self):
+        """RAG fell back without a speculative run (policy never / weak guessed wrong)."""
+        self._count("missed")
+
+    def _count(self, key):
+        with self._lock:
+            self._stats[key] += 1
+
+    def stats(self):
+        with self._lock:
+            out = dict(self._stats)
+        out["policy"] = self.policy
+        out["saved_seconds"] = round(out["saved_seconds"], 3)
+        out["wasted_seconds"] = round(out["wasted_seconds"], 3)
+        return out
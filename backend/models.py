@@ -0,0 +1,287 @@
+# backend/models.py
+import gc
+import os
+import threading
+import time
+from collections import OrderedDict
+from functools import partial
+from backend import onnx_engine
+
+# =========================
+# MODEL IDS (env overridable, e.g. local paths on an offline box)
+# =========================
+EMB_MODEL = os.getenv("EMB_MODEL", "sentence-transformers/all-mpnet-base-v2")
+CROSS_ENCODER_MODEL = os.getenv("CROSS_ENCODER_MODEL", "cross-encoder/ms-marco-MiniLM-L-6-v2")
+NLI_MODEL = os.getenv("NLI_MODEL", "cross-encoder/nli-deberta-base")
+FALLBACK_MODEL = os.getenv("FALLBACK_MODEL", "MoritzLaurer/DeBERTa-v3-base-mnli-fever-anli")
+
+# 0 = no cap; otherwise least recently used evictable models are unloaded
+# once the loaded models together exceed this many MB
+MODEL_MEMORY_CAP_MB = float(os.getenv("MODEL_MEMORY_CAP_MB", "0"))
+
+
+# ----------------------------
+# Memory helpers
+# ----------------------------
+def current_rss_bytes():
+    """Resident set size of this process (Linux), or None if unknown."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE")
+    except Exception:
+        return None
+
+
+def _torch_modules(obj):
+    """Yield torch modules held by a loaded model object."""
+    if isinstance(obj, (tuple, list)):
+        for o in obj:
+            yield from _torch_modules(o)
+        return
+    if hasattr(obj, "parameters") and callable(obj.parameters):
+        yield obj
+    elif hasattr(obj, "model"):              # CrossEncoder wraps .model
+        yield from _torch_modules(obj.model)
+
+
+def model_nbytes(obj) -> int:
+    """Bytes held by parameters and buffers of a loaded model."""
+    if isinstance(obj, (tuple, list)):
+        return sum(model_nbytes(o) for o in obj)
+    if hasattr(obj, "onnx_nbytes"):             # onnx_engine wrappers
+        return obj.onnx_nbytes
+    total = 0
+    for m in _torch_modules(obj):
+        for t in list(m.parameters()) + list(m.buffers()):
+            total += t.numel() * t.element_size()
+    return total
+
+
+# ----------------------------
+# Loaders + warmups
+# ----------------------------
+def load_sentence_transformer(model_id):
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(model_id, device="cpu")
+
+
+def load_cross_encoder(model_id):
+    from sentence_transformers import CrossEncoder
+    return CrossEncoder(model_id, device="cpu")    # cpu: avoids meta-tensor GPU error
+
+
+def load_sequence_classifier(model_id):
+    from transformers import AutoTokenizer, AutoModelForSequenceClassification
+    tok = AutoTokenizer.from_pretrained(model_id)
+    model = AutoModelForSequenceClassification.from_pretrained(model_id)
+    model.eval()
+    return tok, model
+
+
+def load_seq2seq(model_id):
+    from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
+    tok = AutoTokenizer.from_pretrained(model_id)
+    model = AutoModelForSeq2SeqLM.from_pretrained(model_id)
+    model.eval()
+    return tok, model
+
+
+def warmup_sentence_transformer(model):
+    model.encode(["warmup"])
+
+
+def warmup_cross_encoder(model):
+    model.predict([("warmup", "warmup")])
+
+
+def warmup_sequence_classifier(model):
+    import torch
+    tok, m = model
+    with torch.no_grad():
+        m(**tok("warmup", return_tensors="pt"))
+
+
+def warmup_seq2seq(model):
+    import torch
+    tok, m = model
+    with torch.no_grad():
+        m.generate(**tok("warmup", return_tensors="pt"), max_new_tokens=4)
+
+
+LOADERS = {
+    "sentence-transformer": (load_sentence_transformer, warmup_sentence_transformer),
+    "cross-encoder": (load_cross_encoder, warmup_cross_encoder),
+    "sequence-classifier": (load_sequence_classifier, warmup_sequence_classifier),
+    "seq2seq": (load_seq2seq, warmup_seq2seq),
+}
+
+
+# =========================
+# REGISTRY
+# =========================
+class ModelRegistry:
+    """
+    Process-wide home of every model the backend uses.
+
+    - one shared instance per model id
+    - thread-safe: concurrent callers of get() trigger a single load
+    - LRU unloading of evictable models above `memory_cap_mb`
+    """
+
+    def __init__(self, memory_cap_mb: float = MODEL_MEMORY_CAP_MB):
+        self.memory_cap_bytes = int(memory_cap_mb * 1024 * 1024)
+        self._specs = {}                # model_id -> spec dict
+        self._models = OrderedDict()    # model_id -> model, in LRU order
+        self._stats = {}                # model_id -> load stats
+        self._lock = threading.Lock()
+        self._load_locks = {}
+
+    # ----------------------------
+    # Registration
+    # ----------------------------
+    def register(self, model_id: str, kind: str, evictable: bool = True, loader=None, warmup=None,
+                 replace: bool = False):
+        """
+        Declare how to load `model_id`. The first registration wins, unless
+        `replace` (stand-in models, e.g. benchmarks/offline); a model loaded
+        from the old spec is dropped.
+        """
+        with self._lock:
+            if model_id in self._specs and not replace:
+                return
+            self._models.pop(model_id, None)
+            default_loader, default_warmup = LOADERS[kind]
+            engine = "custom" if loader else "torch"
+            if loader is None and onnx_engine.selected(model_id):
+                # exported + int8-quantized copy on onnxruntime (ONNX_MODELS)
+                default_loader = partial(onnx_engine.load_onnx_model, kind=kind)
+                engine = "onnx"
+            self._specs[model_id] = {
+                "kind": kind,
+                "engine": engine,
+                "evictable": evictable,
+                "loader": loader or default_loader,
+                "warmup": warmup or default_warmup,
+            }
+            self._load_locks[model_id] = threading.Lock()
+
+    def registered(self):
+        return list(self._specs)
+
+    def kind(self, model_id: str) -> str:
+        return self._specs[model_id]["kind"]
+
+    # ----------------------------
+    # Access
+    # ----------------------------
+    def get(self, model_id: str):
+        with self._lock:
+            model = self._models.get(model_id)
+            if model is not None:
+                self._models.move_to_end(model_id)
+                self._stats[model_id]["hits"] += 1
+                return model
+            if model_id not in self._specs:
+                raise KeyError(f"model not registered: {model_id}")
+            load_lock = self._load_locks[model_id]
+
+        # only one thread loads a given model; the others wait for it
+        with load_lock:
+            with self._lock:
+                model = self._models.get(model_id)
+                if model is not None:
+                    self._models.move_to_end(model_id)
+                    self._stats[model_id]["hits"] += 1
+                    return model
+            model = self._load(model_id)
+
+        self._enforce_cap(keep=model_id)
+        return model
+
+    def _load(self, model_id):
+        spec = self._specs[model_id]
+        print(f"⚡ Loading model: {model_id}")
+        rss_before = current_rss_bytes()
+        t0 = time.perf_counter()
+        model = spec["loader"](model_id)
+        load_s = time.perf_counter() - t0
+        rss_after = current_rss_bytes()
+
+        with self._lock:
+            self._models[model_id] = model
+            prev = self._stats.get(model_id, {})
+            self._stats[model_id] = {
+                "kind": spec["kind"],
+                "engine": spec["engine"],
+                "nbytes": model_nbytes(model),
+                "rss_delta_bytes": (rss_after - rss_before) if rss_before and rss_after else None,
+                "load_seconds": round(load_s, 3),
+                "loads": prev.get("loads", 0) + 1,
+                "hits": prev.get("hits", 0),
+            }
+        return model
+
+    def unload(self, model_id: str):
+        with self._lock:
+            if self._models.pop(model_id, None) is None:
+                return False
+        print(f"🧹 Unloaded model: {model_id}")
+        gc.collect()
+        return True
+
+    def _enforce_cap(self, keep=None):
+        if self.memory_cap_bytes <= 0:
+            return
+        while True:
+            with self._lock:
+                total = sum(self._stats[m]["nbytes"] for m in self._models)
+                if total <= self.memory_cap_bytes:
+                    return
+                victim = next(
+                    (m for m in self._models if m != keep and self._specs[m]["evictable"]),
+                    None,
+                )
+            if victim is None:
+                return
+            self.unload(victim)
+
+    # ----------------------------
+    # Warmup + reporting
+    # ----------------------------
+    def warmup(self, model_ids=None):
+        """Load every model (or the given ones) and run one tiny forward pass."""
+        timings = {}
+        for model_id in model_ids or self.registered():
+            t0 = time.perf_counter()
+            model = self.get(model_id)
+            self._specs[model_id]["warmup"](model)
+            timings[model_id] = round(time.perf_counter() - t0, 3)
+        return timings
+
+    def memory_report(self):
+        with self._lock:
+            models = {}
+            for model_id, spec in self._specs.items():
+                stats = dict(self._stats.get(model_id, {}))
+                stats["loaded"] = model_id in self._models
+                stats["evictable"] = spec["evictable"]
+                models[model_id] = stats
+            loaded_bytes = sum(self._stats[m]["nbytes"] for m in self._models)
+        return {
+            "process_rss_bytes": current_rss_bytes(),
+            "loaded_model_bytes": loaded_bytes,
+            "memory_cap_bytes": self.memory_cap_bytes,
+            "models": models,
+        }
+
+
+registry = ModelRegistry()
+registry.register(EMB_MODEL, "sentence-transformer", evictable=False)
+registry.register(CROSS_ENCODER_MODEL, "cross-encoder")
+registry.register(NLI_MODEL, "cross-encoder")
+registry.register(FALLBACK_MODEL, "sequence-classifier")
+
+
+def get_model(model_id: str):
+    return registry.get(model_id)
@@ -0,0 +1,294 @@
+# backend/onnx_engine.py
+"""
+ONNX Runtime engine for the CPU models, with dynamic int8 quantization.
+
+Export once. For each model this writes ONNX_DIR/<model id>/ with
+model.onnx, model.int8.onnx, the tokenizer and meta.json:
+    python -m backend.onnx_engine export                     # all four models
+    python -m backend.onnx_engine export --models cross-encoder/nli-deberta-base
+
+Serving is chosen per model. ONNX_MODELS is "all" or a comma-separated
+list of model ids; the model registry loads those from the export instead
+of PyTorch. The ONNX wrappers keep the PyTorch call signatures
+(encode / predict / (tokenizer, model)), so callers do not change.
+
+ONNX_QUANTIZED   1 = int8 model (default; fp32 if the export has none), 0 = fp32 export
+ONNX_SESSIONS    sessions per model, i.e. forward passes at once (default 2)
+ONNX_THREADS     intra-op threads per session (0 = onnxruntime default)
+"""
+import json
+import os
+import queue
+import time
+from types import SimpleNamespace
+import numpy as np
+from backend.paths import ONNX_DIR
+
+ONNX_MODELS = os.getenv("ONNX_MODELS", "")
+ONNX_QUANTIZED = os.getenv("ONNX_QUANTIZED", "1") == "1"
+ONNX_SESSIONS = int(os.getenv("ONNX_SESSIONS", "2"))
+ONNX_THREADS = int(os.getenv("ONNX_THREADS", "0"))
+ONNX_OPSET = 17
+
+FP32_FILE = "model.onnx"
+INT8_FILE = "model.int8.onnx"
+
+
+def selected(model_id: str, spec: str = ONNX_MODELS) -> bool:
+    """Is `model_id` configured to run on ONNX Runtime?"""
+    names = {s.strip() for s in spec.split(",") if s.strip()}
+    return "all" in names or model_id in names
+
+
+def model_dir(model_id: str, root: str = ONNX_DIR) -> str:
+    return os.path.join(root, model_id.strip("/").replace("/", "__"))
+
+
+# =========================
+# EXPORT
+# =========================
+def _torch_parts(model, kind):
+    """(hf module, tokenizer, output name, meta) of a PyTorch-loaded model."""
+    if kind == "sentence-transformer":
+        pooling = model[1].get_config_dict() if len(model) > 1 else {}
+        meta = {
+            "max_length": model.max_seq_length,
+            "pooling": "cls" if pooling.get("pooling_mode_cls_token") else "mean",
+            "normalize": any(type(m).__name__ == "Normalize" for m in model),
+            "dimension": model.get_sentence_embedding_dimension(),
+        }
+        return model[0].auto_model, model.tokenizer, "last_hidden_state", meta
+    if kind == "cross-encoder":
+        meta = {
+            "max_length": model.max_length,
+            "num_labels": model.config.num_labels,
+            "activation": "sigmoid" if model.config.num_labels == 1 else "identity",
+        }
+        return model.model, model.tokenizer, "logits", meta
+    if kind == "sequence-classifier":
+        tok, m = model
+        return m, tok, "logits", {"max_length": None, "num_labels": m.config.num_labels}
+    raise ValueError(f"no ONNX export for model kind {kind!r}")
+
+
+def export_model(model_id: str, kind: str, root: str = ONNX_DIR, quantize: bool = True):
+    """Export one model (fp32 + dynamic int8) and return its meta."""
+    import torch
+    from backend.models import LOADERS
+
+    model = LOADERS[kind][0](model_id)
+    hf, tok, output, meta = _torch_parts(model, kind)
+    hf.eval()
+
+    pair = kind != "sentence-transformer"
+    sample = tok(["a warmup claim"], ["a warmup sentence"] if pair else None, return_tensors="pt")
+    names = list(sample.keys())
+
+    class _Wrapper(torch.nn.Module):
+        def __init__(self, inner):
+            super().__init__()
+            self.inner = inner
+
+        def forward(self, *args):
+            return getattr(self.inner(**dict(zip(names, args)), return_dict=True), output)
+
+    out_dir = model_dir(model_id, root)
+    os.makedirs(out_dir, exist_ok=True)
+    fp32 = os.path.join(out_dir, FP32_FILE)
+    axes = {n: {0: "batch", 1: "seq"} for n in names}
+    axes[output] = {0: "batch", 1: "seq"} if output == "last_hidden_state" else {0: "batch"}
+
+    t0 = time.perf_counter()
+    with torch.no_grad():
+        torch.onnx.export(
+            _Wrapper(hf), tuple(sample[n] for n in names), fp32,
+            input_names=names, output_names=[output], dynamic_axes=axes,
+            opset_version=ONNX_OPSET, dynamo=False,
+        )
+    if quantize:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+        quantize_dynamic(fp32, os.path.join(out_dir, INT8_FILE), weight_type=QuantType.QInt8)
+    tok.save_pretrained(out_dir)
+
+    meta.update({"model_id": model_id, "kind": kind, "inputs": names, "output": output, "pair": pair})
+    with open(os.path.join(out_dir, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+    sizes = {fn: os.path.getsize(os.path.join(out_dir, fn)) // 2**20 for fn in (FP32_FILE, INT8_FILE)
+             if os.path.exists(os.path.join(out_dir, fn))}
+    print(f"✅ {model_id} → {out_dir} ({time.perf_counter() - t0:.1f}s, MB: {sizes})")
+    return meta
+
+
+# =========================
+# SERVE
+# =========================
+class SessionPool:
+    """
+    A fixed number of InferenceSessions for one model. Each forward pass
+    borrows one and runs it with I/O binding: inputs are bound straight
+    from numpy, and the output is allocated by onnxruntime.
+    """
+
+    def __init__(self, path: str, size: int = ONNX_SESSIONS, threads: int = ONNX_THREADS):
+        import onnxruntime as ort
+        opts = ort.SessionOptions()
+        opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads > 0:
+            opts.intra_op_num_threads = threads
+        self._free = queue.Queue()
+        for _ in range(max(1, size)):
+            self._free.put(ort.InferenceSession(path, opts, providers=["CPUExecutionProvider"]))
+        sess = self._free.queue[0]
+        self.input_names = [i.name for i in sess.get_inputs()]
+        self.output_name = sess.get_outputs()[0].name
+        self.size = max(1, size)
+
+    def run(self, feeds: dict) -> np.ndarray:
+        sess = self._free.get()
+        try:
+            binding = sess.io_binding()
+            for name in self.input_names:
+                binding.bind_cpu_input(name, np.ascontiguousarray(feeds[name], dtype=np.int64))
+            binding.bind_output(self.output_name)
+            sess.run_with_iobinding(binding)
+            return binding.copy_outputs_to_cpu()[0]
+        finally:
+            self._free.put(sess)
+
+
+def model_file(directory: str, quantized: bool = ONNX_QUANTIZED) -> str:
+    """The int8 model if wanted and exported (not with --no-quantize), else fp32."""
+    int8 = os.path.join(directory, INT8_FILE)
+    if quantized and not os.path.exists(int8):
+        print(f"[onnx] no {INT8_FILE} in {directory} (exported with --no-quantize?), serving {FP32_FILE}")
+        quantized = False
+    return int8 if quantized else os.path.join(directory, FP32_FILE)
+
+
+class OnnxModel:
+    def __init__(self, directory: str, quantized: bool = ONNX_QUANTIZED,
+                 sessions: int = ONNX_SESSIONS, threads: int = ONNX_THREADS):
+        from transformers import AutoTokenizer
+        with open(os.path.join(directory, "meta.json"), encoding="utf-8") as f:
+            self.meta = json.load(f)
+        path = model_file(directory, quantized)
+        self.tokenizer = AutoTokenizer.from_pretrained(directory)
+        self.pool = SessionPool(path, sessions, threads)
+        # weights are held once per session
+        self.onnx_nbytes = os.path.getsize(path) * self.pool.size
+
+    def _tokenize(self, first, second=None):
+        max_length = self.meta.get("max_length")
+        kwargs = {"max_length": max_length} if max_length else {}
+        return self.tokenizer(first, second, padding=True, truncation="longest_first" if second else True,
+                              return_tensors="np", **kwargs)
+
+    def _run(self, enc) -> np.ndarray:
+        return self.pool.run({n: enc[n] for n in self.pool.input_names})
+
+
+def _length_batches(lengths, batch_size):
+    """Index batches of similar length (less padding), like encode() does."""
+    order = np.argsort([-n for n in lengths], kind="stable")
+    return [order[i:i + batch_size] for i in range(0, len(order), batch_size)]
+
+
+class OnnxSentenceEncoder(OnnxModel):
+    """SentenceTransformer.encode() on ONNX Runtime (mean/CLS pooling + normalize)."""
+
+    def get_sentence_embedding_dimension(self) -> int:
+        if not self.meta.get("dimension"):           # exports from before it was in meta.json
+            self.meta["dimension"] = int(self.encode("dimension probe").shape[-1])
+        return self.meta["dimension"]
+
+    def encode(self, sentences, batch_size: int = 32, convert_to_tensor: bool = False,
+               convert_to_numpy: bool = True, **_):
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        dim = None
+        out = [None] * len(texts)
+        for ids in _length_batches([len(t) for t in texts], batch_size):
+            enc = self._tokenize([texts[i] for i in ids])
+            hidden = self._run(enc)
+            if self.meta["pooling"] == "cls":
+                emb = hidden[:, 0]
+            else:
+                mask = enc["attention_mask"][..., None].astype(hidden.dtype)
+                emb = (hidden * mask).sum(1) / np.clip(mask.sum(1), 1e-9, None)
+            if self.meta["normalize"]:
+                emb = emb / np.clip(np.linalg.norm(emb, axis=1, keepdims=True), 1e-12, None)
+            dim = emb.shape[1]
+            for i, e in zip(ids, emb):
+                out[i] = e
+        arr = np.stack(out).astype(np.float32) if out else np.zeros((0, dim or 0), np.float32)
+        if single:
+            arr = arr[0]
+        if convert_to_tensor:
+            import torch
+            return torch.from_numpy(arr)
+        return arr
+
+
+class OnnxCrossEncoder(OnnxModel):
+    """CrossEncoder.predict() on ONNX Runtime (same activation + softmax rules)."""
+
+    def predict(self, sentences, batch_size: int = 32, apply_softmax: bool = False, **_):
+        pairs = [(str(a).strip(), str(b).strip()) for a, b in sentences]
+        if not pairs:
+            return np.zeros((0,), np.float32)
+        out = [None] * len(pairs)
+        for ids in _length_batches([len(a) + len(b) for a, b in pairs], batch_size):
+            enc = self._tokenize([pairs[i][0] for i in ids], [pairs[i][1] for i in ids])
+            logits = self._run(enc).astype(np.float32)
+            if self.meta["activation"] == "sigmoid":
+                logits = 1.0 / (1.0 + np.exp(-logits))
+            if apply_softmax and logits.shape[1] > 1:
+                e = np.exp(logits - logits.max(axis=1, keepdims=True))
+                logits = e / e.sum(axis=1, keepdims=True)
+            for i, row in zip(ids, logits):
+                out[i] = row
+        scores = np.stack(out)
+        return scores[:, 0] if self.meta["num_labels"] == 1 else scores
+
+
+class OnnxSequenceClassifier(OnnxModel):
+    """Stands in for the HF model of a (tokenizer, model) pair: model(**inputs).logits."""
+
+    def __call__(self, **inputs):
+        import torch
+        feeds = {k: (v.numpy() if hasattr(v, "numpy") else np.asarray(v)) for k, v in inputs.items()}
+        return SimpleNamespace(logits=torch.from_numpy(self._run(feeds).astype(np.float32)))
+
+
+WRAPPERS = {
+    "sentence-transformer": OnnxSentenceEncoder,
+    "cross-encoder": OnnxCrossEncoder,
+    "sequence-classifier": OnnxSequenceClassifier,
+}
+
+
+def load_onnx_model(model_id: str, kind: str, root: str = ONNX_DIR):
+    """Registry loader: the exported model wrapped like its PyTorch original."""
+    directory = model_dir(model_id, root)
+    if not os.path.exists(os.path.join(directory, "meta.json")):
+        raise FileNotFoundError(
+            f"no ONNX export for {model_id} in {directory}; run `python -m backend.onnx_engine export`"
+        )
+    model = WRAPPERS[kind](directory)
+    if kind == "sequence-classifier":
+        return model.tokenizer, model
+    return model
+
+
+if __name__ == "__main__":
+    import argparse
+    from backend.models import registry
+
+    ap = argparse.ArgumentParser()
+    ap.add_argument("command", choices=["export"])
+    ap.add_argument("--models", nargs="+", help="model ids (default: every registered model)")
+    ap.add_argument("--no-quantize", action="store_true")
+    args = ap.parse_args()
+
+    for model_id in args.models or registry.registered():
+        export_model(model_id, registry.kind(model_id), quantize=not args.no_quantize)
@@ -0,0 +1,27 @@
+# backend/paths.py
+import os
+
+# =========================
+# DATA LOCATIONS
+# set FACT_DATA_DIR to point the backend at another data folder
+# =========================
+DATA_DIR = os.getenv("FACT_DATA_DIR", "C:/Users/DELL/OneDrive/Documents/SEM 5/EDAI-5/edai5-rag/data")
+
+EMB_PATH = os.path.join(DATA_DIR, "fact_embeddings.npy")
+PARQUET_PATH = os.path.join(DATA_DIR, "fact_base_clean.parquet")
+FAISS_INDEX_PATH = os.path.join(DATA_DIR, "faiss_index.bin")
+
+# precomputed sentence splits + sentence embeddings (backend/sentence_store.py)
+SENTENCE_DIR = os.path.join(DATA_DIR, "sentences")
+
+# memory-mapped columnar fact store (fact_store.py)
+FACT_STORE_DIR = os.path.join(DATA_DIR, "fact_store")
+
+# sharded FAISS layout (shards.py); used instead of FAISS_INDEX_PATH if present
+SHARD_DIR = os.path.join(DATA_DIR, "shards")
+
+# versioned snapshots written by incremental ingestion (ingest.py)
+SNAPSHOT_DIR = os.path.join(DATA_DIR, "snapshots")
+
+# ONNX exports of the models (onnx_engine.py)
+ONNX_DIR = os.path.join(DATA_DIR, "onnx")
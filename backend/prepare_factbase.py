@@ -1,9 +1,16 @@
+import json
+import os
 import pandas as pd
 import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from tqdm import tqdm
 
 DATA_PATH = "C:/Users/DELL/OneDrive/Documents/SEM 5/EDAI-5/edai5-rag/data/factdrill_data.parquet"
-df = pd.read_parquet(DATA_PATH)
+
+# offline translation of summaries → English
+TRANSLATE_BATCH_SIZE = 64
+TRANSLATE_WORKERS = 8
+TRANSLATE_CHECKPOINT = "summary_en_checkpoint.jsonl"
 
 def clean_text(t):
     if not isinstance(t, str):
@@ -31,30 +38,110 @@ def extract_summary(text):
     summary = ". ".join(sentences[:2]).strip()
     return summary
 
-clean_rows = []
+def _translate_rows(rows):
+    """[(row, lang, summary)] → [{"row", "lang", "summary_en"}], one call per language."""
+    from backend.translate import translate_batch
+
+    by_lang = {}
+    for row, lang, summary in rows:
+        by_lang.setdefault(lang, []).append((row, summary))
+
+    out = []
+    for lang, items in by_lang.items():
+        texts = [s for _, s in items]
+        # strict: a failed call must not end up in the checkpoint as "English"
+        english = texts if lang == "en" else translate_batch(texts, lang, "en", strict=True)
+        for (row, _), en in zip(items, english):
+            out.append({"row": row, "lang": lang, "summary_en": en})
+    return out
+
+def add_english_summaries(df, checkpoint_path=TRANSLATE_CHECKPOINT,
+                          batch_size=TRANSLATE_BATCH_SIZE, workers=TRANSLATE_WORKERS):
+    """
+    Add `lang` + `summary_en` columns. Batches run in parallel and every
+    finished batch is appended to `checkpoint_path`, so an interrupted run
+    resumes where it stopped. A batch whose translation fails is left out
+    of the checkpoint; if any failed, the rest is still saved and a
+    RuntimeError asks for a rerun, which retries just those rows.
+    """
+    from backend.translate import detect_lang, safe_lang
+
+    done = {}
+    if os.path.exists(checkpoint_path):
+        with open(checkpoint_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    rec = json.loads(line)
+                    done[rec["row"]] = rec
+                except ValueError:
+                    pass    # torn last line of a killed run
+
+    summaries = df["summary"].fillna("").astype(str).tolist()
+    # language detection is cheap (script fast path, see langid.py) and runs
+    # here; only the translation runs in parallel
+    todo = [
+        (i, safe_lang(detect_lang(summaries[i]) or "en") if summaries[i] else "en", summaries[i])
+        for i in tqdm(range(len(summaries)), desc="detecting languages") if i not in done
+    ]
+    batches = [todo[i:i + batch_size] for i in range(0, len(todo), batch_size)]
+    print(f"Translating {len(todo)} summaries ({len(done)} already done)")
+
+    failed = 0
+    with open(checkpoint_path, "a", encoding="utf-8") as ckpt, ThreadPoolExecutor(workers) as ex:
+        futures = {ex.submit(_translate_rows, b): b for b in batches}
+        for fut in tqdm(as_completed(futures), total=len(futures)):
+            try:
+                recs = fut.result()
+            except Exception as e:
+                # e.g. a rate limit: the rows stay untranslated for the next run
+                failed += len(futures[fut])
+                print(f"[prepare] batch of {len(futures[fut])} summaries failed: {e}")
+                continue
+            for rec in recs:
+                done[rec["row"]] = rec
+                ckpt.write(json.dumps(rec, ensure_ascii=False) + "\n")
+            ckpt.flush()
+    if failed:
+        raise RuntimeError(f"{failed} summaries could not be translated; run again to retry them "
+                           f"({len(done)} finished rows are kept in {checkpoint_path})")
+
+    df = df.copy()
+    df["lang"] = [done[i]["lang"] for i in range(len(df))]
+    df["summary_en"] = [done[i]["summary_en"] for i in range(len(df))]
+    return df
+
+
+if __name__ == "__main__":
+    df = pd.read_parquet(DATA_PATH)
+
+    clean_rows = []
+
+    for _, row in tqdm(df.iterrows(), total=len(df)):
 
-for _, row in tqdm(df.iterrows(), total=len(df)):
+        claim_text = clean_text(row["claim"])
+        invest = clean_text(row["investigation"])
 
-    claim_text = clean_text(row["claim"])
-    invest = clean_text(row["investigation"])
+        verdict = extract_verdict(invest)
+        summary = extract_summary(invest)
 
-    verdict = extract_verdict(invest)
-    summary = extract_summary(invest)
+        clean_rows.append({
+            "claim": claim_text,
+            "summary": summary,
+            "verdict": verdict,
+            "source": row["link"],
+            "date": row["publish_date"],
+            "full_text": clean_text(row["document_text"])
+        })
 
-    clean_rows.append({
-        "claim": claim_text,
-        "summary": summary,
-        "verdict": verdict,
-        "source": row["link"],
-        "date": row["publish_date"],
-        "full_text": clean_text(row["document_text"])
-    })
+    clean_df = pd.DataFrame(clean_rows)
 
-clean_df = pd.DataFrame(clean_rows)
+    # detect language + translate summaries once, offline
+    clean_df = add_english_summaries(clean_df)
 
-clean_df.to_parquet("fact_base_clean.parquet")
-clean_df.to_csv("fact_base_clean.csv", index=False)
+    clean_df.to_parquet("fact_base_clean.parquet")
+    clean_df.to_csv("fact_base_clean.csv", index=False)
 
-print("\n🎉 Done! Clean fact base created:")
-print(clean_df.head())
-print("\nLabel counts:", clean_df["verdict"].value_counts())
+    print("\n🎉 Done! Clean fact base created:")
+    print(clean_df.head())
+    print("\nLabel counts:", clean_df["verdict"].value_counts())
+    print("\nLanguages:", clean_df["lang"].value_counts())
@@ -0,0 +1,362 @@
+# backend/profiling.py
+"""
+On-demand profiling of live /verify requests.
+
+Off by default. While off, the hooks in the request path cost one
+ContextVar lookup each and no sampler thread runs. Turn it on without a
+restart (POST /admin/profiling) or at startup:
+
+PROFILING=1               profile requests (header- or rate-selected)
+PROFILE_SAMPLE_RATE       fraction of /verify requests to profile (default 0)
+PROFILE_INTERVAL_MS       stack sampling interval (default 5)
+PROFILE_TORCH=1           also record torch operators per stage (default 1)
+PROFILE_KEEP              finished profiles kept for download (default 50)
+PROFILING_ADMIN=1         serve /admin/profiling and /admin/profiles* (default off:
+                          they change every request's latency and hand out
+                          other users' claims, and the API has no auth)
+
+A request carrying `X-Profile: 1` is always profiled while profiling is on.
+
+What a profile holds, per pipeline stage (the metrics.stage() names):
+- collapsed stacks "stage;thread;file:function;... count", ready for
+  flamegraph.pl or speedscope. Samples come from the threads that work for
+  the request: run_model threads, and micro-batcher threads while their
+  batch holds one of its inputs (so a batched forward pass shows up in
+  every request it served). The event loop thread is shared by every
+  request and is not sampled.
+- torch operator totals (calls, CPU time) of the forward passes: the
+  micro-batched ones, and those wrapped in forward_pass(). The torch
+  profiler records one thread at a time, so a forward pass that runs while
+  another one is being recorded goes without (torch_sections_skipped), as
+  do those before the profiler's first start (a few seconds, in the
+  background) is done.
+"""
+import itertools
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+_settings = {
+    "enabled": os.getenv("PROFILING", "0") == "1",
+    "sample_rate": float(os.getenv("PROFILE_SAMPLE_RATE", "0")),
+    "interval_ms": float(os.getenv("PROFILE_INTERVAL_MS", "5")),
+    "torch": os.getenv("PROFILE_TORCH", "1") == "1",
+}
+PROFILE_KEEP = int(os.getenv("PROFILE_KEEP", "50"))
+PROFILING_ADMIN = os.getenv("PROFILING_ADMIN", "0") == "1"
+
+_current = ContextVar("factcheck_profile", default=None)
+_stage = ContextVar("factcheck_profile_stage", default=None)
+
+_ids = itertools.count(1)
+_finished = deque(maxlen=PROFILE_KEEP)
+_active = set()
+_lock = threading.Lock()
+_wake = threading.Condition(_lock)
+_sampler = None
+# the torch profiler cannot record on two threads at once: one section at a time
+_torch_lock = threading.Lock()
+_torch_ready = threading.Event()     # its first start takes seconds; done off the request path
+_torch_warming = False
+
+
+class Profile:
+    def __init__(self, label: str, reason: str, torch_ops: bool):
+        self.id = next(_ids)
+        self.label = label
+        self.reason = reason                # "header" or "sampled"
+        self.torch_ops = torch_ops
+        self.started = time.time()
+        self.duration_ms = None
+        self.timing = None                  # the request's metrics breakdown
+        self.stacks = Counter()             # "stage;thread;frames..." -> samples
+        self.ops = {}                       # stage -> {op: [calls, cpu_us, self_cpu_us]}
+        self.torch_skipped = 0              # sections run while another one held the torch profiler
+        self._threads = {}                  # thread id -> (stage, thread name)
+
+    def summary(self):
+        stages = Counter()
+        for stack, n in self.stacks.items():
+            stages[stack.split(";", 1)[0]] += n
+        return {
+            "id": self.id,
+            "claim": self.label,
+            "reason": self.reason,
+            "started": round(self.started, 3),
+            "duration_ms": self.duration_ms,
+            "samples": sum(self.stacks.values()),
+            "samples_per_stage": dict(stages),
+            "torch_sections_skipped": self.torch_skipped,
+            "timing": self.timing,
+        }
+
+    def collapsed(self, stage: str = None) -> str:
+        return "".join(f"{stack} {n}\n" for stack, n in sorted(self.stacks.items())
+                       if stage is None or stack.split(";", 1)[0] == stage)
+
+    def torch_report(self, top: int = 30):
+        report = {}
+        for stage, ops in self.ops.items():
+            rows = sorted(ops.items(), key=lambda kv: -kv[1][2])[:top]
+            report[stage] = [{"op": op, "calls": c, "cpu_ms": round(t / 1000, 3), "self_cpu_ms": round(s / 1000, 3)}
+                             for op, (c, t, s) in rows]
+        return report
+
+
+# ----------------------------
+# Settings
+# ----------------------------
+def settings():
+    return dict(_settings, keep=PROFILE_KEEP)
+
+
+def configure(enabled=None, sample_rate=None, interval_ms=None, torch=None):
+    if enabled is not None:
+        _settings["enabled"] = bool(enabled)
+    if sample_rate is not None:
+        _settings["sample_rate"] = min(1.0, max(0.0, float(sample_rate)))
+    if interval_ms is not None:
+        _settings["interval_ms"] = max(1.0, float(interval_ms))
+    if torch is not None:
+        _settings["torch"] = bool(torch)
+    if _settings["enabled"] and _settings["torch"]:
+        _warm_torch()
+    return settings()
+
+
+# ----------------------------
+# Request scope
+# ----------------------------
+@contextmanager
+def request(label: str, forced: bool = False):
+    """Profile one request if it is selected; yields the Profile or None."""
+    if not _settings["enabled"] or not (forced or random.random() < _settings["sample_rate"]):
+        yield None
+        return
+    prof = Profile(label[:120], "header" if forced else "sampled", _settings["torch"])
+    if prof.torch_ops:
+        _warm_torch()
+    token = _current.set(prof)
+    _start_sampling(prof)
+    t0 = time.perf_counter()
+    try:
+        yield prof
+    finally:
+        prof.duration_ms = round((time.perf_counter() - t0) * 1000, 2)
+        _current.reset(token)
+        with _lock:
+            _active.discard(prof)
+            _finished.append(prof)
+
+
+def current():
+    return _current.get()
+
+
+def enter_stage(name: str):
+    """Called by metrics.stage(); returns a token for exit_stage (None if not profiled)."""
+    if _current.get() is None:
+        return None
+    return _stage.set(name)
+
+
+def exit_stage(token):
+    if token is not None:
+        _stage.reset(token)
+
+
+def tag():
+    """(profile, stage) of the calling context, or None; for work handed to another thread."""
+    prof = _current.get()
+    return None if prof is None else (prof, _stage.get() or "other")
+
+
+@contextmanager
+def section(tags, sample: bool = True, torch_ops: bool = True):
+    """
+    Attribute what the current thread does inside the block to every
+    (profile, stage) in `tags`: its stack samples and/or its torch
+    operators (if the profile asked for them).
+    """
+    if not tags:
+        yield
+        return
+    torch_prof = None
+    if torch_ops and any(p.torch_ops for p, _ in tags):
+        if _torch_ready.is_set() and _torch_lock.acquire(blocking=False):
+            torch_prof = _torch_profiler()
+            if torch_prof is None:
+                _torch_lock.release()
+            else:
+                torch_prof.__enter__()
+        else:
+            with _lock:
+                for prof, _ in tags:
+                    prof.torch_skipped += 1
+    tid = threading.get_ident()
+    if sample:
+        name = threading.current_thread().name
+        with _lock:
+            for prof, stage in tags:
+                prof._threads[tid] = (stage, name)
+    try:
+        yield
+    finally:
+        if sample:
+            with _lock:
+                for prof, _ in tags:
+                    prof._threads.pop(tid, None)
+        if torch_prof is not None:
+            try:
+                torch_prof.__exit__(None, None, None)
+                _merge_ops(torch_prof, [t for t in tags if t[0].torch_ops])
+            finally:
+                _torch_lock.release()
+
+
+def wrap(fn):
+    """
+    fn sampled for the calling context's profile (for run_model's executor
+    threads). Torch operators are recorded around the forward passes only
+    (forward_pass() and the micro-batchers): an executor thread holding the
+    torch profiler while it waits on a batcher would keep the batch's
+    operators from being recorded.
+    """
+    t = tag()
+    if t is None:
+        return fn
+
+    def run(*args, **kwargs):
+        with section([t], torch_ops=False):
+            return fn(*args, **kwargs)
+    return run
+
+
+def forward_pass():
+    """Record the torch operators of a model call made outside the micro-batchers."""
+    t = tag()
+    return section([t] if t is not None else [], sample=False)
+
+
+# ----------------------------
+# Stored profiles
+# ----------------------------
+def profiles():
+    with _lock:
+        return list(_finished)
+
+
+def get(profile_id: int):
+    with _lock:
+        return next((p for p in _finished if p.id == profile_id), None)
+
+
+def merged_collapsed(stage: str = None) -> str:
+    total = Counter()
+    for prof in profiles():
+        for stack, n in prof.stacks.items():
+            if stage is None or stack.split(";", 1)[0] == stage:
+                total[stack] += n
+    return "".join(f"{stack} {n}\n" for stack, n in sorted(total.items()))
+
+
+# ----------------------------
+# Stack sampler
+# ----------------------------
+def _start_sampling(prof):
+    global _sampler
+    with _lock:
+        _active.add(prof)
+        if _sampler is None or not _sampler.is_alive():
+            _sampler = threading.Thread(target=_sample_loop, name="profiler", daemon=True)
+            _sampler.start()
+        _wake.notify()
+
+
+def _frame_label(frame):
+    code = frame.f_code
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}"
+
+
+def _collapse(frame):
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+
+def _sample_loop():
+    while True:
+        with _lock:
+            while not _active:
+                _wake.wait()
+            targets = [(p, dict(p._threads)) for p in _active]
+        frames = sys._current_frames()
+        stacks, hits = {}, []
+        for prof, threads in targets:
+            for tid, (stage, name) in threads.items():
+                frame = frames.get(tid)
+                if frame is None:
+                    continue
+                if tid not in stacks:
+                    stacks[tid] = _collapse(frame)
+                hits.append((prof, f"{stage};{name};{stacks[tid]}"))
+        del frames
+        with _lock:
+            # a profile that finished meanwhile stays as it was handed out
+            for prof, stack in hits:
+                if prof in _active:
+                    prof.stacks[stack] += 1
+        time.sleep(_settings["interval_ms"] / 1000)
+
+
+# ----------------------------
+# Torch operators
+# ----------------------------
+def _warm_torch():
+    global _torch_warming
+    with _lock:
+        if _torch_warming:
+            return
+        _torch_warming = True
+
+    def warm():
+        profiler = _torch_profiler()
+        if profiler is not None:
+            with _torch_lock, profiler:
+                pass
+            _torch_ready.set()
+    threading.Thread(target=warm, name="profiler-warmup", daemon=True).start()
+
+
+def _torch_profiler():
+    # thread-local: records the operators run on this thread only
+    try:
+        from torch.profiler import ProfilerActivity, profile
+    except ImportError:
+        return None
+    return profile(activities=[ProfilerActivity.CPU])
+
+
+def _merge_ops(torch_prof, tags):
+    try:
+        events = torch_prof.key_averages()
+    except Exception:
+        return
+    rows = [(e.key, e.count, e.cpu_time_total, e.self_cpu_time_total) for e in events]
+    with _lock:
+        for prof, stage in tags:
+            if prof not in _active:     # e.g. a discarded speculative fallback finishing late
+                continue
+            ops = prof.ops.setdefault(stage, {})
+            for key, count, total, self_time in rows:
+                row = ops.setdefault(key, [0, 0.0, 0.0])
+                row[0] += count
+                row[1] += total
+                row[2] += self_time
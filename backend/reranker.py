@@ -1,20 +1,16 @@
 # backend/reranker.py
-from sentence_transformers import CrossEncoder
 from typing import List, Dict
+from backend.batching import MicroBatcher
+from backend.models import CROSS_ENCODER_MODEL, get_model
 
-CROSS_ENCODER_MODEL = "cross-encoder/ms-marco-MiniLM-L-6-v2"
-
-_ce = None
 
 def _get_ce():
-    global _ce
-    if _ce is None:
-        # Load ONCE and correctly assign to _ce
-        _ce = CrossEncoder(
-            CROSS_ENCODER_MODEL,
-            device="cpu"    # Fix meta-tensor GPU error
-        )
-    return _ce
+    # loaded once, on CPU, by the shared model registry
+    return get_model(CROSS_ENCODER_MODEL)
+
+
+# pairs from concurrent requests go through one predict() call
+_ce_batcher = MicroBatcher(lambda pairs: _get_ce().predict(pairs), name="reranker")
 
 
 def _extract_text(c: Dict) -> str:
@@ -34,8 +30,6 @@ def _extract_text(c: Dict) -> str:
 
 
 def rerank_with_cross_encoder(query: str, candidates: List[Dict], top_n: int = 3) -> List[Dict]:
-    ce = _get_ce()
-
     if not candidates:
         return []
 
@@ -43,7 +37,7 @@ def rerank_with_cross_encoder(query: str, candidates: List[Dict], top_n: int = 3
     inputs = [[query, _extract_text(c)] for c in candidates]
 
     # Rerank scores
-    scores = ce.predict(inputs)
+    scores = _ce_batcher.submit(inputs)
 
     # Attach scores
     for c, s in zip(candidates, scores):
@@ -2,70 +2,143 @@
 import os
 import faiss
 import numpy as np
-import pandas as pd
-from sentence_transformers import SentenceTransformer
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from backend import bm25, metrics
+from backend.batching import MicroBatcher
+from backend.models import EMB_MODEL, get_model
 
 # =========================
 # PATHS 
 # =========================
-EMB_PATH = "C:/Users/DELL/OneDrive/Documents/SEM 5/EDAI-5/edai5-rag/data/fact_embeddings.npy"
-PARQUET_PATH = "C:/Users/DELL/OneDrive/Documents/SEM 5/EDAI-5/edai5-rag/data/fact_base_clean.parquet"
-FAISS_INDEX_PATH = "C:/Users/DELL/OneDrive/Documents/SEM 5/EDAI-5/edai5-rag/data/faiss_index.bin"
+from backend.paths import EMB_PATH, PARQUET_PATH, FAISS_INDEX_PATH, FACT_STORE_DIR, SHARD_DIR, SNAPSHOT_DIR
+from backend.fact_store import FactStore, build_fact_store
+from backend.index_factory import build_index
+from backend.shards import LocalShard, has_shards, open_shards
+from backend.snapshots import Segment, SnapshotManager, read_index
 
 # =========================
-# LOAD ORIGINAL EMBEDDINGS
+# HYBRID RETRIEVAL
+# dense (FAISS) and keyword (BM25, bm25.py) rankings merged with
+# reciprocal-rank fusion: score = sum over rankings of 1 / (RRF_K + rank)
 # =========================
-embeddings = np.load(EMB_PATH).astype("float32")
-EMB_DIM = embeddings.shape[1]
-NUM_DOCS = embeddings.shape[0]
+HYBRID_RETRIEVAL = os.getenv("HYBRID_RETRIEVAL", "1") == "1"
+HYBRID_DEPTH = int(os.getenv("HYBRID_DEPTH", "20"))     # candidates taken from each ranking
+RRF_K = int(os.getenv("RRF_K", "60"))
+
+
+def _load_base_segment():
+    """Fact base from the offline pipeline (snapshot version 0)."""
+    # texts: memory-mapped fact store, built once from the parquet
+    if not FactStore.exists(FACT_STORE_DIR):
+        build_fact_store(PARQUET_PATH, FACT_STORE_DIR, EMB_PATH)
+    fact_store = FactStore(FACT_STORE_DIR)
+    # keyword index: also built once, next to the fact store's columns
+    if HYBRID_RETRIEVAL and not bm25.exists(FACT_STORE_DIR):
+        bm25.build_for_store(fact_store)
+
+    # index: the raw embeddings are only touched when it has to be built;
+    # index type + nprobe/efSearch come from FAISS_* env vars (index_factory.py)
+    if has_shards(SHARD_DIR):
+        # fan-out over N shards (in-process or worker processes, FAISS_SHARD_MODE)
+        searcher = open_shards(SHARD_DIR)
+    elif os.path.exists(FAISS_INDEX_PATH):
+        searcher = LocalShard(index=read_index(FAISS_INDEX_PATH))
+    else:
+        index = build_index(fact_store.embeddings)
+        faiss.write_index(index, FAISS_INDEX_PATH)
+        searcher = LocalShard(index=index)
+    return Segment(fact_store, searcher, start=0)
 
-# =========================
-# LOAD TEXTS
-# =========================
-docs_df = pd.read_parquet(PARQUET_PATH)
-if "summary" in docs_df.columns:
-    DOC_TEXTS = docs_df["summary"].fillna("")
-elif "text" in docs_df.columns:
-    DOC_TEXTS = docs_df["text"].fillna("")
-else:
-    DOC_TEXTS = docs_df.astype(str).agg(" ".join, axis=1).fillna("")
 
 # =========================
-# LOAD FAISS INDEX
+# LIVE SNAPSHOT
+# swapped without restart when backend/ingest.py publishes new rows;
+# each request keeps the snapshot it started with
 # =========================
-if os.path.exists(FAISS_INDEX_PATH):
-    faiss_index = faiss.read_index(FAISS_INDEX_PATH)
-else:
-    faiss_index = faiss.IndexFlatL2(EMB_DIM)
-    faiss_index.add(embeddings)
-    faiss.write_index(faiss_index, FAISS_INDEX_PATH)
+snapshots = SnapshotManager(SNAPSHOT_DIR, _load_base_segment)
+
+
+def current_snapshot():
+    return snapshots.current()
 
 # =========================
 # ORIGINAL EMBEDDER (VERY IMPORTANT)
 # same model used to create the embeddings!!
+# shared with stance_ml through the model registry
 # =========================
-_embedder = SentenceTransformer("sentence-transformers/all-mpnet-base-v2")
+# concurrent queries share one encode() call
+_embed_batcher = MicroBatcher(
+    lambda texts: get_model(EMB_MODEL).encode(texts).astype("float32"),
+    name="embedder",
+)
+
+
+def embed_queries(queries):
+    return np.asarray(_embed_batcher.submit(queries), dtype="float32")
 
 # =========================
 # RETRIEVE FUNCTION
 # =========================
-def retrieve_top_facts(query: str, top_k: int = 5):
+def reciprocal_rank_fusion(rankings, k: int = RRF_K):
+    """[(idx, fused score)] best first; `rankings` are lists of idx, best first."""
+    fused = {}
+    for ranking in rankings:
+        for rank, idx in enumerate(ranking, 1):
+            fused[idx] = fused.get(idx, 0.0) + 1.0 / (k + rank)
+    return sorted(fused.items(), key=lambda kv: -kv[1])
+
+
+def retrieve_top_facts(query: str, top_k: int = 5, q_vec=None, hybrid: bool = None):
+    """
+    `q_vec`: the query's embedding when the caller already has it.
+    `hybrid`: fuse in BM25 keyword hits (default HYBRID_RETRIEVAL; only
+    when the snapshot has a keyword index).
+    """
     if not query.strip():
         return []
 
-    q_vec = _embedder.encode([query]).astype("float32")
-    D, I = faiss_index.search(q_vec, top_k)
+    snap = current_snapshot()
+    # English summaries + detected language from prepare_factbase.py (if present)
+    has_en = snap.has("summary_en") and snap.has("lang")
+    use_keywords = (HYBRID_RETRIEVAL if hybrid is None else hybrid) and snap.keywords is not None
+
+    if q_vec is None:
+        q_vec = embed_queries([query])
+    q_vec = np.asarray(q_vec, dtype="float32").reshape(1, -1)
+    D, I = snap.search(q_vec, max(top_k, HYBRID_DEPTH) if use_keywords else top_k)
+    dense = {int(idx): float(dist) for dist, idx in zip(D[0], I[0]) if idx != -1}
+
+    if use_keywords:
+        kw_scores, kw_ids = snap.keywords.search(query, max(top_k, HYBRID_DEPTH))
+        keyword = {int(idx): float(s) for s, idx in zip(kw_scores, kw_ids)}
+        fused = reciprocal_rank_fusion([list(dense), list(keyword)])[:top_k]
+        # `score` stays the dense distance: compute it for keyword-only hits
+        missing = [idx for idx, _ in fused if idx not in dense]
+        if missing:
+            metrics.count("keyword_only_facts", len(missing))
+            vecs = snap.vectors(missing)
+            if vecs is not None:
+                dense.update(zip(missing, ((vecs - q_vec) ** 2).sum(axis=1).tolist()))
+            else:
+                # not among the dense candidates, so at least as far as the last of them
+                far = max(dense.values(), default=4.0)
+                dense.update((idx, far) for idx in missing)
+        hits = [(idx, rrf) for idx, rrf in fused]
+    else:
+        keyword = {}
+        hits = [(idx, None) for idx in dense]
 
     results = []
-    for dist, idx in zip(D[0], I[0]):
-        if idx == -1:
-            continue
-        text = DOC_TEXTS.iloc[idx] if idx < len(DOC_TEXTS) else ""
-        results.append({
-            "summary": str(text),
-            "score": float(dist),
-            "idx": int(idx)
-        })
+    for idx, rrf in hits:
+        item = {
+            "summary": snap.text("summary", idx),
+            "score": dense[idx],
+            "idx": idx
+        }
+        if rrf is not None:
+            item["rrf"] = rrf
+            item["bm25"] = keyword.get(idx)
+        if has_en:
+            item["summary_en"] = snap.text("summary_en", idx)
+            item["lang"] = snap.text("lang", idx) or "en"
+        results.append(item)
     return results
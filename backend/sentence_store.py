@@ -0,0 +1,101 @@
+# backend/sentence_store.py
+"""
+Precomputed sentence splits + sentence embeddings of the fact base.
+
+Layout of SENTENCE_DIR:
+    sent_embeddings.npy      float16 (n_sentences, dim), flat over all docs
+    doc_offsets.npy          int64 (n_docs + 1); doc i owns rows
+                             doc_offsets[i]:doc_offsets[i + 1]
+    sent_text.bin / .offsets.npy   string arena with the sentence texts
+
+Build once with:
+    python -m backend.sentence_store
+"""
+import os
+import numpy as np
+from backend.arena import StringArena, write_string_arena
+from backend.paths import PARQUET_PATH, SENTENCE_DIR
+
+
+class SentenceStore:
+    def __init__(self, directory: str = SENTENCE_DIR):
+        self.embeddings = np.load(os.path.join(directory, "sent_embeddings.npy"), mmap_mode="r")
+        self.doc_offsets = np.load(os.path.join(directory, "doc_offsets.npy"), mmap_mode="r")
+        self.texts = StringArena(os.path.join(directory, "sent_text"))
+
+    @staticmethod
+    def exists(directory: str = SENTENCE_DIR) -> bool:
+        return os.path.exists(os.path.join(directory, "doc_offsets.npy"))
+
+    def __len__(self):
+        return len(self.doc_offsets) - 1
+
+    def get(self, idx: int):
+        """(sentences, float16 vectors view) for fact row `idx`, or None."""
+        if idx is None or not 0 <= idx < len(self):
+            return None
+        start, end = int(self.doc_offsets[idx]), int(self.doc_offsets[idx + 1])
+        return self.texts.slice(start, end), self.embeddings[start:end]
+
+
+_store = None
+_store_checked = False
+
+
+def get_sentence_store():
+    """Open the store once (memory-mapped); None if it was never built."""
+    global _store, _store_checked
+    if not _store_checked:
+        _store_checked = True
+        if SentenceStore.exists():
+            _store = SentenceStore()
+            print(f"[sentence_store] {len(_store.embeddings)} sentences for {len(_store)} docs")
+    return _store
+
+
+# =========================
+# BUILD STEP
+# =========================
+def build_sentence_store(texts, out_dir: str = SENTENCE_DIR, batch_size: int = 256):
+    """Split every (English) summary into sentences and encode them once."""
+    from tqdm import tqdm
+    from backend.models import EMB_MODEL, get_model
+    # the splitter stance uses at request time (regex without punkt data)
+    from backend.stance_ml import split_sentences
+
+    os.makedirs(out_dir, exist_ok=True)
+
+    sentences = []
+    doc_offsets = np.zeros(len(texts) + 1, dtype=np.int64)
+    for i, t in enumerate(texts):
+        sentences.extend(split_sentences(t or ""))
+        doc_offsets[i + 1] = len(sentences)
+
+    emb = get_model(EMB_MODEL)
+    dim = emb.get_sentence_embedding_dimension()
+    vecs = np.lib.format.open_memmap(
+        os.path.join(out_dir, "sent_embeddings.npy"), mode="w+",
+        dtype=np.float16, shape=(len(sentences), dim),
+    )
+    for start in tqdm(range(0, len(sentences), batch_size), desc="encoding sentences"):
+        batch = sentences[start:start + batch_size]
+        vecs[start:start + len(batch)] = emb.encode(batch, batch_size=batch_size).astype(np.float16)
+    vecs.flush()
+    del vecs
+
+    np.save(os.path.join(out_dir, "doc_offsets.npy"), doc_offsets)
+    write_string_arena(sentences, os.path.join(out_dir, "sent_text"))
+    print(f"✅ {len(sentences)} sentences for {len(texts)} docs saved in {out_dir}")
+
+
+if __name__ == "__main__":
+    import pandas as pd
+    from backend.translate import translate_many_to_english
+
+    # stance works on English text, so split the translated summaries
+    # (summary_en from prepare_factbase.py, else translate here)
+    df = pd.read_parquet(PARQUET_PATH)
+    if "summary_en" in df.columns:
+        build_sentence_store(df["summary_en"].fillna("").astype(str).tolist())
+    else:
+        build_sentence_store(translate_many_to_english(df["summary"].fillna("").astype(str).tolist()))
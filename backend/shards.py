@@ -0,0 +1,210 @@
+# backend/shards.py
+"""
+Sharded vector search: the fact base is split into N FAISS shards whose
+ids are the global fact row ids. A query fans out to all shards in
+parallel and the per-shard top-k lists are merged by distance.
+
+Layout of SHARD_DIR (written by build_shards / `python -m backend.shards`):
+    manifest.json   {"dim", "ntotal", "params", "shards": [{"path", "start", "end"}]}
+    shard_<i>.faiss IndexIDMap over rows start..end-1
+
+Shards are served in-process ("local") or each by its own worker process
+("process"), selected with FAISS_SHARD_MODE.
+"""
+import atexit
+import json
+import multiprocessing as mp
+import os
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+import faiss
+import numpy as np
+from backend import index_factory
+
+FAISS_SHARDS = int(os.getenv("FAISS_SHARDS", "1"))
+FAISS_SHARD_MODE = os.getenv("FAISS_SHARD_MODE", "local")     # local | process
+
+# opened by open_shards and not closed yet; closed together at exit
+_open_indexes = weakref.WeakSet()
+
+
+# =========================
+# BUILD
+# =========================
+def build_shards(vectors, out_dir: str, n_shards: int = FAISS_SHARDS, **overrides):
+    """Split `vectors` into contiguous row ranges, one trained index each."""
+    os.makedirs(out_dir, exist_ok=True)
+    n = len(vectors)
+    n_shards = max(1, min(n_shards, n))
+    bounds = np.linspace(0, n, n_shards + 1).astype(int)
+
+    shards = []
+    for i in range(n_shards):
+        start, end = int(bounds[i]), int(bounds[i + 1])
+        part = vectors[start:end]
+        base = index_factory.new_index(vectors.shape[1], len(part), **overrides)
+        index_factory.train_index(base, part)
+        index = faiss.IndexIDMap(base)
+        index_factory.add_vectors(index, part, ids=np.arange(start, end, dtype="int64"))
+        path = f"shard_{i}.faiss"
+        faiss.write_index(index, os.path.join(out_dir, path))
+        shards.append({"path": path, "start": start, "end": end})
+        print(f"  shard {i}: rows {start}..{end - 1}")
+
+    manifest = {
+        "dim": int(vectors.shape[1]),
+        "ntotal": int(n),
+        "params": index_factory.index_params(**overrides),
+        "shards": shards,
+    }
+    with open(os.path.join(out_dir, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def has_shards(directory: str) -> bool:
+    return os.path.exists(os.path.join(directory, "manifest.json"))
+
+
+# =========================
+# SHARD BACKENDS
+# =========================
+def _load_shard_index(path):
+    index = faiss.read_index(path)
+    index_factory.configure_search(index)
+    return index
+
+
+class LocalShard:
+    """Shard searched in this process (FAISS releases the GIL)."""
+
+    def __init__(self, path=None, index=None):
+        self.index = index if index is not None else _load_shard_index(path)
+
+    def search(self, queries, k):
+        return index_factory.search(self.index, queries, k)
+
+    def close(self):
+        pass
+
+
+def _shard_worker(path, conn):
+    faiss.omp_set_num_threads(1)       # parallelism comes from the fan-out
+    index = _load_shard_index(path)
+    conn.send(("ready", index.ntotal))
+    while True:
+        msg = conn.recv()
+        if msg is None:
+            break
+        queries, k = msg
+        try:
+            conn.send(("ok", index_factory.search(index, queries, k)))
+        except Exception as e:
+            conn.send(("error", repr(e)))
+
+
+class ProcessShard:
+    """Shard served by a local worker process over a pipe."""
+
+    def __init__(self, path):
+        ctx = mp.get_context("spawn")
+        self._conn, child = ctx.Pipe()
+        self._proc = ctx.Process(target=_shard_worker, args=(path, child), daemon=True)
+        self._proc.start()
+        self._lock = threading.Lock()
+        status, _ = self._conn.recv()
+        if status != "ready":
+            raise RuntimeError(f"shard worker for {path} failed to start")
+
+    def search(self, queries, k):
+        with self._lock:
+            self._conn.send((np.ascontiguousarray(queries, dtype="float32"), k))
+            status, payload = self._conn.recv()
+        if status != "ok":
+            raise RuntimeError(f"shard search failed: {payload}")
+        return payload
+
+    def close(self):
+        if self._proc.is_alive():
+            try:
+                self._conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+            self._proc.join(timeout=5)
+            if self._proc.is_alive():
+                self._proc.terminate()
+
+
+# =========================
+# FAN-OUT + MERGE
+# =========================
+def merge_topk(results, k):
+    """Merge per-shard (D, I) lists into global top-k by distance."""
+    D = np.concatenate([r[0] for r in results], axis=1)
+    I = np.concatenate([r[1] for r in results], axis=1)
+    D = np.where(I < 0, np.inf, D)
+    order = np.argsort(D, axis=1, kind="stable")[:, :k]
+    D = np.take_along_axis(D, order, axis=1)
+    I = np.take_along_axis(I, order, axis=1)
+    I[~np.isfinite(D)] = -1
+    return D.astype("float32"), I
+
+
+class ShardedIndex:
+    def __init__(self, shards, dim: int, ntotal: int):
+        self.shards = shards
+        self.d = dim
+        self.ntotal = ntotal
+        self._pool = ThreadPoolExecutor(max_workers=max(1, len(shards)), thread_name_prefix="shard")
+
+    def search(self, queries, k):
+        if len(self.shards) == 1:
+            return self.shards[0].search(queries, k)
+        futures = [self._pool.submit(s.search, queries, k) for s in self.shards]
+        return merge_topk([f.result() for f in futures], k)
+
+    def close(self):
+        _open_indexes.discard(self)
+        for s in self.shards:
+            s.close()
+        self._pool.shutdown(wait=False)
+
+
+@atexit.register
+def _close_open_indexes():
+    """Shards still open at exit (snapshots close theirs when retired)."""
+    for index in list(_open_indexes):
+        index.close()
+
+
+def open_shards(directory: str, mode: str = FAISS_SHARD_MODE) -> ShardedIndex:
+    with open(os.path.join(directory, "manifest.json"), encoding="utf-8") as f:
+        manifest = json.load(f)
+    cls = ProcessShard if mode == "process" else LocalShard
+    shards = [cls(os.path.join(directory, s["path"])) for s in manifest["shards"]]
+    index = ShardedIndex(shards, manifest["dim"], manifest["ntotal"])
+    _open_indexes.add(index)
+    print(f"[shards] {len(shards)} {mode} shards, {manifest['ntotal']} vectors")
+    return index
+
+
+def search_index(index, queries, k):
+    """Search a plain FAISS index or a ShardedIndex; returns L2-style (D, I)."""
+    if isinstance(index, ShardedIndex):
+        return index.search(queries, k)
+    return index_factory.search(index, queries, k)
+
+
+if __name__ == "__main__":
+    import argparse
+    from backend.fact_store import FactStore
+    from backend.paths import FACT_STORE_DIR, SHARD_DIR
+
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--shards", type=int, default=max(2, FAISS_SHARDS))
+    ap.add_argument("--out", default=SHARD_DIR)
+    args = ap.parse_args()
+
+    manifest = build_shards(FactStore(FACT_STORE_DIR).embeddings, args.out, args.shards)
+    print(f"✅ {len(manifest['shards'])} shards saved in {args.out}")
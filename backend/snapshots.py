@@ -0,0 +1,197 @@
+# backend/snapshots.py
+"""
+Versioned, immutable snapshots of the fact base (fact rows + vector index).
+
+A snapshot is a list of segments. Each segment is a fact store plus the
+index over its rows, and it covers global row ids start..end-1. Layout of
+SNAPSHOT_DIR (written by backend/ingest.py):
+
+    CURRENT                 name of the live manifest (swapped atomically)
+    manifest_<version>.json {"version", "dim", "ntotal", "segments": [...]}
+    segments/<id>/          store/ (+ store/bm25/) + index.faiss   (never modified)
+
+The running server polls CURRENT and switches to a new snapshot by
+swapping one reference. Requests that already hold the old snapshot
+finish on it. The old snapshot is closed after a grace period.
+"""
+import bisect
+import json
+import os
+import threading
+import time
+import faiss
+import numpy as np
+from backend import index_factory
+from backend.bm25 import BM25Index, SparseIndex
+from backend.fact_store import FactStore
+from backend.shards import LocalShard, ShardedIndex, open_shards
+
+SNAPSHOT_POLL_SECONDS = float(os.getenv("SNAPSHOT_POLL_SECONDS", "10"))
+SNAPSHOT_RETIRE_SECONDS = float(os.getenv("SNAPSHOT_RETIRE_SECONDS", "60"))
+
+
+def read_index(path):
+    try:
+        index = faiss.read_index(path, faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY)
+    except RuntimeError:
+        index = faiss.read_index(path)
+    return index_factory.configure_search(index)
+
+
+class Segment:
+    def __init__(self, store: FactStore, searcher, start: int = 0):
+        self.store = store
+        self.searcher = searcher            # .search(q, k) → global ids
+        self.start = start
+        self.end = start + len(store)
+        self.bm25 = BM25Index.open(store.directory)     # None if the segment has no keyword index
+
+    @classmethod
+    def load(cls, spec: dict, root: str):
+        """Segment from its manifest entry; paths are relative to `root`."""
+        resolve = lambda p: p if os.path.isabs(p) else os.path.join(root, p)
+        store = FactStore(resolve(spec["store"]))
+        if spec.get("shards"):
+            searcher = open_shards(resolve(spec["shards"]))
+        else:
+            searcher = LocalShard(index=read_index(resolve(spec["index"])))
+        return cls(store, searcher, spec["start"])
+
+
+class Snapshot:
+    def __init__(self, segments, version: int = 0):
+        self.segments = sorted(segments, key=lambda s: s.start)
+        self.version = version
+        self.ntotal = sum(len(s.store) for s in self.segments)
+        self._starts = [s.start for s in self.segments]
+        dim = self.segments[0].store.meta.get("dim") or 0
+        self._index = ShardedIndex([s.searcher for s in self.segments], dim, self.ntotal)
+        # keyword search only when every segment has its BM25 index
+        self.keywords = None
+        if all(s.bm25 is not None for s in self.segments):
+            self.keywords = SparseIndex([(s.start, s.bm25) for s in self.segments])
+
+    def search(self, queries, k: int):
+        return self._index.search(queries, k)
+
+    def vectors(self, ids):
+        """Stored embeddings of global row ids, or None if a segment keeps none."""
+        out = []
+        for idx in ids:
+            seg = self._segment(idx)
+            emb = seg.store.embeddings if seg is not None else None
+            if emb is None:
+                return None
+            out.append(emb[idx - seg.start])
+        return np.asarray(out, dtype="float32")
+
+    def _segment(self, idx: int):
+        i = bisect.bisect_right(self._starts, idx) - 1
+        if i < 0:
+            return None
+        seg = self.segments[i]
+        return seg if idx < seg.end else None
+
+    def has(self, column: str) -> bool:
+        return all(s.store.has(column) for s in self.segments)
+
+    def text(self, column: str, idx: int, default: str = "") -> str:
+        seg = self._segment(idx)
+        if seg is None:
+            return default
+        return seg.store.text(column, idx - seg.start, default)
+
+    def close(self):
+        self._index.close()
+
+
+class SnapshotManager:
+    """
+    Holds the live snapshot. `base_loader()` provides the snapshot used
+    before anything was ingested (no CURRENT file yet).
+    """
+
+    def __init__(self, directory: str, base_loader, poll_seconds: float = SNAPSHOT_POLL_SECONDS):
+        self.directory = directory
+        self.base_loader = base_loader
+        self.poll_seconds = poll_seconds
+        self._current = None
+        self._current_name = None
+        self._lock = threading.Lock()
+        self._watcher = None
+        self._listeners = []
+
+    # ----------------------------
+    # Access
+    # ----------------------------
+    def current(self) -> Snapshot:
+        snap = self._current
+        if snap is None:
+            with self._lock:
+                if self._current is None:
+                    self._swap(*self._load_latest())
+                    self._start_watcher()
+                snap = self._current
+        return snap
+
+    def version(self) -> int:
+        return self.current().version
+
+    def on_swap(self, fn):
+        """Call fn(new_snapshot) after every swap (e.g. to drop caches)."""
+        self._listeners.append(fn)
+
+    # ----------------------------
+    # Loading + swapping
+    # ----------------------------
+    def _current_file(self):
+        path = os.path.join(self.directory, "CURRENT")
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding="utf-8") as f:
+            return f.read().strip() or None
+
+    def _load_latest(self):
+        name = self._current_file()
+        if name is None:
+            return Snapshot([self.base_loader()], version=0), None
+        with open(os.path.join(self.directory, name), encoding="utf-8") as f:
+            manifest = json.load(f)
+        segments = [Segment.load(spec, self.directory) for spec in manifest["segments"]]
+        return Snapshot(segments, version=manifest["version"]), name
+
+    def _swap(self, snap, name):
+        old = self._current
+        self._current, self._current_name = snap, name
+        print(f"[snapshots] serving version {snap.version} ({snap.ntotal} rows, {len(snap.segments)} segments"
+              f"{', BM25' if snap.keywords is not None else ''})")
+        if old is not None:
+            # let in-flight requests finish on the old snapshot first
+            t = threading.Timer(SNAPSHOT_RETIRE_SECONDS, old.close)
+            t.daemon = True
+            t.start()
+        for fn in self._listeners:
+            fn(snap)
+
+    def reload(self) -> bool:
+        """Switch to the manifest named in CURRENT if it changed."""
+        with self._lock:
+            if self._current is not None and self._current_file() == self._current_name:
+                return False
+            self._swap(*self._load_latest())
+            return True
+
+    def _start_watcher(self):
+        if self.poll_seconds <= 0 or self._watcher is not None:
+            return
+
+        def loop():
+            while True:
+                time.sleep(self.poll_seconds)
+                try:
+                    self.reload()
+                except Exception as e:
+                    print(f"[snapshots] reload failed, keeping version {self._current.version}: {e}")
+
+        self._watcher = threading.Thread(target=loop, name="snapshot-watcher", daemon=True)
+        self._watcher.start()
@@ -1,44 +1,102 @@
 # backend/stance_ml.py
+import os
+import re
+import threading
 import nltk
 from nltk.tokenize import sent_tokenize, word_tokenize
-from sentence_transformers import CrossEncoder, SentenceTransformer, util
+from sentence_transformers import util
 import torch
-from backend.translate import translate_to_english
-
-try:
-    nltk.data.find("tokenizers/punkt")
-except:
-    nltk.download("punkt")
-
-NLI_MODEL = "cross-encoder/nli-deberta-base"
-EMB_MODEL = "sentence-transformers/all-mpnet-base-v2"
-
-_nli = None
-_emb = None
+import numpy as np
+from backend.translate import translate_to_english, translate_many_to_english
+from backend import metrics, profiling
+from backend.batching import MicroBatcher
+from backend.thread_budget import model_slot
+from backend.models import NLI_MODEL, EMB_MODEL, get_model
+from backend.sentence_store import get_sentence_store
+
+# punkt is checked (and downloaded if missing) on first use or by the
+# startup warmup, never at import: startup must not need the network
+NLTK_DOWNLOAD = os.getenv("NLTK_DOWNLOAD", "1") == "1"
+_punkt = None           # True: nltk tokenizers work; False: regex fallback
+_punkt_lock = threading.Lock()
+
+
+def _punkt_works() -> bool:
+    try:
+        sent_tokenize("A test. Another one.")
+        word_tokenize("a test")
+        return True
+    except LookupError:
+        return False
+
+
+def ensure_tokenizers() -> str:
+    """Returns "punkt" if nltk's tokenizers are usable, else "regex" (no punkt data, no network)."""
+    global _punkt
+    if _punkt is None:
+        with _punkt_lock:
+            if _punkt is None:
+                ok = _punkt_works()
+                if not ok and NLTK_DOWNLOAD:
+                    for package in ("punkt", "punkt_tab"):     # punkt_tab: nltk >= 3.8.2
+                        try:
+                            nltk.download(package, quiet=True)
+                        except Exception as e:
+                            print(f"[stance] nltk download of {package} failed: {e}")
+                    ok = _punkt_works()
+                if not ok:
+                    print("[stance] punkt unavailable, splitting sentences with a regex")
+                _punkt = ok
+    return "punkt" if _punkt else "regex"
+
+
+def split_sentences(text: str):
+    if ensure_tokenizers() == "punkt":
+        return sent_tokenize(text)
+    return [s for s in re.split(r"(?<=[.!?])\s+", text.strip()) if s]
+
+
+def split_words(text: str):
+    if ensure_tokenizers() == "punkt":
+        return word_tokenize(text)
+    return re.findall(r"\w+|[^\w\s]", text)
 
 
 def get_nli():
-    global _nli
-    if _nli is None:
-        _nli = CrossEncoder(NLI_MODEL)
-    return _nli
+    return get_model(NLI_MODEL)
 
 
 def get_emb():
-    global _emb
-    if _emb is None:
-        _emb = SentenceTransformer(EMB_MODEL)
-    return _emb
+    # same instance as the retrieval embedder
+    return get_model(EMB_MODEL)
+
+
+# (claim, sentence) pairs from concurrent requests share one NLI pass
+_nli_batcher = MicroBatcher(
+    lambda pairs: get_nli().predict(pairs, apply_softmax=True),
+    name="nli",
+)
 
 
 LABEL_MAP = {0: "contradict", 1: "neutral", 2: "support"}
 
+# "exhaustive": NLI on every evidence sentence. "cascade": NLI on the most
+# similar sentences first; with the defaults it picks the same sentence.
+STANCE_MODE = os.getenv("STANCE_MODE", "cascade")
+STANCE_TOP_M = int(os.getenv("STANCE_TOP_M", "0"))               # max sentences per evidence (0 = all)
+STANCE_SIM_FLOOR = float(os.getenv("STANCE_SIM_FLOOR", "-1"))     # skip sentences below this cosine
+STANCE_EARLY_STOP = float(os.getenv("STANCE_EARLY_STOP", "0"))    # stop at this combined confidence (0 = off)
+STANCE_NLI_CHUNK = max(1, int(os.getenv("STANCE_NLI_CHUNK", "4")))  # sentences per NLI call
+
+_stats = {"evidence": 0, "sentences": 0, "nli_pairs": 0}
+_stats_lock = threading.Lock()
+
 
 # ---------------------------------------------------------
 # Subject detection — fallback for vague claims
 # ---------------------------------------------------------
 def is_low_information_claim(claim: str) -> bool:
-    tokens = word_tokenize(claim.lower())
+    tokens = split_words(claim.lower())
     if len(tokens) < 3:
         return True
 
@@ -56,51 +114,199 @@ def is_low_information_claim(claim: str) -> bool:
 # ---------------------------------------------------------
 # Sentence-level stance with semantic filtering
 # ---------------------------------------------------------
-def classify_sentence_level(claim: str, evidence_text: str):
-
-    evidence_text = translate_to_english(evidence_text)
-    sentences = sent_tokenize(evidence_text)
+def classify_sentence_level(claim: str, evidence_text: str, claim_emb=None, precomputed=None,
+                            is_english: bool = False):
+    """
+    `precomputed` = (sentences, sentence vectors) from the offline sentence
+    store; when given, the evidence is neither translated, split nor encoded.
+    `is_english` skips language detection/translation of `evidence_text`.
+    """
+    if precomputed is None and not is_english:
+        evidence_text = translate_to_english(evidence_text)
+    return _classify_groups(claim, [_split(evidence_text, precomputed)], claim_emb)[0]
+
+
+def _split(text_en: str, precomputed=None):
+    """(sentences, stored vectors or None) of one evidence item."""
+    if precomputed is not None:
+        return precomputed
+    return split_sentences(text_en), None
+
+
+def _classify_groups(claim: str, groups, claim_emb=None):
+    """
+    Best sentence of every evidence item (`groups` = [(sentences, vectors
+    or None)]), with the work of all items fused: one encode for the
+    sentences without stored vectors, one similarity matmul, and NLI calls
+    shared by all items.
+    """
+    emb = get_emb()
+    if claim_emb is None:
+        with model_slot(), profiling.forward_pass():
+            claim_emb = emb.encode(claim, convert_to_tensor=True)
+
+    todo = [s for sentences, vecs in groups if vecs is None for s in sentences]
+    if todo:
+        with model_slot(), profiling.forward_pass():
+            encoded = emb.encode(todo, convert_to_numpy=True)
+    parts, pos = [], 0
+    for sentences, vecs in groups:
+        if not sentences:
+            continue
+        if vecs is None:
+            parts.append(encoded[pos:pos + len(sentences)])
+            pos += len(sentences)
+        else:
+            parts.append(np.asarray(vecs, dtype=np.float32))
+
+    sims, pos = [], 0
+    if parts:
+        flat = util.cos_sim(claim_emb, torch.from_numpy(np.concatenate(parts).astype(np.float32)))[0].tolist()
+    for sentences, _ in groups:
+        sims.append(flat[pos:pos + len(sentences)] if sentences else [])
+        pos += len(sentences)
+
+    probs = _score_groups(claim, [g[0] for g in groups], sims)
 
-    if not sentences:
-        return ("", "neutral", 0.0, [], 0.0, 0.0)
+    out = []
+    for (sentences, _), g_sims, g_probs in zip(groups, sims, probs):
+        _count(len(sentences), len(g_probs))
+        if not sentences:
+            out.append(("", "neutral", 0.0, [], 0.0, 0.0))
+            continue
+
+        results = []
+        for i in sorted(g_probs):
+            p = g_probs[i]
+            label_id = int(np.argmax(p))
+            stance = LABEL_MAP[label_id]
+            nli_conf = max(p) * 100
+            combined_conf = float(g_sims[i]) * nli_conf
+
+            results.append((sentences[i], stance, combined_conf, p.tolist(), float(g_sims[i]), float(nli_conf)))
+
+        # first maximum in sentence order, as in exhaustive mode
+        out.append(max(results, key=lambda x: x[2]))
+    return out
 
-    nli = get_nli()
-    emb = get_emb()
 
-    claim_emb = emb.encode(claim, convert_to_tensor=True)
-    sent_embs = emb.encode(sentences, convert_to_tensor=True)
-    sims = util.cos_sim(claim_emb, sent_embs)[0]
+def _upper_bound(sim: float) -> float:
+    """Highest combined confidence a sentence with this similarity can get (1/3 <= max(p) <= 1)."""
+    return sim * 100 if sim >= 0 else sim * 100 / len(LABEL_MAP)
+
+
+def _candidates(sims):
+    """Sentence indices in the order NLI should score them."""
+    if STANCE_MODE == "exhaustive":
+        return list(range(len(sims)))
+    order = sorted(range(len(sims)), key=lambda i: -sims[i])
+    candidates = [i for i in order if sims[i] >= STANCE_SIM_FLOOR] or order[:1]
+    if STANCE_TOP_M > 0:
+        candidates = candidates[:STANCE_TOP_M]
+    return candidates
+
+
+def _score_groups(claim: str, sentence_groups, sims):
+    """
+    NLI probabilities {sentence index: probs} per group.
+
+    exhaustive: every sentence of every group in one NLI call.
+    cascade: rounds of STANCE_NLI_CHUNK most similar sentences per group,
+    all groups in one call per round. A group drops out once none of its
+    remaining sentences can beat its best combined confidence (exact), or
+    the best reaches STANCE_EARLY_STOP.
+    """
+    chunk = None if STANCE_MODE == "exhaustive" else STANCE_NLI_CHUNK
+    candidates = [_candidates(g) for g in sims]
+    probs = [{} for _ in sentence_groups]
+    best = [None] * len(sentence_groups)
+    pos = [0] * len(sentence_groups)
+
+    while True:
+        batch = []
+        for g, cands in enumerate(candidates):
+            if pos[g] >= len(cands):
+                continue
+            # strict: an equal bound could still win the sentence-order tie break
+            if best[g] is not None and (best[g] > _upper_bound(sims[g][cands[pos[g]]])
+                                        or 0 < STANCE_EARLY_STOP <= best[g]):
+                pos[g] = len(cands)
+                continue
+            ids = cands[pos[g]:pos[g] + chunk] if chunk else cands
+            pos[g] += len(ids)
+            batch.extend((g, i) for i in ids)
+        if not batch:
+            return probs
+
+        for (g, i), p in zip(batch, _nli(claim, [sentence_groups[g][i] for g, i in batch])):
+            probs[g][i] = p
+            combined = sims[g][i] * max(p) * 100
+            best[g] = combined if best[g] is None else max(best[g], combined)
+
+
+def _nli(claim: str, sentences):
+    """One NLI call, longest sentence first (less padding per batch); probs in input order."""
+    order = sorted(range(len(sentences)), key=lambda i: -len(sentences[i]))
+    out = [None] * len(sentences)
+    for i, p in zip(order, _nli_batcher.submit([(claim, sentences[i]) for i in order])):
+        out[i] = p
+    return out
 
-    pairs = [(claim, s) for s in sentences]
-    probs = nli.predict(pairs, apply_softmax=True)
 
-    results = []
-    for s, sim, p in zip(sentences, sims, probs):
-        label_id = int(torch.argmax(torch.tensor(p)))
-        stance = LABEL_MAP[label_id]
-        nli_conf = max(p) * 100
-        combined_conf = float(sim.item()) * nli_conf
+def _count(sentences: int, nli_pairs: int):
+    with _stats_lock:
+        _stats["evidence"] += 1
+        _stats["sentences"] += sentences
+        _stats["nli_pairs"] += nli_pairs
+    metrics.NLI_SENTENCES.inc(sentences)
+    metrics.NLI_PAIRS.inc(nli_pairs)
+    metrics.count("nli_sentences", sentences)
+    metrics.count("nli_pairs", nli_pairs)
 
-        results.append((s, stance, combined_conf, p.tolist(), float(sim), float(nli_conf)))
 
-    best = max(results, key=lambda x: x[2])
-    return best
+def stance_stats():
+    """NLI pairs actually run vs sentences seen (the exhaustive count)."""
+    with _stats_lock:
+        out = dict(_stats)
+    out["mode"] = STANCE_MODE
+    out["nli_saved"] = round(1 - out["nli_pairs"] / out["sentences"], 4) if out["sentences"] else 0.0
+    return out
 
 
 # ---------------------------------------------------------
 # Apply stance classifier to RAG evidence
 # ---------------------------------------------------------
-def classify_stance_ml(claim: str, evidence_list):
+def classify_stance_ml(claim: str, evidence_list, claim_emb=None):
+    """
+    `claim_emb`: the claim's embedding (same model) if already computed.
+    All evidence items are scored together (see _classify_groups).
+    """
 
     # 🔥 rule: vague claims → skip stance and fallback
     if is_low_information_claim(claim):
         return []
 
-    out = []
-    for ev in evidence_list:
-        text = ev.get("summary") or ""
-        best_sentence, stance, combined_conf, raw_probs, sim, nli_conf = classify_sentence_level(claim, text)
+    # sentences + vectors of fact rows come precomputed when the store exists
+    store = get_sentence_store()
+    precomputed = [store.get(ev.get("idx")) if store is not None else None for ev in evidence_list]
+
+    # English text: offline `summary_en` from the fact base when available,
+    # otherwise one batched (cached) translation call for the rest
+    # (items carrying the offline `lang` tag came straight from the fact base)
+    texts_en = [ev.get("summary_en") if ev.get("lang") else None for ev in evidence_list]
+    todo = [i for i, (p, t) in enumerate(zip(precomputed, texts_en)) if p is None and t is None]
+    for i, t in zip(todo, translate_many_to_english([evidence_list[i].get("summary") or "" for i in todo])):
+        texts_en[i] = t
+
+    # the claim is encoded once for all evidence items (or reused from retrieval)
+    if claim_emb is not None:
+        claim_emb = torch.from_numpy(np.asarray(claim_emb, dtype=np.float32).reshape(-1))
 
+    groups = [_split(text or "", pre) for text, pre in zip(texts_en, precomputed)]
+    best = _classify_groups(claim, groups, claim_emb)
+
+    out = []
+    for ev, (best_sentence, stance, combined_conf, raw_probs, sim, nli_conf) in zip(evidence_list, best):
         enriched = dict(ev)
         enriched["best_sentence"] = best_sentence
         enriched["stance"] = stance
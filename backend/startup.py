@@ -0,0 +1,80 @@
+# backend/startup.py
+"""
+Background warmup with per-component timing.
+
+Importing backend.app loads no data and no model, and needs no network.
+The FastAPI lifespan hands a list of (component, fn) steps to Startup,
+which runs them in a background thread while the server already answers:
+
+    /healthz   the process is up (always 200)
+    /readyz    200 once every step succeeded, 503 before (or after a failure)
+
+MODEL_WARMUP=0 skips the warmup: everything loads on first use and
+/readyz is 200 right away.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+
+class Startup:
+    def __init__(self):
+        self.started_at = time.time()
+        self.enabled = None             # set by start()
+        self._components = OrderedDict()
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self._thread = None
+
+    def record(self, name: str, seconds: float, status: str = "ok", detail=None):
+        with self._lock:
+            entry = {"status": status, "seconds": round(seconds, 3)}
+            if detail is not None:
+                entry["detail"] = detail
+            self._components[name] = entry
+
+    def _run(self, steps):
+        for name, fn in steps:
+            with self._lock:
+                self._components[name] = {"status": "running"}
+            t0 = time.perf_counter()
+            try:
+                detail = fn()
+                self.record(name, time.perf_counter() - t0, detail=detail if isinstance(detail, str) else None)
+            except Exception as e:
+                print(f"[startup] {name} failed: {e!r}")
+                self.record(name, time.perf_counter() - t0, status="failed", detail=repr(e))
+        self._done.set()
+        print(f"[startup] warm after {time.time() - self.started_at:.1f}s: "
+              f"{ {n: c['seconds'] for n, c in self._components.items()} }")
+
+    def start(self, steps, enabled: bool = True):
+        """Run `steps` [(component, fn)] in order on a background thread."""
+        self.enabled = enabled
+        if not enabled:
+            self._done.set()
+            return
+        for name, _ in steps:
+            self._components.setdefault(name, {"status": "pending"})
+        self._thread = threading.Thread(target=self._run, args=(list(steps),), name="warmup", daemon=True)
+        self._thread.start()
+
+    def wait(self, timeout: float = None) -> bool:
+        return self._done.wait(timeout)
+
+    @property
+    def ready(self) -> bool:
+        if not self._done.is_set():
+            return False
+        with self._lock:
+            return all(c["status"] == "ok" for c in self._components.values())
+
+    def report(self):
+        with self._lock:
+            components = {n: dict(c) for n, c in self._components.items()}
+        return {
+            "ready": self.ready,
+            "warmup": "enabled" if self.enabled else "disabled",
+            "uptime_seconds": round(time.time() - self.started_at, 1),
+            "components": components,
+        }
@@ -0,0 +1,184 @@
+# backend/thread_budget.py
+"""
+CPU thread budget for one server process.
+
+The cores the server may use are split evenly across the uvicorn worker
+processes. Inside a worker the share is split again between model
+forward passes that may run at once (MODEL_CONCURRENCY) and the intra-op
+threads of each pass, so workers × concurrency × threads ≈ cores instead
+of every library starting one thread per core in every process.
+
+CPU_BUDGET          cores for the whole server (default: this process's CPU affinity)
+WEB_CONCURRENCY     uvicorn worker processes (uvicorn reads the same variable for --workers)
+MODEL_CONCURRENCY   forward passes at once per worker (default 1, or 2 with 4+ cores per worker)
+CPU_PIN=1           pin each worker to its own slice of cores (Linux only)
+THREAD_BUDGET=0     leave every library at its own default
+
+OMP_NUM_THREADS, MKL_NUM_THREADS, OPENBLAS_NUM_THREADS, NUMEXPR_NUM_THREADS,
+ONNX_THREADS and ONNX_SESSIONS set explicitly are kept as they are
+(torch and faiss then follow OMP_NUM_THREADS); /admin/threads lists them
+under env_overrides.
+
+apply() must run before numpy / torch / faiss are imported: the OpenMP
+and BLAS runtimes read their thread count once, when they load.
+"""
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+
+THREAD_BUDGET = os.getenv("THREAD_BUDGET", "1") == "1"
+CPU_PIN = os.getenv("CPU_PIN", "0") == "1"
+
+_THREAD_ENV = ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS", "NUMEXPR_NUM_THREADS")
+_ONNX_ENV = ("ONNX_THREADS", "ONNX_SESSIONS")
+
+_layout = None
+_slots = None
+_slot_lock_file = None      # held for the life of the process
+_active = 0
+_waits = 0
+_state_lock = threading.Lock()
+
+
+def available_cores():
+    try:
+        return sorted(os.sched_getaffinity(0))
+    except AttributeError:      # not on Linux
+        return list(range(os.cpu_count() or 1))
+
+
+def _int_env(var: str, default: int) -> int:
+    try:
+        return max(1, int(os.environ[var]))
+    except (KeyError, ValueError):
+        return default
+
+
+def plan(cores: int, workers: int, model_concurrency: int = 0):
+    """Threads per worker for `cores` shared by `workers` processes."""
+    workers = max(1, workers)
+    per_worker = max(1, cores // workers)
+    if model_concurrency <= 0:
+        model_concurrency = 2 if per_worker >= 4 else 1
+    return {
+        "cores": cores,
+        "workers": workers,
+        "cores_per_worker": per_worker,
+        "model_concurrency": model_concurrency,
+        "intra_op_threads": max(1, per_worker // model_concurrency),
+        "oversubscribed": workers > cores,
+    }
+
+
+def _claim_worker_slot(workers: int):
+    """
+    Index of this worker among its siblings. uvicorn does not number its
+    workers, so each one takes the first free lock file of its parent;
+    a restarted worker gets the slot its predecessor released.
+    """
+    global _slot_lock_file
+    try:
+        import fcntl
+    except ImportError:         # Windows: no flock, no pinning
+        return None
+    for i in range(workers):
+        path = os.path.join(tempfile.gettempdir(), f"factcheck-cpu-{os.getppid()}-{i}.lock")
+        f = open(path, "w")
+        try:
+            fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            f.close()
+            continue
+        _slot_lock_file = f
+        return i
+    return None
+
+
+def apply():
+    """Work out this worker's share and configure every library. Idempotent."""
+    global _layout, _slots
+    if _layout is not None:
+        return _layout
+
+    cpus = available_cores()
+    cores = int(os.getenv("CPU_BUDGET", "0")) or len(cpus)
+    workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+    layout = plan(cores, workers, int(os.getenv("MODEL_CONCURRENCY", "0")))
+    layout.update({"enabled": THREAD_BUDGET, "pid": os.getpid(), "worker_index": None, "cpus": None,
+                   "env_overrides": {}})
+    _slots = threading.BoundedSemaphore(layout["model_concurrency"])
+
+    if not THREAD_BUDGET:
+        _layout = layout
+        return _layout
+
+    if CPU_PIN and hasattr(os, "sched_setaffinity") and len(cpus) >= layout["workers"]:
+        index = _claim_worker_slot(layout["workers"])
+        if index is not None:
+            per = len(cpus) // layout["workers"]
+            mine = cpus[index * per:(index + 1) * per]
+            os.sched_setaffinity(0, mine)
+            layout.update({"worker_index": index, "cpus": mine})
+
+    # an explicit setting wins over the budget; /admin/threads lists them
+    layout["env_overrides"] = {var: os.environ[var] for var in _THREAD_ENV + _ONNX_ENV if os.getenv(var)}
+    threads = str(layout["intra_op_threads"])
+    for var in _THREAD_ENV:
+        os.environ.setdefault(var, threads)
+    # read by backend/onnx_engine.py at import
+    os.environ.setdefault("ONNX_THREADS", threads)
+    os.environ.setdefault("ONNX_SESSIONS", str(layout["model_concurrency"]))
+
+    # torch and faiss (OpenMP) follow OMP_NUM_THREADS when it was set explicitly
+    omp_threads = _int_env("OMP_NUM_THREADS", layout["intra_op_threads"])
+    import torch
+    torch.set_num_threads(omp_threads)
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:        # already set, or inter-op work already ran
+        pass
+    import faiss
+    faiss.omp_set_num_threads(omp_threads)
+
+    _layout = layout
+    return _layout
+
+
+@contextmanager
+def model_slot():
+    """Hold one of this worker's MODEL_CONCURRENCY forward-pass slots."""
+    global _active, _waits
+    if not apply()["enabled"]:
+        yield
+        return
+    if not _slots.acquire(blocking=False):
+        with _state_lock:
+            _waits += 1
+        _slots.acquire()
+    with _state_lock:
+        _active += 1
+    try:
+        yield
+    finally:
+        with _state_lock:
+            _active -= 1
+        _slots.release()
+
+
+def layout():
+    """The chosen layout plus what the libraries actually report."""
+    info = dict(apply())
+    import torch
+    import faiss
+    info.update({
+        "torch_threads": torch.get_num_threads(),
+        "torch_interop_threads": torch.get_num_interop_threads(),
+        "faiss_threads": faiss.omp_get_max_threads(),
+        "onnx_threads": int(os.getenv("ONNX_THREADS", "0")),
+        "onnx_sessions": int(os.getenv("ONNX_SESSIONS", "2")),
+        "env": {var: os.getenv(var) for var in _THREAD_ENV},
+        "model_slots_active": _active,
+        "model_slot_waits": _waits,
+    })
+    return info
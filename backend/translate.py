@@ -1,21 +1,27 @@
 # backend/translate.py
+import asyncio
+import os
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 
-from deep_translator import GoogleTranslator
-from langdetect import detect
+from backend import langid, metrics
+from backend.languages import GOOGLE_LANGS, SUPPORTED_CODES
+from backend.translation_backends import get_backend
+from backend.translation_cache import TranslationCache, normalize_segment
 
-# Load all supported languages from deep_translator
-SUPPORTED_LANGS = GoogleTranslator().get_supported_languages(as_dict=True)
-SUPPORTED_CODES = set(SUPPORTED_LANGS.values())
+# static table (backend/languages.py): no network call at import
+SUPPORTED_LANGS = GOOGLE_LANGS
+
+# google | local | none (see backend/translation_backends.py)
+TRANSLATE_BACKEND = os.getenv("TRANSLATE_BACKEND", "google")
 
 
 # ----------------------------
 # Language Detection
 # ----------------------------
 def detect_lang(text: str) -> str:
-    try:
-        return detect(text)
-    except:
-        return "en"   # fallback
+    # script fast path + seeded n-gram model, memoized (backend/langid.py)
+    return langid.detect(text, default="en")
 
 
 # ----------------------------
@@ -49,34 +55,271 @@ def safe_lang(code: str) -> str:
     return "en"  # fallback if unrecognized
 
 
+# ----------------------------
+# Translator backend (swappable, e.g. a local stub in tests)
+# ----------------------------
+_translator = get_backend(TRANSLATE_BACKEND)
+_cache = TranslationCache()
+
+
+def set_translator(fn):
+    """Replace the backend: fn(texts, source, target) -> list of translations."""
+    global _translator
+    _translator = fn
+
+
+def set_cache(cache: TranslationCache):
+    global _cache
+    _cache = cache
+
+
+def get_cache() -> TranslationCache:
+    return _cache
+
+
+# a broken cache costs a translator call, never the request
+def _cache_get(texts, source, target):
+    try:
+        return _cache.get_many(texts, source, target)
+    except Exception as e:
+        print(f"[translate] cache lookup failed, translating uncached: {e}")
+        return {}
+
+
+def _cache_put(pairs, source, target):
+    try:
+        _cache.put_many(pairs, source, target)
+    except Exception as e:
+        print(f"[translate] cache store failed: {e}")
+
+
+# ----------------------------
+# Cached batch translation
+# ----------------------------
+def translate_batch(texts, source: str, target: str, strict: bool = False):
+    """
+    Translate a list of segments source → target.
+
+    Identical segments (after whitespace normalization) are translated
+    once, cached segments are not sent at all, and the rest go to the
+    translator in a single call. On failure the originals are returned,
+    or with `strict` a RuntimeError is raised (for offline jobs that must
+    not store untranslated text as a translation).
+    """
+    texts = list(texts)
+    if source == target:
+        return texts
+
+    norm = [normalize_segment(t) for t in texts]
+    unique = list(dict.fromkeys(n for n in norm if n))
+    if not unique:
+        return texts
+
+    found = _cache_get(unique, source, target)
+    missing = [n for n in unique if n not in found]
+    if missing:
+        try:
+            translated = _translator(missing, source, target)
+            new = [(n, t) for n, t in zip(missing, translated) if t]
+            _cache_put(new, source, target)
+            found.update(new)
+        except Exception as e:
+            print(f"[translate] batch of {len(missing)} failed: {e}")
+            if strict:
+                raise RuntimeError(f"translation {source}→{target} failed: {e}") from e
+        if strict and any(n not in found for n in missing):
+            raise RuntimeError(f"translator returned no text for some {source}→{target} segments")
+
+    return [found.get(n, t) if n else t for n, t in zip(norm, texts)]
+
+
 # ----------------------------
 # Translate ANY → English
 # ----------------------------
-def translate_to_english(text: str) -> str:
+def translate_to_english(text: str, source: str = None) -> str:
+    """`source`: language already detected by the caller (skips detection)."""
     try:
-        src = detect_lang(text)
-        src = safe_lang(src)
+        src = safe_lang(source or detect_lang(text))
 
         if src == "en":
             return text
 
-        return GoogleTranslator(source=src, target="en").translate(text)
+        return translate_batch([text], src, "en")[0]
 
     except Exception:
         return text  # fallback
 
 
+def translate_many_to_english(texts, sources=None):
+    """
+    Batch version of translate_to_english (one call per source language).
+    `sources[i]`, when given, is the already known language of texts[i].
+    """
+    texts = list(texts)
+    out = list(texts)
+    sources = list(sources) if sources is not None else [None] * len(texts)
+    by_src = {}
+    for i, (t, known) in enumerate(zip(texts, sources)):
+        try:
+            src = safe_lang(known or detect_lang(t))
+        except Exception:
+            src = "en"
+        if src != "en":
+            by_src.setdefault(src, []).append(i)
+
+    for src, ids in by_src.items():
+        translated = translate_batch([texts[i] for i in ids], src, "en")
+        for i, t in zip(ids, translated):
+            out[i] = t
+    return out
+
+
 # ----------------------------
 # Translate English → TARGET LANG
 # ----------------------------
 def translate_from_english(text: str, target_lang: str = "en") -> str:
+    return translate_many_from_english([text], target_lang)[0]
+
+
+def translate_many_from_english(texts, target_lang: str = "en"):
     try:
         target = safe_lang(target_lang)
 
         if target == "en":
-            return text
+            return list(texts)
 
-        return GoogleTranslator(source="en", target=target).translate(text)
+        return translate_batch(texts, "en", target)
 
     except Exception:
-        return text  # fallback
+        return list(texts)  # fallback
+
+
+# ----------------------------
+# Async fan-out (request path)
+# ----------------------------
+# uncached segments go to the translator in chunks of TRANSLATE_CHUNK_SEGMENTS,
+# the chunks of one request concurrently, each call bounded by
+# TRANSLATE_TIMEOUT seconds (waiting for a call slot included)
+TRANSLATE_TIMEOUT = float(os.getenv("TRANSLATE_TIMEOUT", "5"))
+TRANSLATE_CONCURRENCY = int(os.getenv("TRANSLATE_CONCURRENCY", "16"))
+TRANSLATE_CHUNK_SEGMENTS = max(1, int(os.getenv("TRANSLATE_CHUNK_SEGMENTS", "8")))
+_io_pool = ThreadPoolExecutor(max_workers=TRANSLATE_CONCURRENCY, thread_name_prefix="translate")
+# cache reads/writes and language detection never queue behind translator calls
+_local_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="translate-local")
+
+# translator calls running or abandoned after a timeout, per event loop: a
+# slot is only given back when the call's thread is free again, so hung
+# upstream calls cannot pile up in _io_pool's queue
+_call_slots = weakref.WeakKeyDictionary()
+
+
+def _slots(loop) -> asyncio.Semaphore:
+    slots = _call_slots.get(loop)
+    if slots is None:
+        slots = _call_slots[loop] = asyncio.Semaphore(TRANSLATE_CONCURRENCY)
+    return slots
+
+
+def _release_from_thread(loop, slots):
+    try:
+        loop.call_soon_threadsafe(slots.release)
+    except RuntimeError:            # loop already closed
+        pass
+
+
+async def _call_translator(chunk, source, target, timeout):
+    """One bounded translator call; raises asyncio.TimeoutError past `timeout`."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    slots = _slots(loop)
+    await asyncio.wait_for(slots.acquire(), timeout)
+
+    def run():
+        try:
+            return _translator(chunk, source, target)
+        finally:
+            _release_from_thread(loop, slots)
+
+    call = _io_pool.submit(run)
+    try:
+        return await asyncio.wait_for(asyncio.wrap_future(call), max(0.0, deadline - loop.time()))
+    finally:
+        if call.cancelled():        # never started, so run() cannot release it
+            slots.release()
+
+
+async def translate_batch_async(texts, source: str, target: str, timeout: float = TRANSLATE_TIMEOUT,
+                                on_result=None):
+    """
+    Async translate_batch: cached segments are served from the cache, the
+    rest are sent in chunks of TRANSLATE_CHUNK_SEGMENTS that run
+    concurrently. Segments whose call fails or times out come back
+    untranslated.
+
+    `on_result(i, translated)` is called for every input position as soon
+    as its text is known (cache hits first, then in completion order).
+    """
+    texts = list(texts)
+    report = on_result or (lambda i, t: None)
+    if source == target:
+        for i, t in enumerate(texts):
+            report(i, t)
+        return texts
+
+    norm = [normalize_segment(t) for t in texts]
+    positions = {}
+    for i, n in enumerate(norm):
+        if n:
+            positions.setdefault(n, []).append(i)
+        else:
+            report(i, texts[i])
+    unique = list(positions)
+    if not unique:
+        return texts
+
+    loop = asyncio.get_running_loop()
+    found = await loop.run_in_executor(_local_pool, _cache_get, unique, source, target)
+    missing = [n for n in unique if n not in found]
+    chunks = [missing[i:i + TRANSLATE_CHUNK_SEGMENTS] for i in range(0, len(missing), TRANSLATE_CHUNK_SEGMENTS)]
+    direction = "to_en" if target == "en" else "from_en"
+    metrics.TRANSLATION_CACHED.inc(len(found), direction=direction)
+    metrics.TRANSLATION_CALLS.inc(len(chunks), direction=direction)
+    metrics.count("translation_calls", len(chunks))
+    for n, t in found.items():
+        for i in positions.get(n, ()):
+            report(i, t)
+
+    async def one(chunk):
+        try:
+            out = list(await _call_translator(chunk, source, target, timeout))
+        except Exception as e:
+            print(f"[translate] {source}->{target} call of {len(chunk)} failed ({type(e).__name__}): {chunk[0][:60]}")
+            out = []
+        results = [out[j] if j < len(out) else None for j in range(len(chunk))]
+        for seg, result in zip(chunk, results):
+            for i in positions[seg]:
+                report(i, result or texts[i])
+        return [(seg, t) for seg, t in zip(chunk, results) if t]
+
+    if chunks:
+        new = [pair for pairs in await asyncio.gather(*(one(c) for c in chunks)) for pair in pairs]
+        if new:
+            await loop.run_in_executor(_local_pool, _cache_put, new, source, target)
+        found.update(new)
+
+    return [found.get(n, t) if n else t for n, t in zip(norm, texts)]
+
+
+async def translate_to_english_async(text: str, source: str = None, timeout: float = TRANSLATE_TIMEOUT) -> str:
+    if source is None:
+        source = await asyncio.get_running_loop().run_in_executor(_local_pool, detect_lang, text)
+    src = safe_lang(source)
+    if src == "en":
+        return text
+    return (await translate_batch_async([text], src, "en", timeout))[0]
+
+
+async def translate_many_from_english_async(texts, target_lang: str = "en", timeout: float = TRANSLATE_TIMEOUT,
+                                            on_result=None):
+    """`on_result(i, translated)`: see translate_batch_async."""
+    return await translate_batch_async(texts, "en", safe_lang(target_lang), timeout, on_result)
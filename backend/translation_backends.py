@@ -0,0 +1,172 @@
+# backend/translation_backends.py
+"""
+Translation backends. A backend is any callable
+
+    fn(texts, source, target) -> list of translations (same order)
+
+that takes Google language codes. backend/translate.py picks one with
+TRANSLATE_BACKEND:
+
+google   Google Translate through deep_translator (network; optional)
+local    seq2seq model on this machine (NLLB-200 or Marian), batched
+none     returns the texts unchanged (offline box without a model)
+
+Config of the local backend:
+LOCAL_TRANSLATE_MODEL        one multilingual NLLB model, or a Marian
+                             per-pair template such as
+                             "Helsinki-NLP/opus-mt-{src}-{tgt}"
+LOCAL_TRANSLATE_BATCH_SIZE   segments per generate() call
+LOCAL_TRANSLATE_MAX_TOKENS   max input / output tokens per segment
+LOCAL_TRANSLATE_BEAMS        beam width (1 = greedy, fastest)
+"""
+import os
+from backend.batching import MicroBatcher
+from backend.languages import NLLB_CODES
+from backend.models import registry
+
+LOCAL_TRANSLATE_MODEL = os.getenv("LOCAL_TRANSLATE_MODEL", "facebook/nllb-200-distilled-600M")
+LOCAL_TRANSLATE_BATCH_SIZE = int(os.getenv("LOCAL_TRANSLATE_BATCH_SIZE", "16"))
+LOCAL_TRANSLATE_MAX_TOKENS = int(os.getenv("LOCAL_TRANSLATE_MAX_TOKENS", "256"))
+LOCAL_TRANSLATE_BEAMS = int(os.getenv("LOCAL_TRANSLATE_BEAMS", "1"))
+
+GOOGLE_MAX_CHARS = 4500     # Google rejects requests above 5000 chars
+
+# Google code → OPUS-MT code where they differ
+MARIAN_CODES = {"zh-CN": "zh", "zh-TW": "zh", "iw": "he", "jw": "jv"}
+
+
+# ----------------------------
+# Google
+# ----------------------------
+def google_translate_batch(texts, source, target):
+    """
+    Translate many segments with as few Google calls as possible:
+    segments are joined with newlines into requests of <= GOOGLE_MAX_CHARS
+    and split back afterwards. If a reply does not split into the same
+    number of lines, that chunk is translated segment by segment.
+    """
+    from deep_translator import GoogleTranslator
+    translator = GoogleTranslator(source=source, target=target)
+
+    chunks, cur, cur_len = [], [], 0
+    for t in texts:
+        if cur and cur_len + len(t) + 1 > GOOGLE_MAX_CHARS:
+            chunks.append(cur)
+            cur, cur_len = [], 0
+        cur.append(t)
+        cur_len += len(t) + 1
+    if cur:
+        chunks.append(cur)
+
+    out = []
+    for chunk in chunks:
+        joined = translator.translate("\n".join(chunk)) or ""
+        lines = joined.split("\n")
+        if len(lines) != len(chunk):
+            lines = [translator.translate(t) for t in chunk]
+        out.extend(lines)
+    return out
+
+
+def identity_translate_batch(texts, source, target):
+    return list(texts)
+
+
+# ----------------------------
+# Local seq2seq
+# ----------------------------
+class LocalTranslator:
+    """
+    Batched offline translation with a Hugging Face seq2seq model.
+
+    Calls from concurrent requests are merged by a MicroBatcher. The
+    worker groups the merged segments by language pair. Each group is
+    sorted by length and run as padded batches of `batch_size`, so
+    short segments are not padded up to long ones.
+
+    The model is one of:
+    - a Marian per-pair template ("{src}" / "{tgt}" in the name): one
+      model per language pair, loaded on first use
+    - a multilingual NLLB model: language chosen with src_lang and the
+      forced BOS token
+    - any other seq2seq model (e.g. a tiny stand-in for smoke tests),
+      used as is for every pair
+    """
+
+    def __init__(self, model_name: str = LOCAL_TRANSLATE_MODEL, batch_size: int = LOCAL_TRANSLATE_BATCH_SIZE,
+                 max_tokens: int = LOCAL_TRANSLATE_MAX_TOKENS, num_beams: int = LOCAL_TRANSLATE_BEAMS):
+        self.model_name = model_name
+        self.per_pair = "{src}" in model_name
+        self.batch_size = max(1, batch_size)
+        self.max_tokens = max_tokens
+        self.num_beams = num_beams
+        if not self.per_pair:
+            registry.register(model_name, "seq2seq")
+        self._batcher = MicroBatcher(self._translate_items, name="translate")
+
+    def __call__(self, texts, source, target):
+        return self._batcher.submit([(t, source, target) for t in texts])
+
+    def model_id(self, source: str, target: str) -> str:
+        if not self.per_pair:
+            return self.model_name
+        return self.model_name.format(src=MARIAN_CODES.get(source, source), tgt=MARIAN_CODES.get(target, target))
+
+    def _translate_items(self, items):
+        """Batcher fn: [(text, source, target)] → translations (None on failure)."""
+        out = [None] * len(items)
+        groups = {}
+        for i, (_, source, target) in enumerate(items):
+            groups.setdefault((source, target), []).append(i)
+
+        for (source, target), ids in groups.items():
+            try:
+                translated = self._translate_pair([items[i][0] for i in ids], source, target)
+            except Exception as e:
+                # only this pair falls back to the originals
+                print(f"[translate] local {source}->{target} failed: {e}")
+                continue
+            for i, t in zip(ids, translated):
+                out[i] = t
+        return out
+
+    def _translate_pair(self, texts, source, target):
+        import torch
+
+        model_id = self.model_id(source, target)
+        registry.register(model_id, "seq2seq")
+        tok, model = registry.get(model_id)
+
+        gen = {"num_beams": self.num_beams, "max_new_tokens": self.max_tokens}
+        tgt_code = NLLB_CODES.get(target)
+        if not self.per_pair and tgt_code in tok.get_vocab():
+            if source not in NLLB_CODES:
+                raise ValueError(f"no NLLB code for {source!r}")
+            tok.src_lang = NLLB_CODES[source]       # only the batcher thread gets here
+            gen["forced_bos_token_id"] = tok.convert_tokens_to_ids(tgt_code)
+
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        out = [None] * len(texts)
+        for start in range(0, len(order), self.batch_size):
+            ids = order[start:start + self.batch_size]
+            enc = tok([texts[i] for i in ids], return_tensors="pt", padding=True,
+                      truncation=True, max_length=self.max_tokens)
+            with torch.inference_mode():
+                generated = model.generate(**enc, **gen)
+            for i, t in zip(ids, tok.batch_decode(generated, skip_special_tokens=True)):
+                out[i] = t
+        return out
+
+
+# ----------------------------
+# Selection
+# ----------------------------
+def get_backend(name: str):
+    """Translator callable for a TRANSLATE_BACKEND value."""
+    if name == "google":
+        return google_translate_batch
+    if name == "local":
+        return LocalTranslator()
+    if name == "none":
+        return identity_translate_batch
+    raise ValueError(f"unknown translation backend {name!r}, expected 'google', 'local' or 'none'")
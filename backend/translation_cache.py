@@ -0,0 +1,205 @@
+# backend/translation_cache.py
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from backend.paths import DATA_DIR
+
+# =========================
+# DEFAULTS (env overridable)
+# =========================
+TRANSLATION_CACHE_PATH = os.getenv("TRANSLATION_CACHE_PATH", os.path.join(DATA_DIR, "translation_cache.sqlite"))
+TRANSLATION_CACHE_MAX_MB = float(os.getenv("TRANSLATION_CACHE_MAX_MB", "256"))
+TRANSLATION_CACHE_MEMORY_ITEMS = int(os.getenv("TRANSLATION_CACHE_MEMORY_ITEMS", "10000"))
+
+# other worker processes write to the same file: re-read its size this often
+SIZE_REFRESH_SECONDS = 30
+
+
+def normalize_segment(text: str) -> str:
+    """Cache key form of a segment: stripped, whitespace collapsed."""
+    return " ".join((text or "").split())
+
+
+class TranslationCache:
+    """
+    Two-tier translation cache keyed by (normalized text, source, target).
+
+    Tier 1: in-memory LRU of `memory_items` entries.
+    Tier 2: SQLite file at `path` (None or "" disables it), opened on
+            first use. Once the stored text exceeds `max_mb`, least
+            recently used rows are deleted until the store is back under
+            90% of the cap. SQLite errors (e.g. "database is locked" with
+            several workers on one file) are logged and the lookup or
+            store goes on with the memory tier only.
+    """
+
+    def __init__(self, path=TRANSLATION_CACHE_PATH, max_mb: float = TRANSLATION_CACHE_MAX_MB,
+                 memory_items: int = TRANSLATION_CACHE_MEMORY_ITEMS):
+        self.memory_items = memory_items
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self._mem = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits_memory = 0
+        self.hits_disk = 0
+        self.misses = 0
+
+        self.path = path
+        self._db = None
+        self._disk_bytes = 0
+        self._size_read_at = 0.0
+
+    def _disk(self):
+        """The SQLite connection, opened on first use; None if disabled or unavailable."""
+        if self._db is None and self.path:
+            path = self.path
+            try:
+                if path != ":memory:" and os.path.dirname(path):
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                db = sqlite3.connect(path, check_same_thread=False)
+                db.execute("PRAGMA journal_mode=WAL")
+                db.execute(
+                    """CREATE TABLE IF NOT EXISTS translations (
+                           source TEXT NOT NULL,
+                           target TEXT NOT NULL,
+                           text TEXT NOT NULL,
+                           translated TEXT NOT NULL,
+                           nbytes INTEGER NOT NULL,
+                           last_used REAL NOT NULL,
+                           PRIMARY KEY (source, target, text)
+                       )"""
+                )
+                db.execute("CREATE INDEX IF NOT EXISTS idx_last_used ON translations(last_used)")
+                db.commit()
+                self._db = db
+                self._read_size()
+            except sqlite3.Error as e:           # e.g. locked while another worker sets it up: retry next call
+                print(f"[translation_cache] disk cache at {path} unavailable: {e}")
+            except OSError as e:
+                print(f"[translation_cache] no disk cache at {path}: {e}")
+                self.path = None
+        return self._db
+
+    def _read_size(self):
+        row = self._db.execute("SELECT COALESCE(SUM(nbytes), 0) FROM translations").fetchone()
+        self._disk_bytes = int(row[0])
+        self._size_read_at = time.time()
+
+    # ----------------------------
+    # Lookup
+    # ----------------------------
+    def get_many(self, texts, source: str, target: str) -> dict:
+        """Return {normalized text: translation} for every cached segment."""
+        found = {}
+        missing = []
+        with self._lock:
+            for t in texts:
+                key = (t, source, target)
+                if key in self._mem:
+                    self._mem.move_to_end(key)
+                    found[t] = self._mem[key]
+                    self.hits_memory += 1
+                else:
+                    missing.append(t)
+
+            db = self._disk() if missing else None
+            if db is not None:
+                try:
+                    now = time.time()
+                    for t in missing:
+                        row = db.execute(
+                            "SELECT translated FROM translations WHERE source=? AND target=? AND text=?",
+                            (source, target, t),
+                        ).fetchone()
+                        if row is None:
+                            continue
+                        found[t] = row[0]
+                        self.hits_disk += 1
+                        db.execute(
+                            "UPDATE translations SET last_used=? WHERE source=? AND target=? AND text=?",
+                            (now, source, target, t),
+                        )
+                        self._remember((t, source, target), row[0])
+                    db.commit()
+                except sqlite3.Error as e:
+                    print(f"[translation_cache] disk lookup failed, continuing without it: {e}")
+                    db.rollback()
+
+            self.misses += len(texts) - len(found)
+        return found
+
+    def get(self, text: str, source: str, target: str):
+        return self.get_many([text], source, target).get(text)
+
+    # ----------------------------
+    # Store
+    # ----------------------------
+    def put_many(self, pairs, source: str, target: str):
+        """Store (normalized text, translation) pairs."""
+        with self._lock:
+            now = time.time()
+            for text, translated in pairs:
+                self._remember((text, source, target), translated)
+            db = self._disk()
+            if db is None:
+                return
+            try:
+                for text, translated in pairs:
+                    nbytes = len(text.encode("utf-8")) + len(translated.encode("utf-8"))
+                    old = db.execute(
+                        "SELECT nbytes FROM translations WHERE source=? AND target=? AND text=?",
+                        (source, target, text),
+                    ).fetchone()
+                    db.execute(
+                        "INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?, ?, ?)",
+                        (source, target, text, translated, nbytes, now),
+                    )
+                    self._disk_bytes += nbytes - (old[0] if old else 0)
+                self._evict_disk()
+                db.commit()
+            except sqlite3.Error as e:
+                print(f"[translation_cache] disk store failed, kept in memory only: {e}")
+                db.rollback()
+
+    def put(self, text: str, source: str, target: str, translated: str):
+        self.put_many([(text, translated)], source, target)
+
+    def _remember(self, key, value):
+        self._mem[key] = value
+        self._mem.move_to_end(key)
+        while len(self._mem) > self.memory_items:
+            self._mem.popitem(last=False)
+
+    def _evict_disk(self):
+        if self.max_bytes <= 0:
+            return
+        # _disk_bytes only counts this process's writes since the last read
+        if self._disk_bytes > self.max_bytes or time.time() - self._size_read_at > SIZE_REFRESH_SECONDS:
+            self._read_size()
+        if self._disk_bytes <= self.max_bytes:
+            return
+        target_bytes = int(self.max_bytes * 0.9)
+        rows = self._db.execute(
+            "SELECT rowid, nbytes FROM translations ORDER BY last_used ASC"
+        )
+        doomed = []
+        for rowid, nbytes in rows:
+            if self._disk_bytes <= target_bytes:
+                break
+            doomed.append((rowid,))
+            self._disk_bytes -= nbytes
+        self._db.executemany("DELETE FROM translations WHERE rowid=?", doomed)
+
+    # ----------------------------
+    # Reporting
+    # ----------------------------
+    def stats(self):
+        with self._lock:
+            return {
+                "memory_items": len(self._mem),
+                "disk_bytes": self._disk_bytes if self._db is not None else None,     # as of the last write
+                "hits_memory": self.hits_memory,
+                "hits_disk": self.hits_disk,
+                "misses": self.misses,
+            }
@@ -1,9 +1,7 @@
 # backend/utils.py
 import re
-from langdetect import detect, DetectorFactory
 import pdfplumber
-
-DetectorFactory.seed = 0
+from backend import langid
 
 def normalize_text(text: str) -> str:
     if not text:
@@ -30,8 +28,4 @@ def extract_text_from_pdf(path: str) -> str:
     return "\n".join(text)
 
 def detect_language(text: str) -> str:
-    try:
-        lang = detect(text)
-        return lang
-    except Exception:
-        return "unknown"
+    return langid.detect(text, default="unknown")
@@ -0,0 +1,228 @@
+# backend/verdict_cache.py
+"""
+Cache of finished /verify results.
+
+exact      (normalized claim, user language) → result
+semantic   a previously verified claim in the same user language whose
+           English embedding is within VERDICT_CACHE_SIM cosine of this one
+           (small flat inner-product FAISS index over recent claims)
+in-flight  identical concurrent claims share one computation
+
+Entries expire after VERDICT_CACHE_TTL seconds. Past VERDICT_CACHE_ITEMS
+entries the oldest are evicted. Everything is dropped when the fact-base
+snapshot changes, because a new snapshot can change a verdict.
+
+VERDICT_CACHE_ITEMS=0 disables the cache; VERDICT_CACHE_SIM>=1 disables
+only the semantic tier.
+"""
+import asyncio
+import os
+import threading
+import time
+from collections import OrderedDict
+import faiss
+import numpy as np
+from backend.translation_cache import normalize_segment
+
+VERDICT_CACHE_TTL = float(os.getenv("VERDICT_CACHE_TTL", "3600"))
+VERDICT_CACHE_ITEMS = int(os.getenv("VERDICT_CACHE_ITEMS", "10000"))
+# high on purpose: "X is true" / "X is not true" can be close in embedding space
+VERDICT_CACHE_SIM = float(os.getenv("VERDICT_CACHE_SIM", "0.97"))
+
+SEMANTIC_CANDIDATES = 8
+
+
+def claim_key(claim: str, user_lang: str):
+    return normalize_segment(claim).casefold(), user_lang
+
+
+def _unit(vec):
+    v = np.ascontiguousarray(np.asarray(vec, dtype="float32").reshape(1, -1)).copy()
+    faiss.normalize_L2(v)
+    return v
+
+
+class _InFlight:
+    """One coalesced computation: its task, the callers waiting and their emits."""
+
+    def __init__(self):
+        self.task = None
+        self.waiting = 0
+        self.events = []                # (event, data) sent so far, for late joiners
+        self.subscribers = []
+
+    def broadcast(self, event, **data):
+        self.events.append((event, data))
+        for emit in list(self.subscribers):
+            emit(event, **data)
+
+    def join(self, emit):
+        self.waiting += 1
+        if emit is not None:
+            for event, data in self.events:
+                emit(event, **data)
+            self.subscribers.append(emit)
+
+    def leave(self, emit):
+        self.waiting -= 1
+        if emit is not None:
+            self.subscribers.remove(emit)
+
+
+class VerdictCache:
+    def __init__(self, ttl: float = VERDICT_CACHE_TTL, max_items: int = VERDICT_CACHE_ITEMS,
+                 sim_threshold: float = VERDICT_CACHE_SIM):
+        self.ttl = ttl
+        self.max_items = max_items
+        self.sim_threshold = sim_threshold
+        self.version = None             # snapshot version the entries belong to
+
+        # key -> (result, expires_at, vector id or None); insertion order is
+        # expiry order because the TTL is fixed
+        self._entries = OrderedDict()
+        self._key_of = {}               # vector id -> key
+        self._index = None              # IDMap2(FlatIP), created on first vector
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self._inflight = {}             # key -> _InFlight (event loop only)
+        self._stats = {"exact_hits": 0, "semantic_hits": 0, "misses": 0, "coalesced": 0, "invalidations": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_items > 0
+
+    # ----------------------------
+    # Lookup
+    # ----------------------------
+    def get(self, key):
+        """Exact-tier lookup."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] < time.time():
+                self._stats["misses"] += 1
+                return None
+            self._stats["exact_hits"] += 1
+            return {**entry[0], "cache": "exact"}
+
+    def get_similar(self, vec, user_lang: str):
+        """Semantic-tier lookup by English claim embedding."""
+        if self.sim_threshold >= 1:
+            return None
+        with self._lock:
+            if self._index is None or self._index.ntotal == 0:
+                return None
+            k = min(SEMANTIC_CANDIDATES, self._index.ntotal)
+            sims, ids = self._index.search(_unit(vec), k)
+            now = time.time()
+            for sim, vid in zip(sims[0], ids[0]):
+                if vid < 0 or sim < self.sim_threshold:
+                    break
+                key = self._key_of.get(int(vid))
+                entry = self._entries.get(key)
+                # results are in the user's language, so the language must match
+                if entry is not None and key[1] == user_lang and entry[1] >= now:
+                    self._stats["semantic_hits"] += 1
+                    return {**entry[0], "cache": "semantic", "cache_similarity": round(float(sim), 4)}
+            return None
+
+    # ----------------------------
+    # Store + evict
+    # ----------------------------
+    def put(self, key, result, vec=None, version=None):
+        """Remember `result`; ignored if computed on an older snapshot."""
+        if not self.enabled:
+            return
+        with self._lock:
+            if version is not None and self.version is not None and version != self.version:
+                return
+            old = self._entries.pop(key, None)
+            stale = [old[2]] if old is not None and old[2] is not None else []
+
+            vid = None
+            if vec is not None and self.sim_threshold < 1:
+                v = _unit(vec)
+                if self._index is None:
+                    self._index = faiss.IndexIDMap2(faiss.IndexFlatIP(v.shape[1]))
+                vid = self._next_id
+                self._next_id += 1
+                self._index.add_with_ids(v, np.array([vid], dtype="int64"))
+                self._key_of[vid] = key
+            self._entries[key] = (result, time.time() + self.ttl, vid)
+
+            now = time.time()
+            while self._entries:
+                first_key, (_, expires, first_vid) = next(iter(self._entries.items()))
+                if expires >= now and len(self._entries) <= self.max_items:
+                    break
+                del self._entries[first_key]
+                if first_vid is not None:
+                    stale.append(first_vid)
+            self._drop_vectors(stale)
+
+    def _drop_vectors(self, vids):
+        if not vids:
+            return
+        for vid in vids:
+            self._key_of.pop(vid, None)
+        self._index.remove_ids(np.array(vids, dtype="int64"))
+
+    def invalidate(self, version=None):
+        """Drop everything (e.g. on snapshot swap) and pin the new version."""
+        with self._lock:
+            self._entries.clear()
+            self._key_of.clear()
+            if self._index is not None:
+                self._index.reset()
+            self.version = version
+            self._stats["invalidations"] += 1
+
+    # ----------------------------
+    # In-flight coalescing
+    # ----------------------------
+    async def single_flight(self, key, compute, emit=None):
+        """
+        Await `compute(emit)` once per key; concurrent callers with the same
+        key get the same result (or exception). Must run on the event loop.
+
+        Every caller's `emit(event, **data)` receives the computation's
+        events: a caller that joins late first gets the ones already sent.
+
+        The computation runs as its own task: a caller that is cancelled
+        (e.g. a /verify/stream client that went away) leaves it running for
+        the others, and it is only cancelled once nobody waits for it.
+        """
+        entry = self._inflight.get(key)
+        if entry is None:
+            entry = self._inflight[key] = _InFlight()
+            entry.task = asyncio.ensure_future(compute(entry.broadcast))
+
+            def done(t, entry=entry):
+                if self._inflight.get(key) is entry:
+                    self._inflight.pop(key)
+                # nobody may be waiting: keep asyncio from warning about the exception
+                t.cancelled() or t.exception()
+            entry.task.add_done_callback(done)
+        else:
+            self._stats["coalesced"] += 1
+
+        task = entry.task
+        entry.join(emit)
+        try:
+            return await asyncio.shield(task)
+        finally:
+            entry.leave(emit)
+            if entry.waiting == 0 and not task.done():
+                task.cancel()
+
+    def stats(self):
+        with self._lock:
+            return {
+                **self._stats,
+                "items": len(self._entries),
+                "vectors": self._index.ntotal if self._index is not None else 0,
+                "in_flight": len(self._inflight),
+                "version": self.version,
+                "ttl_seconds": self.ttl,
+                "max_items": self.max_items,
+                "sim_threshold": self.sim_threshold,
+            }
@@ -0,0 +1,127 @@
+# benchmarks/ann_bench.py
+"""
+Recall / latency / memory of the FAISS index types in backend/index_factory.py
+on synthetic clustered corpora.
+
+    python -m benchmarks.ann_bench                          # 20k, 1M, 10M vectors
+    python -m benchmarks.ann_bench --sizes 20000 --dim 768
+    python -m benchmarks.ann_bench --variants flat ivf_flat:nprobe=32 hnsw:ef_search=128
+
+Reported per variant: recall@k against the exact flat L2 index, p50/p99
+single-query latency, build time and serialized index size. Note that the
+10M x 768 corpus alone needs ~30 GB of RAM; use a smaller --dim there.
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+import faiss
+import numpy as np
+from backend import index_factory
+
+DEFAULT_VARIANTS = [
+    "flat",
+    "flat:metric=ip",
+    "ivf_flat:nprobe=8",
+    "ivf_flat:nprobe=32",
+    "ivf_pq:nprobe=32,pq_m=32",
+    "ivf_pq:nprobe=32,pq_m=64",
+    "hnsw:ef_search=32",
+    "hnsw:ef_search=128",
+    "hnsw:metric=ip,ef_search=64",
+]
+
+
+def parse_variant(spec):
+    kind, _, rest = spec.partition(":")
+    params = {"kind": kind}
+    for kv in filter(None, rest.split(",")):
+        k, v = kv.split("=")
+        params[k] = v if k == "metric" else int(v)
+    return params
+
+
+def synthetic_corpus(n, dim, n_clusters=256, chunk=200_000, seed=0):
+    """Gaussian clusters, generated chunk by chunk into one float32 array."""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((n_clusters, dim), dtype=np.float32)
+    out = np.empty((n, dim), dtype=np.float32)
+    for start in range(0, n, chunk):
+        m = min(chunk, n - start)
+        labels = rng.integers(0, n_clusters, m)
+        out[start:start + m] = centers[labels] + 0.6 * rng.standard_normal((m, dim), dtype=np.float32)
+    return out
+
+
+def make_queries(corpus, n_queries, seed=1):
+    rng = np.random.default_rng(seed)
+    picks = corpus[rng.integers(0, len(corpus), n_queries)]
+    return picks + 0.3 * rng.standard_normal(picks.shape, dtype=np.float32)
+
+
+def index_file_bytes(index):
+    with tempfile.NamedTemporaryFile(suffix=".faiss") as f:
+        faiss.write_index(index, f.name)
+        return os.path.getsize(f.name)
+
+
+def run_variant(params, corpus, queries, truth, k):
+    t0 = time.perf_counter()
+    index = index_factory.build_index(corpus, **params)
+    build_s = time.perf_counter() - t0
+
+    lat = []
+    found = []
+    for q in queries:
+        t = time.perf_counter()
+        _, I = index_factory.search(index, q[None, :], k)
+        lat.append((time.perf_counter() - t) * 1000)
+        found.append(I[0])
+
+    found = np.array(found)
+    recall = float(np.mean([len(set(f) & set(t)) / k for f, t in zip(found, truth)]))
+    return {
+        **{k_: v for k_, v in params.items()},
+        "recall_at_k": round(recall, 4),
+        "p50_ms": round(float(np.percentile(lat, 50)), 3),
+        "p99_ms": round(float(np.percentile(lat, 99)), 3),
+        "build_seconds": round(build_s, 2),
+        "index_mb": round(index_file_bytes(index) / 2**20, 1),
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", type=int, nargs="+", default=[20_000, 1_000_000, 10_000_000])
+    ap.add_argument("--dim", type=int, default=768)
+    ap.add_argument("--queries", type=int, default=500)
+    ap.add_argument("--k", type=int, default=5)
+    ap.add_argument("--threads", type=int, default=0, help="faiss OpenMP threads (0 = default)")
+    ap.add_argument("--variants", nargs="+", default=DEFAULT_VARIANTS)
+    args = ap.parse_args()
+
+    if args.threads:
+        faiss.omp_set_num_threads(args.threads)
+
+    report = []
+    for n in args.sizes:
+        corpus = synthetic_corpus(n, args.dim)
+        queries = make_queries(corpus, args.queries)
+
+        exact = faiss.IndexFlatL2(args.dim)
+        exact.add(corpus)
+        _, truth = exact.search(queries, args.k)
+        del exact
+
+        for spec in args.variants:
+            res = {"n": n, "dim": args.dim, **run_variant(parse_variant(spec), corpus, queries, truth, args.k)}
+            print(json.dumps(res), flush=True)
+            report.append(res)
+        del corpus
+
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+# benchmarks/hybrid_bench.py
+"""
+Recall and latency of dense-only vs hybrid (dense + BM25, RRF) retrieval.
+
+    python -m benchmarks.hybrid_bench                       # the data folder (FACT_DATA_DIR)
+    python -m benchmarks.hybrid_bench --queries 2000 --k 1 5 10
+    python -m benchmarks.hybrid_bench --synthetic 200000    # no data, models or network
+
+Known-item queries: each query is one fact row's claim (English rows;
+--synthetic: one sentence of the row's summary), and the row itself is
+the relevant result. Reported per mode (dense, keyword, hybrid): recall@k,
+MRR and p50/p99 latency of retrieve_top_facts with the query embedding
+precomputed, so embedding time is left out. Queries with a number or a
+capitalised name after the first word are also reported on their own:
+they are the ones keyword matching is for. The keyword index is timed
+with and without MaxScore pruning as well.
+
+The synthetic summaries repeat a handful of templates, so many rows tie
+for a query; there the recall numbers only show that everything runs.
+"""
+import argparse
+import json
+import os
+import re
+import time
+import numpy as np
+
+_exact_re = re.compile(r"\d|\s[A-Z]")
+
+
+def _latency(ms):
+    a = np.asarray(ms)
+    return {"p50_ms": round(float(np.percentile(a, 50)), 3), "p99_ms": round(float(np.percentile(a, 99)), 3)}
+
+
+def _quality(ranks, ks):
+    r = np.asarray(ranks, dtype=float)      # 1-based rank of the relevant row, inf if missed
+    out = {f"recall@{k}": round(float((r <= k).mean()), 4) for k in ks}
+    out["mrr"] = round(float(np.where(np.isfinite(r), 1 / r, 0).mean()), 4)
+    return out
+
+
+def load_queries(n, seed, synthetic):
+    """[(query, relevant row)] from the fact base parquet."""
+    import pandas as pd
+    from backend.paths import PARQUET_PATH
+
+    rng = np.random.default_rng(seed)
+    columns = ["summary_en"] if synthetic else ["claim", "lang"]
+    df = pd.read_parquet(PARQUET_PATH, columns=columns)
+    if synthetic:
+        rows = rng.choice(len(df), size=min(n, len(df)), replace=False)
+        queries = []
+        for i in rows:
+            sentences = [s for s in re.split(r"(?<=\.)\s+", df["summary_en"].iat[i]) if s]
+            queries.append((sentences[rng.integers(len(sentences))], int(i)))
+        return queries
+    english = np.flatnonzero((df["lang"].fillna("en") == "en").to_numpy() & df["claim"].notna().to_numpy())
+    rows = rng.choice(english, size=min(n, len(english)), replace=False)
+    return [(str(df["claim"].iat[i]), int(i)) for i in rows]
+
+
+def run(queries, ks, warmup=20):
+    from backend.retrieval import HYBRID_DEPTH, embed_queries, retrieve_top_facts, snapshots
+
+    snap = snapshots.current()
+    if snap.keywords is None:
+        raise SystemExit("the snapshot has no BM25 index (HYBRID_RETRIEVAL=0 or segments without one)")
+    top_k = max(ks)
+    vecs = embed_queries([q for q, _ in queries])
+
+    modes = {
+        "dense": lambda q, v: [r["idx"] for r in retrieve_top_facts(q, top_k, q_vec=v, hybrid=False)],
+        "keyword": lambda q, v: snap.keywords.search(q, top_k)[1].tolist(),
+        "keyword_exhaustive": lambda q, v: snap.keywords.search(q, top_k, prune=False)[1].tolist(),
+        "hybrid": lambda q, v: [r["idx"] for r in retrieve_top_facts(q, top_k, q_vec=v, hybrid=True)],
+    }
+    exact = np.array([bool(_exact_re.search(q)) for q, _ in queries])
+    report = {}
+    for name, fn in modes.items():
+        for (q, _), v in zip(queries[:warmup], vecs[:warmup]):
+            fn(q, v)
+        ranks, ms = [], []
+        for (q, relevant), v in zip(queries, vecs):
+            t = time.perf_counter()
+            ids = fn(q, v)
+            ms.append((time.perf_counter() - t) * 1000)
+            ranks.append(ids.index(relevant) + 1 if relevant in ids else np.inf)
+        ranks = np.asarray(ranks)
+        report[name] = {
+            **_quality(ranks, ks),
+            **_latency(ms),
+            "names_numbers": _quality(ranks[exact], ks) if exact.any() else None,
+            "other": _quality(ranks[~exact], ks) if (~exact).any() else None,
+        }
+    return {"rows": snap.ntotal, "queries": len(queries), "names_numbers_queries": int(exact.sum()),
+            "depth": HYBRID_DEPTH, "modes": report}
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--queries", type=int, default=1000)
+    ap.add_argument("--k", type=int, nargs="+", default=[1, 5, 10])
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--synthetic", type=int, metavar="ROWS",
+                    help="use the offline benchmark's synthetic fact base and stub models")
+    ap.add_argument("--out", help="write the JSON report here too")
+    args = ap.parse_args()
+
+    if args.synthetic:
+        from benchmarks.offline.run import configure_env, default_data_dir
+        configure_env(default_data_dir(args.synthetic, 384, args.seed))
+        from benchmarks.offline import stubs, synthetic
+        stubs.install(384)
+        synthetic.build(os.environ["FACT_DATA_DIR"], args.synthetic, 384, args.seed)
+
+    report = run(load_queries(args.queries, args.seed, bool(args.synthetic)), args.k)
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text + "\n")
+    print(text)
+    return report
+
+
+if __name__ == "__main__":
+    main()
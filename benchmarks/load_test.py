@@ -0,0 +1,394 @@
+# benchmarks/load_test.py
+"""
+HTTP load generator for /verify and /upload-pdf.
+
+    python -m benchmarks.load_test                                 # in-process server, 10/50/200 clients
+    python -m benchmarks.load_test --rate 5 20 50 --duration 60    # open loop: arrivals per second
+    python -m benchmarks.load_test --url http://10.0.0.5:8000      # a running server
+    python -m benchmarks.load_test --serve --port 8000             # just the stub server, for --url runs
+
+Without --url the app runs in this process (uvicorn on a thread) with the
+stub models, fake translator and synthetic fact base of benchmarks/offline,
+so nothing external is needed. Client and server then share one GIL;
+for numbers that only reflect the server, start it with --serve (or for
+real) and point --url at it.
+
+Load:
+- --concurrency N: closed loop, N clients each send their next request as
+  soon as the last one returns
+- --rate R: open loop, R requests per second whatever the latency;
+  latency counts from the scheduled start, and arrivals are dropped
+  (counted) when --max-inflight requests are already open
+
+Requests follow --mix (kind=weight):
+    english       one-sentence claims
+    multilingual  claims in the fact base's pseudo-languages (translation paths)
+    short         short, vague claims (the ML fallback path)
+    long          a pasted article, a few thousand characters
+    pdf           POST /upload-pdf with a generated PDF, then /verify on its text (the UI's flow)
+
+Per level: latency percentiles, error rate and throughput overall, per
+kind and per endpoint, and a timeline per --interval seconds with the
+server's queues from /admin/load (claims in flight, busy threadpool
+threads, queued model work, model slot waits).
+"""
+import argparse
+import itertools
+import json
+import os
+import random
+import textwrap
+import threading
+import time
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+
+KINDS = ("english", "multilingual", "short", "long", "pdf")
+DEFAULT_MIX = "english=0.3,multilingual=0.3,short=0.2,long=0.1,pdf=0.1"
+SHORT_CLAIMS = [
+    "It is true.", "They lied again.", "This is fake news.", "Prices went up.", "Schools are closed.",
+    "He said it.", "Not true at all.", "Everyone knows this.", "The video is real.", "It happened yesterday.",
+]
+
+
+# ----------------------------
+# Request mix
+# ----------------------------
+def make_pdf(text: str, chars_per_line: int = 90, lines_per_page: int = 50) -> bytes:
+    """Minimal text-only PDF (Helvetica), so the tool needs no PDF library."""
+    lines = textwrap.wrap(text, chars_per_line)
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+    esc = lambda s: s.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+    objs = {1: "<< /Type /Catalog /Pages 2 0 R >>", 3: "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"}
+    kids, n = [], 4
+    for page in pages:
+        stream = "BT /F1 10 Tf 12 TL 50 800 Td " + " ".join(f"({esc(l)}) Tj T*" for l in page) + " ET"
+        objs[n] = (f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+                   f"/Resources << /Font << /F1 3 0 R >> >> /Contents {n + 1} 0 R >>")
+        objs[n + 1] = f"<< /Length {len(stream.encode('latin-1'))} >>\nstream\n{stream}\nendstream"
+        kids.append(f"{n} 0 R")
+        n += 2
+    objs[2] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+
+    out, offsets = bytearray(b"%PDF-1.4\n"), {}
+    for i in range(1, n):
+        offsets[i] = len(out)
+        out += f"{i} 0 obj\n{objs[i]}\nendobj\n".encode("latin-1")
+    xref = len(out)
+    out += f"xref\n0 {n}\n0000000000 65535 f \n".encode()
+    out += "".join(f"{offsets[i]:010d} 00000 n \n" for i in range(1, n)).encode()
+    out += f"trailer\n<< /Size {n} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return bytes(out)
+
+
+def parse_mix(spec: str):
+    mix = {}
+    for part in spec.split(","):
+        kind, _, weight = part.partition("=")
+        if kind.strip() not in KINDS:
+            raise ValueError(f"unknown request kind {kind!r}, expected one of {KINDS}")
+        mix[kind.strip()] = float(weight or 1)
+    return mix
+
+
+def build_requests(mix, n: int = 500, seed: int = 0):
+    """A fixed, shuffled list of requests in the --mix proportions."""
+    from benchmarks.offline.synthetic import make_claims, make_rows
+
+    rng = random.Random(seed)
+    total = sum(mix.values())
+    counts = {k: int(round(n * w / total)) for k, w in mix.items()}
+    articles = make_rows(max(8, counts.get("long", 0) + counts.get("pdf", 0)) * 4, seed=seed + 7)["summary_en"]
+
+    def article(i):
+        # a few summaries back to back: 2-4k characters
+        return "\n\n".join(articles[4 * i:4 * i + 4] * 2)
+
+    reqs = []
+    reqs += [{"kind": "english", "claim": c} for c in make_claims(counts.get("english", 0), seed + 1, foreign_share=0)]
+    reqs += [{"kind": "multilingual", "claim": c} for c in make_claims(counts.get("multilingual", 0), seed + 2,
+                                                                      foreign_share=1)]
+    reqs += [{"kind": "short", "claim": rng.choice(SHORT_CLAIMS)} for _ in range(counts.get("short", 0))]
+    reqs += [{"kind": "long", "claim": article(i)} for i in range(counts.get("long", 0))]
+    reqs += [{"kind": "pdf", "pdf": make_pdf(article(counts.get("long", 0) + i))} for i in range(counts.get("pdf", 0))]
+    rng.shuffle(reqs)
+    return reqs
+
+
+# ----------------------------
+# HTTP
+# ----------------------------
+def _get(url, timeout=5):
+    with urllib.request.urlopen(url, timeout=timeout) as r:
+        return json.loads(r.read())
+
+
+def _post_json(url, payload, timeout):
+    req = urllib.request.Request(url, json.dumps(payload).encode(), {"Content-Type": "application/json"})
+    with urllib.request.urlopen(req, timeout=timeout) as r:
+        return json.loads(r.read())
+
+
+def _post_file(url, filename, data, timeout):
+    boundary = uuid.uuid4().hex
+    body = (f"--{boundary}\r\nContent-Disposition: form-data; name=\"file\"; filename=\"{filename}\"\r\n"
+            f"Content-Type: application/pdf\r\n\r\n").encode() + data + f"\r\n--{boundary}--\r\n".encode()
+    req = urllib.request.Request(url, body, {"Content-Type": f"multipart/form-data; boundary={boundary}"})
+    with urllib.request.urlopen(req, timeout=timeout) as r:
+        return json.loads(r.read())
+
+
+def send(base, item, timeout):
+    """One logical request: (ok, {endpoint: ms})."""
+    calls = {}
+    try:
+        if item["kind"] == "pdf":
+            t = time.perf_counter()
+            out = _post_file(base + "/upload-pdf", "claim.pdf", item["pdf"], timeout)
+            calls["/upload-pdf"] = (time.perf_counter() - t) * 1000
+            if "text" not in out:
+                return False, calls
+            claim = out["text"]
+        else:
+            claim = item["claim"]
+        t = time.perf_counter()
+        out = _post_json(base + "/verify", {"claim": claim}, timeout)
+        calls["/verify"] = (time.perf_counter() - t) * 1000
+        return out.get("verdict") != "ERROR", calls
+    except (OSError, ValueError):
+        return False, calls
+
+
+# ----------------------------
+# Load
+# ----------------------------
+class Recorder:
+    def __init__(self):
+        self.t0 = time.perf_counter()
+        self.records = []       # (done at, kind, latency ms, ok, calls)
+        self.dropped = []       # open loop: arrival times that found --max-inflight open
+        self.server = []        # (at, /admin/load snapshot)
+        self._lock = threading.Lock()
+
+    def add(self, kind, latency_ms, ok, calls):
+        with self._lock:
+            self.records.append((time.perf_counter() - self.t0, kind, latency_ms, ok, calls))
+
+
+def closed_loop(base, requests, clients, duration, timeout, rec):
+    stop = time.perf_counter() + duration
+    order = itertools.cycle(requests)
+    lock = threading.Lock()
+
+    def client(_):
+        while time.perf_counter() < stop:
+            with lock:
+                item = next(order)
+            t = time.perf_counter()
+            ok, calls = send(base, item, timeout)
+            rec.add(item["kind"], (time.perf_counter() - t) * 1000, ok, calls)
+
+    with ThreadPoolExecutor(clients) as pool:
+        list(pool.map(client, range(clients)))
+
+
+def open_loop(base, requests, rate, duration, timeout, max_inflight, rec):
+    inflight = [0]
+    lock = threading.Lock()
+
+    def fire(item, scheduled):
+        ok, calls = send(base, item, timeout)
+        # from the scheduled arrival: a late start is latency too
+        rec.add(item["kind"], (time.perf_counter() - scheduled) * 1000, ok, calls)
+        with lock:
+            inflight[0] -= 1
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_inflight) as pool:
+        for k, item in enumerate(itertools.cycle(requests)):
+            scheduled = start + k / rate
+            if scheduled - start >= duration:
+                break
+            time.sleep(max(0.0, scheduled - time.perf_counter()))
+            with lock:
+                full = inflight[0] >= max_inflight
+                if not full:
+                    inflight[0] += 1
+            if full:
+                rec.dropped.append(scheduled - rec.t0)
+                continue
+            pool.submit(fire, item, scheduled)
+
+
+def poll_server(base, interval, rec, stop):
+    while not stop.wait(interval):
+        try:
+            rec.server.append((time.perf_counter() - rec.t0, _get(base + "/admin/load", timeout=interval)))
+        except OSError:
+            pass
+
+
+# ----------------------------
+# Report
+# ----------------------------
+def _latency(ms):
+    if not ms:
+        return None
+    a = np.asarray(ms)
+    return {q: round(float(np.percentile(a, p)), 1)
+            for q, p in (("p50_ms", 50), ("p90_ms", 90), ("p99_ms", 99), ("max_ms", 100))}
+
+
+def _stats(records, seconds):
+    n = len(records)
+    errors = sum(1 for r in records if not r[3])
+    return {
+        "requests": n,
+        "errors": errors,
+        "error_rate": round(errors / n, 4) if n else None,
+        "throughput_rps": round((n - errors) / seconds, 2) if seconds else None,
+        "latency": _latency([r[2] for r in records if r[3]]),
+    }
+
+
+def summarize(rec, duration, interval):
+    records = rec.records
+    report = _stats(records, duration)
+    if rec.dropped:
+        report["dropped"] = len(rec.dropped)
+    report["by_kind"] = {k: _stats([r for r in records if r[1] == k], duration)
+                         for k in KINDS if any(r[1] == k for r in records)}
+    endpoints = sorted({e for r in records for e in r[4]})
+    report["by_endpoint"] = {e: _latency([r[4][e] for r in records if e in r[4] and r[3]]) for e in endpoints}
+
+    timeline, waits = [], rec.server[0][1]["model_slots"]["waits"] if rec.server else 0
+    for w in range(int(np.ceil(duration / interval))):
+        lo, hi = w * interval, (w + 1) * interval
+        window = [r for r in records if lo <= r[0] < hi]
+        row = {"t": round(hi, 1), **_stats(window, interval)}
+        row["latency"] = {k: v for k, v in (row["latency"] or {}).items() if k in ("p50_ms", "p99_ms")}
+        if rec.dropped:
+            row["dropped"] = sum(1 for t in rec.dropped if lo <= t < hi)
+        snaps = [s for t, s in rec.server if lo <= t < hi]
+        if snaps:
+            s = snaps[-1]
+            row["server"] = {
+                "claims_in_flight": s["claims_in_flight"],
+                "threadpool_busy": s["threadpool"]["busy"],
+                "model_queue": s["model_executor"]["queued"],
+                "model_slot_waits": s["model_slots"]["waits"] - waits,    # in this window
+            }
+            waits = s["model_slots"]["waits"]
+        timeline.append(row)
+    report["timeline"] = timeline
+    return report
+
+
+# ----------------------------
+# Server
+# ----------------------------
+def prepare_stub_backend(args):
+    """Synthetic data + stub models + fake translator (benchmarks/offline); before backend is imported."""
+    from benchmarks.offline.run import configure_env, default_data_dir
+
+    configure_env(args.data_dir or default_data_dir(args.rows, 384, 0))
+    os.environ.setdefault("MODEL_WARMUP", "1")
+    from benchmarks.offline import stubs, synthetic
+    stubs.install(384, stubs.FakeTranslator(args.translate_ms))
+    synthetic.build(os.environ["FACT_DATA_DIR"], args.rows, 384, 0)
+
+
+def start_in_process(args):
+    import uvicorn
+    prepare_stub_backend(args)
+    from backend.app import app
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=args.port, log_level="warning"))
+    threading.Thread(target=server.run, name="uvicorn", daemon=True).start()
+    base = f"http://127.0.0.1:{args.port}"
+    deadline = time.time() + 300
+    while time.time() < deadline:
+        try:
+            _get(base + "/readyz")      # 503 (HTTPError) until the warmup is done
+            return base, server
+        except OSError:
+            time.sleep(0.2)
+    raise TimeoutError("in-process server did not become ready")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--url", help="load a running server instead of starting one in-process")
+    ap.add_argument("--serve", action="store_true", help="only run the stub server on --port")
+    ap.add_argument("--concurrency", type=int, nargs="+", help="closed loop: clients per level (default 10 50 200)")
+    ap.add_argument("--rate", type=float, nargs="+", help="open loop: requests per second per level")
+    ap.add_argument("--duration", type=float, default=30, help="measured seconds per level")
+    ap.add_argument("--warmup", type=float, default=5, help="unmeasured seconds before the first level")
+    ap.add_argument("--interval", type=float, default=5, help="timeline window in seconds")
+    ap.add_argument("--mix", default=DEFAULT_MIX, help=f"request kinds and weights (default {DEFAULT_MIX})")
+    ap.add_argument("--timeout", type=float, default=120, help="per HTTP call")
+    ap.add_argument("--max-inflight", type=int, default=1000, help="open loop: open requests before dropping")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--port", type=int, default=8766)
+    ap.add_argument("--rows", type=int, default=20000, help="in-process / --serve: synthetic fact base rows")
+    ap.add_argument("--translate-ms", type=float, default=50, help="in-process / --serve: fake translator latency")
+    ap.add_argument("--data-dir", help="in-process / --serve: synthetic data folder")
+    ap.add_argument("--out", help="write the JSON report here too")
+    args = ap.parse_args()
+
+    if args.serve:
+        import uvicorn
+        prepare_stub_backend(args)
+        from backend.app import app
+        uvicorn.run(app, host="0.0.0.0", port=args.port, log_level="warning")
+        return None
+
+    server = None
+    if args.url:
+        base = args.url.rstrip("/")
+    else:
+        base, server = start_in_process(args)
+
+    mix = parse_mix(args.mix)
+    requests = build_requests(mix, seed=args.seed)
+    if args.rate:
+        levels = [("rate", r) for r in args.rate]
+    else:
+        levels = [("concurrency", c) for c in (args.concurrency or [10, 50, 200])]
+
+    report = {"target": args.url or "in-process", "mix": mix, "duration": args.duration, "levels": []}
+    try:
+        if args.warmup:
+            closed_loop(base, requests, min(10, levels[0][1]) if levels[0][0] == "concurrency" else 4,
+                        args.warmup, args.timeout, Recorder())
+        for mode, value in levels:
+            rec, stop = Recorder(), threading.Event()
+            poller = threading.Thread(target=poll_server, args=(base, args.interval / 2, rec, stop), daemon=True)
+            poller.start()
+            if mode == "rate":
+                open_loop(base, requests, value, args.duration, args.timeout, args.max_inflight, rec)
+            else:
+                closed_loop(base, requests, int(value), args.duration, args.timeout, rec)
+            elapsed = time.perf_counter() - rec.t0     # includes the tail of open requests
+            stop.set()
+            level = {mode: value, **summarize(rec, max(args.duration, elapsed), args.interval)}
+            report["levels"].append(level)
+            lat = level["latency"] or {}
+            print(f"{mode}={value}: {level['throughput_rps']} req/s, p50 {lat.get('p50_ms')} ms, "
+                  f"p99 {lat.get('p99_ms')} ms, errors {level['errors']}/{level['requests']}", flush=True)
+    finally:
+        if server is not None:
+            server.should_exit = True
+
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text + "\n")
+    print(text)
+    return report
+
+
+if __name__ == "__main__":
+    main()
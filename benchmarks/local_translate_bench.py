@@ -0,0 +1,106 @@
+# benchmarks/local_translate_bench.py
+"""
+Throughput of the local translation backend (backend/translation_backends.py):
+one generate() per segment vs the batched engine (pairs grouped, padded,
+length-sorted batches).
+
+    python -m benchmarks.local_translate_bench                    # tiny stand-in model, offline
+    python -m benchmarks.local_translate_bench --model facebook/nllb-200-distilled-600M
+
+Without --model a tiny random Marian model (sentencepiece vocab of <= 40,
+d_model 16) is built in a temp dir. Its output is gibberish, but it runs
+the same tokenizer / padding / generate path as a real model in seconds
+and needs no download.
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+from backend.translation_backends import LocalTranslator
+
+WORDS = "the claim says vaccines cause harm but evidence from trials shows moon landing was real".split()
+
+
+def build_tiny_marian(out_dir):
+    import sentencepiece as spm
+    import torch
+    from transformers import MarianConfig, MarianMTModel, MarianTokenizer
+
+    rng = random.Random(0)
+    sents = [" ".join(rng.choices(WORDS, k=12)) for _ in range(300)]
+    spm.SentencePieceTrainer.train(
+        sentence_iterator=iter(sents), model_prefix=os.path.join(out_dir, "sp"), vocab_size=40, hard_vocab_limit=False,
+        pad_id=-1, bos_id=-1, eos_id=-1, unk_id=0, minloglevel=2,
+    )
+    sp = spm.SentencePieceProcessor(model_file=os.path.join(out_dir, "sp.model"))
+    vocab = {"</s>": 0, "<unk>": 1, "<pad>": 2}
+    for i in range(sp.get_piece_size()):
+        vocab.setdefault(sp.id_to_piece(i), len(vocab))
+    vocab_path = os.path.join(out_dir, "vocab.json")
+    with open(vocab_path, "w", encoding="utf-8") as f:
+        json.dump(vocab, f)
+
+    spm_path = os.path.join(out_dir, "sp.model")
+    tok = MarianTokenizer(spm_path, spm_path, vocab_path)
+    cfg = MarianConfig(
+        vocab_size=len(vocab), d_model=16, encoder_layers=1, decoder_layers=1,
+        encoder_attention_heads=2, decoder_attention_heads=2, encoder_ffn_dim=32, decoder_ffn_dim=32,
+        max_position_embeddings=256, pad_token_id=2, eos_token_id=0, decoder_start_token_id=2,
+    )
+    torch.manual_seed(0)
+    model_dir = os.path.join(out_dir, "model")
+    MarianMTModel(cfg).save_pretrained(model_dir)
+    tok.save_pretrained(model_dir)
+    return model_dir
+
+
+def make_segments(n, seed=0):
+    rng = random.Random(seed)
+    return [" ".join(rng.choices(WORDS, k=rng.randint(3, 40))) for _ in range(n)]
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--model", help="HF model id / path (default: tiny stand-in)")
+    ap.add_argument("--segments", type=int, default=256)
+    ap.add_argument("--batch-size", type=int, default=16)
+    ap.add_argument("--max-tokens", type=int, default=32)
+    ap.add_argument("--pairs", nargs="+", default=["en:hi", "hi:en", "en:ta"])
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        model = args.model or build_tiny_marian(tmp)
+        segments = make_segments(args.segments)
+        pairs = [p.split(":") for p in args.pairs]
+        work = [(s, *pairs[i % len(pairs)]) for i, s in enumerate(segments)]
+
+        single = LocalTranslator(model, batch_size=1, max_tokens=args.max_tokens)
+        batched = LocalTranslator(model, batch_size=args.batch_size, max_tokens=args.max_tokens)
+        single(["warmup"], *pairs[0])
+
+        t0 = time.perf_counter()
+        for text, src, tgt in work:
+            single._translate_items([(text, src, tgt)])
+        one_by_one = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        batched._translate_items(work)
+        grouped = time.perf_counter() - t0
+
+    res = {
+        "model": args.model or "tiny-marian",
+        "segments": args.segments,
+        "pairs": len(pairs),
+        "batch_size": args.batch_size,
+        "one_by_one_seg_per_s": round(args.segments / one_by_one, 1),
+        "batched_seg_per_s": round(args.segments / grouped, 1),
+        "speedup": round(one_by_one / grouped, 2),
+    }
+    print(json.dumps(res))
+    return res
+
+
+if __name__ == "__main__":
+    main()
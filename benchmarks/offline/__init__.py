@@ -0,0 +1,10 @@
+# benchmarks/offline
+"""
+Offline benchmark suite: synthetic fact base + deterministic stub models.
+
+    python -m benchmarks.offline --help
+
+synthetic.py   FactDrill-shaped parquet, embeddings and FAISS index at any scale
+stubs.py       tiny stand-in models and a fake translator with a set latency
+run.py         per-stage / end-to-end latency, throughput, peak RSS as JSON
+"""
@@ -0,0 +1,3 @@
+from benchmarks.offline.run import main
+
+main()
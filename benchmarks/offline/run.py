@@ -0,0 +1,267 @@
+# benchmarks/offline/run.py
+"""
+Offline benchmark: per-stage + end-to-end latency, throughput and peak RSS.
+
+    python -m benchmarks.offline                          # 20k rows, 200 claims
+    python -m benchmarks.offline --rows 200000 --concurrency 1 8 32 --out head.json
+    python -m benchmarks.offline --compare base.json      # deltas against an earlier run
+
+Needs no data files, model downloads or network: the fact base comes from
+synthetic.py (cached in --data-dir), the models and the translator from
+stubs.py. Absolute numbers say nothing about the real models; the point
+is comparing commits on the same machine with the same arguments.
+
+1. load      fact base snapshot (builds the fact store on first use) + model warmup
+2. stages    every claim through language → translate_claim → embed → retrieve
+             → rerank → stance → aggregate → fallback, one call at a time
+3. e2e       backend.app's /verify flow with N claims in flight (closed loop);
+             the per-claim stage split comes from its X-Debug-Timing breakdown
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import numpy as np
+
+SCHEMA = 1
+
+
+def _summary(ms):
+    if not ms:
+        return {"n": 0}
+    a = np.asarray(ms, dtype=float)
+    return {
+        "n": len(a),
+        "mean_ms": round(float(a.mean()), 3),
+        "p50_ms": round(float(np.percentile(a, 50)), 3),
+        "p95_ms": round(float(np.percentile(a, 95)), 3),
+        "p99_ms": round(float(np.percentile(a, 99)), 3),
+    }
+
+
+def _peak_rss_mb():
+    # ru_maxrss is KiB on Linux
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+def _git():
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=root, capture_output=True, text=True).stdout.strip()
+        dirty = bool(subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=root,
+                                    capture_output=True, text=True).stdout.strip())
+    except OSError:
+        return None
+    return {"commit": commit or None, "dirty": dirty}
+
+
+def default_data_dir(rows, dim, seed):
+    return os.path.join(tempfile.gettempdir(), f"factcheck-offline-r{rows}-d{dim}-s{seed}")
+
+
+def configure_env(data_dir):
+    """Point the backend at the synthetic data and the stubs; before anything imports backend."""
+    os.environ.update({
+        "FACT_DATA_DIR": data_dir,
+        "EMB_MODEL": "stub/embedder",
+        "CROSS_ENCODER_MODEL": "stub/reranker",
+        "NLI_MODEL": "stub/nli",
+        "FALLBACK_MODEL": "stub/fallback",
+        "ONNX_MODELS": "",
+        "TRANSLATE_BACKEND": "none",
+        "TRANSLATION_CACHE_PATH": "",
+        "VERDICT_CACHE_ITEMS": "0",
+        "SNAPSHOT_POLL_SECONDS": "0",
+        "NLTK_DOWNLOAD": "0",
+    })
+
+
+def fresh_translation_cache():
+    """Every measured run starts cold, so runs (and concurrency levels) see the same translator calls."""
+    from backend.translate import set_cache
+    from backend.translation_cache import TranslationCache
+    set_cache(TranslationCache(path=""))
+
+
+def bench_stages(claims, warmup, fallback):
+    from backend.reranker import rerank_with_cross_encoder
+    from backend.retrieval import embed_queries, retrieve_top_facts
+    from backend.stance_ml import aggregate_ml_verdict, classify_stance_ml
+    from backend.translate import detect_lang, translate_to_english
+
+    def timed(lat, name, fn, *a, **kw):
+        t = time.perf_counter()
+        out = fn(*a, **kw)
+        lat.setdefault(name, []).append((time.perf_counter() - t) * 1000)
+        return out
+
+    lat, total, verdicts = {}, [], {}
+    for n, claim in enumerate(claims):
+        if n == warmup:
+            fresh_translation_cache()
+        l = lat if n >= warmup else {}
+        t0 = time.perf_counter()
+        lang = timed(l, "language", detect_lang, claim)
+        claim_en = timed(l, "translate_claim", translate_to_english, claim, lang)
+        q = timed(l, "embed", embed_queries, [claim_en])
+        retrieved = timed(l, "retrieve", retrieve_top_facts, claim_en, q_vec=q)
+        reranked = timed(l, "rerank", rerank_with_cross_encoder, claim_en, retrieved)
+        stance = timed(l, "stance", classify_stance_ml, claim_en, reranked, claim_emb=q[0])
+        verdict, _ = timed(l, "aggregate", aggregate_ml_verdict, stance)
+        timed(l, "fallback", fallback.predict, claim_en)
+        if n >= warmup:
+            total.append((time.perf_counter() - t0) * 1000)
+            verdicts[verdict] = verdicts.get(verdict, 0) + 1
+    return {
+        "per_stage": {name: _summary(ms) for name, ms in lat.items()},
+        "chain": _summary(total),
+        "verdicts": verdicts,
+    }
+
+
+async def _drive(claims, concurrency):
+    from backend.app import _verify_claim
+
+    queue = list(reversed(claims))
+    latencies, stages, counts, sources, errors = [], {}, {}, {}, 0
+
+    async def client():
+        nonlocal errors
+        while queue:
+            claim = queue.pop()
+            t = time.perf_counter()
+            out = await _verify_claim(claim, debug=True)
+            latencies.append((time.perf_counter() - t) * 1000)
+            if out.get("verdict") == "ERROR":
+                errors += 1
+            debug = out.get("debug", {})
+            source = "fallback" if "fallback" in debug.get("stages_ms", {}) else "rag"
+            sources[source] = sources.get(source, 0) + 1
+            for name, ms in debug.get("stages_ms", {}).items():
+                stages.setdefault(name, []).append(ms)
+            for name, v in debug.get("counts", {}).items():
+                counts[name] = counts.get(name, 0) + v
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - t0
+    n = len(latencies)
+    return {
+        "claims": n,
+        "errors": errors,
+        "seconds": round(elapsed, 3),
+        "throughput_rps": round(n / elapsed, 2) if elapsed else None,
+        "latency": _summary(latencies),
+        "stages": {name: _summary(ms) for name, ms in sorted(stages.items())},
+        "per_claim": {name: round(v / n, 3) for name, v in sorted(counts.items())} if n else {},
+        "answered_by": sources,
+    }
+
+
+def bench_e2e(claims, warmup, levels):
+    asyncio.run(_drive(claims[:warmup], max(levels)))
+    runs = {}
+    for c in levels:
+        fresh_translation_cache()
+        runs[f"c{c}"] = asyncio.run(_drive(claims[warmup:], c))
+    return runs
+
+
+def _flatten(d, prefix=""):
+    for k, v in d.items():
+        key = f"{prefix}{k}"
+        if isinstance(v, dict):
+            yield from _flatten(v, key + ".")
+        elif isinstance(v, (int, float)) and not isinstance(v, bool):
+            yield key, v
+
+
+def compare(base, head):
+    """Relative change of every latency / throughput / memory number in both reports."""
+    keep = ("_ms", "throughput_rps", "peak_rss_mb", "rss_mb", "seconds")
+    b = dict(_flatten({k: base.get(k, {}) for k in ("load", "stages", "e2e", "memory")}))
+    h = dict(_flatten({k: head.get(k, {}) for k in ("load", "stages", "e2e", "memory")}))
+    rows = {}
+    for key in sorted(set(b) & set(h)):
+        if key.endswith(keep) and b[key]:
+            rows[key] = {"base": b[key], "head": h[key], "change_pct": round((h[key] - b[key]) / b[key] * 100, 1)}
+    return rows
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=20000, help="fact base rows")
+    ap.add_argument("--dim", type=int, default=384, help="embedding dimension")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--claims", type=int, default=200, help="measured claims per run")
+    ap.add_argument("--warmup", type=int, default=20, help="unmeasured claims before each run")
+    ap.add_argument("--foreign-share", type=float, default=0.3, help="share of non-English claims")
+    ap.add_argument("--concurrency", type=int, nargs="+", default=[1, 8], help="claims in flight (e2e)")
+    ap.add_argument("--translate-ms", type=float, default=50, help="fake translator latency per call")
+    ap.add_argument("--translate-segment-ms", type=float, default=0, help="plus this per segment")
+    ap.add_argument("--sentence-store", action="store_true", help="precompute sentence embeddings")
+    ap.add_argument("--data-dir", help="synthetic data folder (default: a per-parameter temp folder)")
+    ap.add_argument("--out", help="write the JSON report here too")
+    ap.add_argument("--compare", help="earlier JSON report to diff against")
+    args = ap.parse_args()
+    args.data_dir = args.data_dir or default_data_dir(args.rows, args.dim, args.seed)
+
+    configure_env(args.data_dir)
+    from benchmarks.offline import stubs, synthetic
+    translator = stubs.install(args.dim, stubs.FakeTranslator(args.translate_ms, args.translate_segment_ms))
+    data = synthetic.build(args.data_dir, args.rows, args.dim, args.seed, args.sentence_store)
+
+    import backend.app    # noqa: F401  (thread budget etc., as in the server)
+    from backend.ml_fallback import MLFallbackClassifier
+    from backend.models import current_rss_bytes, registry
+    from backend.retrieval import snapshots
+
+    t0 = time.perf_counter()
+    snap = snapshots.current()
+    registry.warmup()
+    load = {"seconds": round(time.perf_counter() - t0, 3), "rows": snap.ntotal,
+            "rss_mb": round((current_rss_bytes() or 0) / 2**20, 1)}
+
+    claims = synthetic.make_claims(args.claims + args.warmup, seed=args.seed + 1, foreign_share=args.foreign_share)
+    warm, measured = claims[:args.warmup], claims[args.warmup:]
+    stages = bench_stages(warm + measured, args.warmup, MLFallbackClassifier())
+    e2e = bench_e2e(warm + measured, args.warmup, args.concurrency)
+
+    import faiss
+    import torch
+    report = {
+        "schema": SCHEMA,
+        "git": _git(),
+        "machine": {"cpu_count": os.cpu_count(), "python": platform.python_version(),
+                    "torch": torch.__version__, "faiss": faiss.__version__, "numpy": np.__version__},
+        "config": {k: v for k, v in vars(args).items() if k not in ("out", "compare", "data_dir")},
+        "data": data,
+        "load": load,
+        "stages": stages,
+        "e2e": e2e,
+        "translator": {"calls": translator.calls, "segments": translator.segments},
+        "memory": {"peak_rss_mb": _peak_rss_mb()},
+    }
+    if args.compare:
+        with open(args.compare) as f:
+            base = json.load(f)
+        if base.get("config") != report["config"]:
+            print("warning: the runs used different arguments", file=sys.stderr)
+        report["compare"] = {"base_commit": (base.get("git") or {}).get("commit"), "changes": compare(base, report)}
+
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text + "\n")
+    print(text)
+    return report
+
+
+if __name__ == "__main__":
+    main()
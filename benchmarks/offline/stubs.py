@@ -0,0 +1,191 @@
+# benchmarks/offline/stubs.py
+"""
+Deterministic tiny stand-ins for the backend's models and translator.
+
+They expose the interfaces the backend calls, so the real code paths run
+around them (micro-batchers, model registry, thread budget, caches):
+
+StubEmbedder            SentenceTransformer.encode / get_sentence_embedding_dimension
+StubCrossEncoder        CrossEncoder.predict (1 label: reranker, 3 labels: NLI)
+stub_sequence_classifier  (tokenizer, model) pair like the fallback DeBERTa
+FakeTranslator          translate.set_translator() callable with a fixed latency
+
+Words are hashed with crc32 (not Python's salted hash) into a small
+torch EmbeddingBag whose weights come from a fixed seed, so the same
+text gives the same vector in every process. Pseudo-language text
+(synthetic.to_pseudo) is mapped back to English first, so the stub
+embedder is "multilingual" the way the fact base needs.
+"""
+import re
+import threading
+import time
+import zlib
+import numpy as np
+import torch
+from benchmarks.offline.synthetic import from_pseudo, to_pseudo
+
+BUCKETS = 1 << 14
+NEGATIONS = {"not", "no", "never", "denied", "fake", "false"}
+
+_word_re = re.compile(r"\w+")
+
+
+def _words(text: str):
+    return _word_re.findall(from_pseudo(text.lower()))
+
+
+def _ids(text: str):
+    words = _words(text)
+    grams = words + [a + " " + b for a, b in zip(words, words[1:])]
+    return [zlib.crc32(g.encode()) % BUCKETS for g in grams] or [0]
+
+
+class _HashEncoder(torch.nn.Module):
+    """Bag of hashed uni+bigrams -> one mixing layer -> unit vector."""
+
+    def __init__(self, dim: int, seed: int):
+        super().__init__()
+        g = torch.Generator().manual_seed(seed)
+        self.bag = torch.nn.EmbeddingBag(BUCKETS, dim, mode="sum")
+        self.mix = torch.nn.Linear(dim, dim)
+        with torch.no_grad():
+            self.bag.weight.copy_(torch.randn(BUCKETS, dim, generator=g))
+            self.mix.weight.copy_(torch.randn(dim, dim, generator=g) / dim ** 0.5)
+            self.mix.bias.zero_()
+        self.eval()
+
+    def forward(self, texts):
+        ids = [_ids(t) for t in texts]
+        flat = torch.tensor([i for row in ids for i in row], dtype=torch.long)
+        offsets = torch.tensor(np.cumsum([0] + [len(r) for r in ids[:-1]]), dtype=torch.long)
+        h = self.bag(flat, offsets)
+        h = h + 0.1 * torch.tanh(self.mix(h))
+        return torch.nn.functional.normalize(h, dim=1)
+
+
+class StubEmbedder(torch.nn.Module):
+    def __init__(self, dim: int = 384, seed: int = 0):
+        super().__init__()
+        self.dim = dim
+        self.encoder = _HashEncoder(dim, seed)
+
+    def get_sentence_embedding_dimension(self):
+        return self.dim
+
+    def encode(self, sentences, batch_size: int = 32, convert_to_numpy: bool = True,
+               convert_to_tensor: bool = False, **kwargs):
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        with torch.inference_mode():
+            parts = [self.encoder(texts[i:i + batch_size]) for i in range(0, len(texts), batch_size)]
+        out = torch.cat(parts) if parts else torch.zeros((0, self.dim))
+        if single:
+            out = out[0]
+        if convert_to_tensor:
+            return out.clone()
+        return out.numpy().astype(np.float32)
+
+
+class StubCrossEncoder(torch.nn.Module):
+    """num_labels=1: relevance logit; num_labels=3: NLI logits (contradiction, neutral, entailment)."""
+
+    def __init__(self, num_labels: int = 1, dim: int = 128, seed: int = 1):
+        super().__init__()
+        self.num_labels = num_labels
+        self.encoder = _HashEncoder(dim, seed)
+        self.head = torch.nn.Linear(2 * dim, num_labels)
+        with torch.no_grad():
+            g = torch.Generator().manual_seed(seed + 1)
+            self.head.weight.copy_(torch.randn(num_labels, 2 * dim, generator=g) * 0.05)
+            self.head.bias.zero_()
+
+    def predict(self, sentences, batch_size: int = 32, apply_softmax: bool = False, **kwargs):
+        pairs = list(sentences)
+        if not pairs:
+            return np.zeros((0,) if self.num_labels == 1 else (0, self.num_labels), dtype=np.float32)
+        out = []
+        with torch.inference_mode():
+            for i in range(0, len(pairs), batch_size):
+                chunk = pairs[i:i + batch_size]
+                a = self.encoder([p[0] for p in chunk])
+                b = self.encoder([p[1] for p in chunk])
+                cos = (a * b).sum(dim=1)
+                extra = self.head(torch.cat([a, b], dim=1))
+                if self.num_labels == 1:
+                    logits = 8 * cos - 4 + extra[:, 0]
+                else:
+                    flip = torch.tensor([(len(NEGATIONS & set(_words(x))) % 2) != (len(NEGATIONS & set(_words(y))) % 2)
+                                         for x, y in chunk], dtype=torch.float32)
+                    agree = 6 * cos
+                    logits = torch.stack([agree * flip, 2.0 + 0 * cos, agree * (1 - flip)], dim=1) + extra
+                    if apply_softmax:
+                        logits = torch.softmax(logits, dim=1)
+                out.append(logits)
+        return torch.cat(out).numpy()
+
+
+class _StubTokenizer:
+    def __call__(self, text, return_tensors=None, **kwargs):
+        return {"input_ids": torch.tensor([_ids(text)], dtype=torch.long)}
+
+
+class _StubClassifier(torch.nn.Module):
+    def __init__(self, seed: int = 2):
+        super().__init__()
+        g = torch.Generator().manual_seed(seed)
+        self.bag = torch.nn.EmbeddingBag(BUCKETS, 64, mode="mean")
+        self.out = torch.nn.Linear(64, 3)
+        with torch.no_grad():
+            self.bag.weight.copy_(torch.randn(BUCKETS, 64, generator=g))
+            self.out.weight.copy_(torch.randn(3, 64, generator=g))
+            self.out.bias.zero_()
+        self.eval()
+
+    def forward(self, input_ids, **kwargs):
+        class Output:
+            pass
+        o = Output()
+        o.logits = self.out(self.bag(input_ids))
+        return o
+
+
+def stub_sequence_classifier(seed: int = 2):
+    return _StubTokenizer(), _StubClassifier(seed)
+
+
+class FakeTranslator:
+    """`latency_ms` per call plus `per_segment_ms` per text; pseudo-languages translate exactly."""
+
+    def __init__(self, latency_ms: float = 50.0, per_segment_ms: float = 0.0):
+        self.latency = latency_ms / 1000
+        self.per_segment = per_segment_ms / 1000
+        self.calls = 0
+        self.segments = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, texts, source, target):
+        with self._lock:
+            self.calls += 1
+            self.segments += len(texts)
+        time.sleep(self.latency + self.per_segment * len(texts))
+        if target == "en":
+            return [from_pseudo(t) for t in texts]
+        return [to_pseudo(t, target) for t in texts]
+
+
+def install(dim: int = 384, translator: FakeTranslator = None):
+    """Put the stubs behind every registered model id and the translator; returns the translator."""
+    from backend import translate
+    from backend.models import CROSS_ENCODER_MODEL, EMB_MODEL, FALLBACK_MODEL, NLI_MODEL, registry
+
+    stubs = {
+        EMB_MODEL: ("sentence-transformer", lambda _id: StubEmbedder(dim=dim)),
+        CROSS_ENCODER_MODEL: ("cross-encoder", lambda _id: StubCrossEncoder(num_labels=1)),
+        NLI_MODEL: ("cross-encoder", lambda _id: StubCrossEncoder(num_labels=3)),
+        FALLBACK_MODEL: ("sequence-classifier", lambda _id: stub_sequence_classifier()),
+    }
+    for model_id, (kind, loader) in stubs.items():
+        registry.register(model_id, kind, evictable=model_id != EMB_MODEL, loader=loader, replace=True)
+    translator = translator or FakeTranslator()
+    translate.set_translator(translator)
+    return translator
@@ -0,0 +1,169 @@
+# benchmarks/offline/synthetic.py
+"""
+Synthetic FactDrill-shaped fact base.
+
+Same files and columns as the real data folder (backend/paths.py):
+
+    fact_base_clean.parquet   claim, summary, verdict, source, date, full_text, lang, summary_en
+    fact_embeddings.npy       float32 (rows, dim), stub embedder over `summary`
+    faiss_index.bin           built by backend.index_factory (FAISS_INDEX_TYPE)
+
+Summaries are a few template sentences each, about one of a fixed set of
+topics, about a third of them negated. Non-English rows are written in a
+pseudo-language: the English text with every letter moved into one
+Indian script, so backend.langid recognises the language from the script
+and the fake translator (stubs.py) can translate back exactly.
+
+Everything comes from one seed, so two runs with the same parameters
+build byte-identical data.
+"""
+import json
+import os
+import shutil
+import time
+import numpy as np
+
+DATA_VERSION = 1
+
+TOPICS = [
+    "vaccine", "election", "bridge", "flood", "currency note", "school", "hospital", "railway",
+    "cyclone", "exam", "water supply", "pension", "fuel price", "metro line", "airport", "festival",
+]
+PLACES = ["Mumbai", "Delhi", "Chennai", "Kolkata", "Pune", "Hyderabad", "Jaipur", "Lucknow", "Patna", "Kochi"]
+ACTORS = ["the government", "the state ministry", "the election commission", "the health department",
+          "the city council", "the police", "a viral post", "a news channel"]
+SENTENCES = [
+    "{actor} said the {topic} report from {place} is{neg} accurate.",
+    "Officials in {place} confirmed that the {topic} story was{neg} true.",
+    "The video about the {topic} in {place} was{neg} recorded this year.",
+    "Records show the {topic} announcement was{neg} made by {actor}.",
+    "Fact checkers found the {topic} photo from {place} was{neg} edited.",
+    "The claim that {actor} closed the {topic} in {place} is{neg} supported by documents.",
+    "Local reporters said the {topic} figures for {place} were{neg} correct.",
+    "An older article about the {topic} in {place} was{neg} shared with a new date.",
+]
+CLAIMS = [
+    "{actor} announced a new {topic} rule in {place}.",
+    "The {topic} in {place} was shut down last week.",
+    "A photo shows the {topic} in {place} after the storm.",
+    "{actor} denied the {topic} report from {place}.",
+]
+OFF_TOPIC = [
+    "Aliens landed near the old lighthouse on Tuesday.",
+    "Drinking coffee at midnight makes people taller.",
+    "A talking cat was elected mayor of a small town.",
+    "The ocean will turn purple next summer.",
+]
+
+# FactDrill is mostly English plus Indian languages; one script each
+SCRIPT_BLOCKS = {"ta": 0x0B80, "te": 0x0C00, "gu": 0x0A80, "ml": 0x0D00, "kn": 0x0C80, "bn": 0x0980}
+LANG_SHARES = {"en": 0.55, "ta": 0.1, "te": 0.08, "gu": 0.07, "ml": 0.07, "kn": 0.07, "bn": 0.06}
+VERDICTS = ["FALSE", "MISLEADING", "TRUE", "FAKE"]
+
+_ASCII = "abcdefghijklmnopqrstuvwxyz"
+
+
+def _script_letters(lang):
+    base = SCRIPT_BLOCKS[lang]
+    return "".join([chr(c) for c in range(base, base + 0x80) if chr(c).isalpha()][:len(_ASCII)])
+
+
+_TO_SCRIPT = {lang: str.maketrans(_ASCII + _ASCII.upper(), _script_letters(lang) * 2) for lang in SCRIPT_BLOCKS}
+_FROM_SCRIPT = {ord(ch): _ASCII[i] for lang in SCRIPT_BLOCKS for i, ch in enumerate(_script_letters(lang))}
+
+
+def to_pseudo(text: str, lang: str) -> str:
+    """English text written in `lang`'s script (identity for en and unknown languages)."""
+    table = _TO_SCRIPT.get(lang)
+    return text if table is None else text.translate(table)
+
+
+def from_pseudo(text: str) -> str:
+    """Inverse of to_pseudo() for every script (lower-cased letters)."""
+    return text.translate(_FROM_SCRIPT)
+
+
+def _fill(rng, template, topic=None, neg=None):
+    return template.format(
+        actor=ACTORS[rng.integers(len(ACTORS))],
+        topic=topic or TOPICS[rng.integers(len(TOPICS))],
+        place=PLACES[rng.integers(len(PLACES))],
+        neg=" not" if neg else "",
+    )
+
+
+def make_rows(rows: int, seed: int = 0, sentences=(3, 8)):
+    rng = np.random.default_rng(seed)
+    langs, shares = zip(*LANG_SHARES.items())
+    out = {c: [] for c in ("claim", "summary", "verdict", "source", "date", "full_text", "lang", "summary_en")}
+    for i in range(rows):
+        topic = TOPICS[rng.integers(len(TOPICS))]
+        neg = rng.random() < 0.33
+        n = int(rng.integers(sentences[0], sentences[1] + 1))
+        text_en = " ".join(_fill(rng, SENTENCES[rng.integers(len(SENTENCES))], topic, neg) for _ in range(n))
+        lang = langs[rng.choice(len(langs), p=shares)]
+        summary = to_pseudo(text_en, lang)
+        out["claim"].append(_fill(rng, CLAIMS[rng.integers(len(CLAIMS))], topic))
+        out["summary"].append(summary)
+        out["verdict"].append(VERDICTS[rng.integers(len(VERDICTS))])
+        out["source"].append(f"https://factcheck.example/{i}")
+        out["date"].append(f"20{18 + i % 6}-{1 + i % 12:02d}-{1 + i % 28:02d}")
+        out["full_text"].append(" ".join([summary] * 3))
+        out["lang"].append(lang)
+        out["summary_en"].append(text_en)
+    return out
+
+
+def make_claims(n: int, seed: int = 1, foreign_share: float = 0.3, off_topic_share: float = 0.1):
+    """Benchmark claims: on-topic ones (some negated), off-topic ones, a share written in pseudo-languages."""
+    rng = np.random.default_rng(seed)
+    foreign = [l for l in LANG_SHARES if l != "en"]
+    claims = []
+    for _ in range(n):
+        if rng.random() < off_topic_share:
+            text = OFF_TOPIC[rng.integers(len(OFF_TOPIC))]
+        else:
+            text = _fill(rng, CLAIMS[rng.integers(len(CLAIMS))], neg=rng.random() < 0.3)
+        if rng.random() < foreign_share:
+            text = to_pseudo(text, foreign[rng.integers(len(foreign))])
+        claims.append(text)
+    return claims
+
+
+def build(data_dir: str, rows: int, dim: int, seed: int = 0, sentence_store: bool = False):
+    """Write the data folder unless it already holds these parameters; returns its meta dict."""
+    meta_path = os.path.join(data_dir, "synthetic.json")
+    wanted = {"version": DATA_VERSION, "rows": rows, "dim": dim, "seed": seed,
+              "index": os.getenv("FAISS_INDEX_TYPE", "flat")}
+    if os.path.exists(meta_path):
+        with open(meta_path) as f:
+            meta = json.load(f)
+        if {k: meta.get(k) for k in wanted} == wanted and (meta.get("sentence_store") or not sentence_store):
+            return dict(meta, cached=True)
+
+    import faiss
+    import pandas as pd
+    from backend.index_factory import build_index
+    from benchmarks.offline.stubs import StubEmbedder
+
+    os.makedirs(data_dir, exist_ok=True)
+    # derived from the old parquet by the backend; rebuilt on first use
+    for derived in ("fact_store", "sentences", "snapshots", "shards"):
+        shutil.rmtree(os.path.join(data_dir, derived), ignore_errors=True)
+    t0 = time.perf_counter()
+    df = pd.DataFrame(make_rows(rows, seed))
+    df.to_parquet(os.path.join(data_dir, "fact_base_clean.parquet"), index=False)
+
+    emb = StubEmbedder(dim=dim).encode(df["summary"].tolist(), batch_size=1024)
+    np.save(os.path.join(data_dir, "fact_embeddings.npy"), emb)
+    faiss.write_index(build_index(emb), os.path.join(data_dir, "faiss_index.bin"))
+
+    if sentence_store:
+        # through the backend's own builder, with the stub embedder installed
+        from backend.sentence_store import build_sentence_store
+        build_sentence_store(df["summary_en"].tolist(), os.path.join(data_dir, "sentences"))
+
+    meta = dict(wanted, sentence_store=sentence_store, build_seconds=round(time.perf_counter() - t0, 2))
+    with open(meta_path, "w") as f:
+        json.dump(meta, f)
+    return dict(meta, cached=False)
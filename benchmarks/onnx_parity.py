@@ -0,0 +1,208 @@
+# benchmarks/onnx_parity.py
+"""
+Accuracy parity + latency / memory of the ONNX int8 engine vs PyTorch.
+
+    python -m backend.onnx_engine export                    # once
+    python -m benchmarks.onnx_parity --claims held_out.txt  # one claim per line
+    python -m benchmarks.onnx_parity --n 200                # claims sampled from the fact base
+
+Each engine runs in a fresh interpreter (ONNX_MODELS="" vs "all") over
+the same claims and the full RAG chain: embed → retrieve → rerank → stance
+→ aggregate, plus the ML fallback.
+
+Parity report:
+- verdict agreement
+- embedding cosine
+- retrieval overlap
+- rerank, NLI and fallback score deltas
+- stance label agreement
+
+Performance report: per-stage p50/p95 latency, and RSS after warmup.
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import numpy as np
+
+ENGINES = {"torch": "", "onnx": "all"}
+
+
+def _ms(t0):
+    return (time.perf_counter() - t0) * 1000
+
+
+def run_engine(claims, out_path):
+    """Child process: every stage for every claim with the configured engine."""
+    from backend.ml_fallback import MLFallbackClassifier
+    from backend.models import current_rss_bytes, registry
+    from backend.reranker import rerank_with_cross_encoder
+    from backend.retrieval import embed_queries, retrieve_top_facts
+    from backend.stance_ml import aggregate_ml_verdict, classify_stance_ml
+
+    fallback = MLFallbackClassifier()
+    rss0 = current_rss_bytes()
+    t0 = time.perf_counter()
+    registry.warmup()
+    retrieve_top_facts("warmup")
+    load_s = time.perf_counter() - t0
+
+    records = []
+    for claim in claims:
+        rec, lat = {}, {}
+        t = time.perf_counter()
+        q = embed_queries([claim])
+        lat["embed"] = _ms(t)
+
+        t = time.perf_counter()
+        retrieved = retrieve_top_facts(claim, q_vec=q)
+        lat["retrieve"] = _ms(t)
+
+        t = time.perf_counter()
+        reranked = rerank_with_cross_encoder(claim, retrieved)
+        lat["rerank"] = _ms(t)
+
+        t = time.perf_counter()
+        stance = classify_stance_ml(claim, reranked, claim_emb=q[0])
+        verdict, conf = aggregate_ml_verdict(stance)
+        lat["stance"] = _ms(t)
+
+        t = time.perf_counter()
+        fb = fallback.predict(claim)
+        lat["fallback"] = _ms(t)
+
+        rec["vec"] = q[0].tolist()
+        rec["retrieved"] = [r["idx"] for r in retrieved]
+        rec["rerank"] = {str(r["idx"]): r["_rerank_score"] for r in reranked}
+        rec["stance"] = {str(s["idx"]): [s["stance"], s["nli_raw"]] for s in stance}
+        rec["verdict"], rec["confidence"] = verdict, float(conf)
+        rec["fallback"] = [fb["fallback_pred"], [fb["probs"][k] for k in ("contr", "neutral", "entail")]]
+        rec["latency_ms"] = lat
+        records.append(rec)
+
+    out = {
+        "load_seconds": round(load_s, 2),
+        "rss_mb": round((current_rss_bytes() or 0) / 2**20, 1),
+        "rss_growth_mb": round(((current_rss_bytes() or 0) - (rss0 or 0)) / 2**20, 1),
+        "models": {m: s.get("engine") for m, s in registry.memory_report()["models"].items()},
+        "records": records,
+    }
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump(out, f)
+
+
+def _spawn(engine, claims_path, out_path):
+    env = dict(os.environ, ONNX_MODELS=ENGINES[engine], MODEL_WARMUP="0")
+    subprocess.run(
+        [sys.executable, "-m", "benchmarks.onnx_parity", "--child", claims_path, out_path],
+        env=env, check=True,
+    )
+    with open(out_path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _max_delta(a, b):
+    return float(np.max(np.abs(np.asarray(a, dtype=float) - np.asarray(b, dtype=float))))
+
+
+def compare(ref, new):
+    cos, overlap, rerank_d, nli_d, fb_d = [], [], [], [], []
+    verdict_same = stance_same = stance_total = fb_same = 0
+    conf_d = []
+    for a, b in zip(ref["records"], new["records"]):
+        va, vb = np.asarray(a["vec"]), np.asarray(b["vec"])
+        cos.append(float(va @ vb / (np.linalg.norm(va) * np.linalg.norm(vb) + 1e-12)))
+        if a["retrieved"]:
+            overlap.append(len(set(a["retrieved"]) & set(b["retrieved"])) / len(a["retrieved"]))
+        for idx in set(a["rerank"]) & set(b["rerank"]):
+            rerank_d.append(abs(a["rerank"][idx] - b["rerank"][idx]))
+        for idx in set(a["stance"]) & set(b["stance"]):
+            stance_total += 1
+            stance_same += a["stance"][idx][0] == b["stance"][idx][0]
+            nli_d.append(_max_delta(a["stance"][idx][1], b["stance"][idx][1]))
+        verdict_same += a["verdict"] == b["verdict"]
+        conf_d.append(abs(a["confidence"] - b["confidence"]))
+        fb_same += a["fallback"][0] == b["fallback"][0]
+        fb_d.append(_max_delta(a["fallback"][1], b["fallback"][1]))
+
+    n = len(ref["records"])
+    stat = lambda xs: {"mean": round(float(np.mean(xs)), 5), "max": round(float(np.max(xs)), 5)} if xs else None
+    return {
+        "claims": n,
+        "verdict_agreement": round(verdict_same / n, 4),
+        "confidence_delta": stat(conf_d),
+        "embedding_cosine_mean": round(float(np.mean(cos)), 5),
+        "embedding_cosine_min": round(float(np.min(cos)), 5),
+        "retrieval_overlap": round(float(np.mean(overlap)), 4) if overlap else None,
+        "rerank_score_delta": stat(rerank_d),
+        "stance_label_agreement": round(stance_same / stance_total, 4) if stance_total else None,
+        "nli_prob_delta": stat(nli_d),
+        "fallback_agreement": round(fb_same / n, 4),
+        "fallback_prob_delta": stat(fb_d),
+    }
+
+
+def perf(result):
+    stages = result["records"][0]["latency_ms"].keys() if result["records"] else []
+    lat = {}
+    for s in stages:
+        xs = [r["latency_ms"][s] for r in result["records"]]
+        lat[s] = {"p50": round(float(np.percentile(xs, 50)), 2), "p95": round(float(np.percentile(xs, 95)), 2)}
+    return {
+        "load_seconds": result["load_seconds"],
+        "rss_mb": result["rss_mb"],
+        "rss_growth_mb": result["rss_growth_mb"],
+        "models": result["models"],
+        "latency_ms": lat,
+    }
+
+
+def sample_claims(n, seed=0):
+    """English first sentences of random fact-base rows."""
+    from backend.retrieval import current_snapshot
+    snap = current_snapshot()
+    col = "summary_en" if snap.has("summary_en") else "summary"
+    rng = random.Random(seed)
+    rows = rng.sample(range(snap.ntotal), min(n, snap.ntotal))
+    return [snap.text(col, i).split(". ")[0][:300] for i in rows]
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--claims", help="held-out claims, one per line")
+    ap.add_argument("--n", type=int, default=200, help="claims sampled from the fact base without --claims")
+    ap.add_argument("--child", nargs=2, metavar=("CLAIMS", "OUT"), help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.child:
+        with open(args.child[0], encoding="utf-8") as f:
+            run_engine(json.load(f), args.child[1])
+        return
+
+    if args.claims:
+        with open(args.claims, encoding="utf-8") as f:
+            claims = [line.strip() for line in f if line.strip()]
+    else:
+        claims = sample_claims(args.n)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        claims_path = os.path.join(tmp, "claims.json")
+        with open(claims_path, "w", encoding="utf-8") as f:
+            json.dump(claims, f)
+        results = {e: _spawn(e, claims_path, os.path.join(tmp, f"{e}.json")) for e in ENGINES}
+
+    report = {
+        "parity": compare(results["torch"], results["onnx"]),
+        "torch": perf(results["torch"]),
+        "onnx": perf(results["onnx"]),
+    }
+    print(json.dumps(report, indent=2))
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+# benchmarks/stance_cascade.py
+"""
+NLI compute and verdict agreement: cascade stance vs exhaustive.
+
+    python -m benchmarks.stance_cascade --claims held_out.txt   # one claim per line
+    python -m benchmarks.stance_cascade --n 200                 # claims sampled from the fact base
+
+Every claim is embedded, retrieved and reranked once. The stance step then
+runs in each configuration below over the same evidence. Reported against
+exhaustive mode:
+- verdict agreement
+- best-sentence agreement
+- NLI pairs run and the share saved
+- stance latency
+"""
+import argparse
+import json
+import time
+import numpy as np
+
+CONFIGS = {
+    "exhaustive": {"STANCE_MODE": "exhaustive"},
+    "cascade": {"STANCE_MODE": "cascade"},
+    "cascade_top3": {"STANCE_MODE": "cascade", "STANCE_TOP_M": 3},
+    "cascade_floor0.3": {"STANCE_MODE": "cascade", "STANCE_SIM_FLOOR": 0.3},
+    "cascade_stop70": {"STANCE_MODE": "cascade", "STANCE_EARLY_STOP": 70.0},
+}
+
+
+def main():
+    from backend import stance_ml
+    from backend.reranker import rerank_with_cross_encoder
+    from backend.retrieval import embed_queries, retrieve_top_facts
+    from benchmarks.onnx_parity import sample_claims
+
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--claims", help="held-out claims, one per line")
+    ap.add_argument("--n", type=int, default=200, help="claims sampled from the fact base without --claims")
+    args = ap.parse_args()
+
+    if args.claims:
+        with open(args.claims, encoding="utf-8") as f:
+            claims = [line.strip() for line in f if line.strip()]
+    else:
+        claims = sample_claims(args.n)
+
+    inputs = []
+    for claim in claims:
+        q = embed_queries([claim])
+        inputs.append((claim, rerank_with_cross_encoder(claim, retrieve_top_facts(claim, q_vec=q)), q[0]))
+
+    defaults = {k: getattr(stance_ml, k) for k in
+                ("STANCE_MODE", "STANCE_TOP_M", "STANCE_SIM_FLOOR", "STANCE_EARLY_STOP")}
+    runs = {}
+    for name, overrides in CONFIGS.items():
+        for k, v in {**defaults, **overrides}.items():
+            setattr(stance_ml, k, v)
+        before = stance_ml.stance_stats()
+        verdicts, best, lat = [], [], []
+        for claim, evidence, vec in inputs:
+            t = time.perf_counter()
+            stance = stance_ml.classify_stance_ml(claim, evidence, claim_emb=vec)
+            verdicts.append(stance_ml.aggregate_ml_verdict(stance)[0])
+            lat.append((time.perf_counter() - t) * 1000)
+            best.append([s["best_sentence"] for s in stance])
+        after = stance_ml.stance_stats()
+        runs[name] = {
+            "verdicts": verdicts,
+            "best": best,
+            "sentences": after["sentences"] - before["sentences"],
+            "nli_pairs": after["nli_pairs"] - before["nli_pairs"],
+            "p50_ms": round(float(np.percentile(lat, 50)), 2),
+            "p95_ms": round(float(np.percentile(lat, 95)), 2),
+        }
+
+    ref = runs["exhaustive"]
+    report = {"claims": len(claims)}
+    for name, r in runs.items():
+        ev_total = sum(len(b) for b in ref["best"])
+        ev_same = sum(x == y for a, b in zip(ref["best"], r["best"]) for x, y in zip(a, b))
+        report[name] = {
+            "verdict_agreement": round(float(np.mean([a == b for a, b in zip(ref["verdicts"], r["verdicts"])])), 4),
+            "best_sentence_agreement": round(ev_same / ev_total, 4) if ev_total else None,
+            "nli_pairs": r["nli_pairs"],
+            "nli_saved": round(1 - r["nli_pairs"] / r["sentences"], 4) if r["sentences"] else 0.0,
+            "stance_p50_ms": r["p50_ms"],
+            "stance_p95_ms": r["p95_ms"],
+        }
+    print(json.dumps(report, indent=2))
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+# benchmarks/startup_rss.py
+"""
+Startup time + RSS of the retrieval data: old pandas/np.load path vs the
+memory-mapped fact store. Every mode runs in a fresh interpreter.
+
+    python -m benchmarks.startup_rss --data-dir <dir with fact_base_clean.parquet,
+                                                 fact_embeddings.npy, faiss_index.bin>
+    python -m benchmarks.startup_rss --synthetic 22435     # FactDrill-sized fake base
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+
+def _rss_mb():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+
+def _load(mode, data_dir, lookups=200):
+    """Load everything retrieval.py needs, then look up `lookups` rows."""
+    rss0 = _rss_mb()
+    t0 = time.perf_counter()
+
+    import faiss
+    import numpy as np
+    index_path = os.path.join(data_dir, "faiss_index.bin")
+
+    if mode == "pandas":
+        import pandas as pd
+        embeddings = np.load(os.path.join(data_dir, "fact_embeddings.npy")).astype("float32")
+        df = pd.read_parquet(os.path.join(data_dir, "fact_base_clean.parquet"))
+        texts = df["summary"].fillna("")
+        index = faiss.read_index(index_path)
+        lookup = lambda i: str(texts.iloc[i])
+    else:
+        from backend.fact_store import FactStore, build_fact_store
+        store_dir = os.path.join(data_dir, "fact_store")
+        if not FactStore.exists(store_dir):
+            raise SystemExit("build the fact store first (python -m backend.fact_store)")
+        store = FactStore(store_dir)
+        try:
+            index = faiss.read_index(index_path, faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY)
+        except RuntimeError:
+            index = faiss.read_index(index_path)
+        lookup = lambda i: store.text("summary", i)
+
+    load_s = time.perf_counter() - t0
+    rng = random.Random(0)
+    t1 = time.perf_counter()
+    for _ in range(lookups):
+        lookup(rng.randrange(index.ntotal))
+    lookup_us = (time.perf_counter() - t1) / lookups * 1e6
+
+    return {
+        "mode": mode,
+        "startup_seconds": round(load_s, 3),
+        "rss_mb": round(_rss_mb() - rss0, 1),
+        "lookup_us": round(lookup_us, 2),
+    }
+
+
+def make_synthetic(data_dir, n, dim=768, seed=0):
+    """FactDrill-shaped base: short summaries, long full_text, random vectors."""
+    import faiss
+    import numpy as np
+    import pandas as pd
+    from backend.fact_store import build_fact_store
+
+    rng = np.random.default_rng(seed)
+    words = [f"w{i}" for i in range(5000)]
+    pick = lambda k: " ".join(words[j] for j in rng.integers(0, len(words), k))
+    df = pd.DataFrame({
+        "claim": [pick(15) for _ in range(n)],
+        "summary": [pick(40) for _ in range(n)],
+        "verdict": rng.choice(["FAKE", "REAL", "UNVERIFIED"], n),
+        "full_text": [pick(600) for _ in range(n)],
+    })
+    os.makedirs(data_dir, exist_ok=True)
+    df.to_parquet(os.path.join(data_dir, "fact_base_clean.parquet"))
+    emb = rng.standard_normal((n, dim), dtype=np.float32)
+    np.save(os.path.join(data_dir, "fact_embeddings.npy"), emb)
+    index = faiss.IndexFlatL2(dim)
+    index.add(emb)
+    faiss.write_index(index, os.path.join(data_dir, "faiss_index.bin"))
+    build_fact_store(
+        os.path.join(data_dir, "fact_base_clean.parquet"),
+        os.path.join(data_dir, "fact_store"),
+        os.path.join(data_dir, "fact_embeddings.npy"),
+    )
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--data-dir", default=os.getenv("FACT_DATA_DIR"))
+    ap.add_argument("--synthetic", type=int, default=0, help="generate a fake base with N rows")
+    ap.add_argument("--mode", choices=["pandas", "fact_store"], help="(internal) run one mode")
+    args = ap.parse_args()
+
+    if args.mode:
+        print(json.dumps(_load(args.mode, args.data_dir)))
+        return
+
+    tmp = None
+    if args.synthetic:
+        tmp = tempfile.TemporaryDirectory()
+        args.data_dir = tmp.name
+        make_synthetic(args.data_dir, args.synthetic)
+    if not args.data_dir:
+        raise SystemExit("--data-dir or --synthetic is required")
+
+    results = []
+    for mode in ("pandas", "fact_store"):
+        out = subprocess.run(
+            [sys.executable, "-m", "benchmarks.startup_rss", "--mode", mode, "--data-dir", args.data_dir],
+            capture_output=True, text=True, check=True,
+        )
+        results.append(json.loads(out.stdout.strip().splitlines()[-1]))
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+# benchmarks/translation_fanout.py
+"""
+Request-path translation latency: segments translated one after another
+(the old synchronous /verify) vs the async fan-out in backend/translate.py.
+A fake translator with a fixed per-call latency replaces Google, and the
+cache starts empty for every run, so only the call pattern is measured.
+
+    python -m benchmarks.translation_fanout
+    python -m benchmarks.translation_fanout --segments 4 12 24 --latency-ms 150
+"""
+import argparse
+import asyncio
+import json
+import time
+from backend import translate
+from backend.translation_cache import TranslationCache
+
+
+def fake_translator(latency_s):
+    def fn(texts, source, target):
+        time.sleep(latency_s)
+        return [f"[{target}] {t}" for t in texts]
+    return fn
+
+
+def _segments(n):
+    return [f"Evidence sentence number {i} about the claim." for i in range(n)]
+
+
+def run_serial(segments, target):
+    translate.set_cache(TranslationCache(path=None))
+    t0 = time.perf_counter()
+    for seg in segments:
+        translate.translate_batch([seg], "en", target)
+    return time.perf_counter() - t0
+
+
+def run_fanout(segments, target):
+    translate.set_cache(TranslationCache(path=None))
+    t0 = time.perf_counter()
+    asyncio.run(translate.translate_batch_async(segments, "en", target))
+    return time.perf_counter() - t0
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--segments", type=int, nargs="+", default=[1, 6, 11, 16])
+    ap.add_argument("--latency-ms", type=float, default=200)
+    ap.add_argument("--target", default="hi")
+    args = ap.parse_args()
+
+    translate.set_translator(fake_translator(args.latency_ms / 1000))
+    report = []
+    for n in args.segments:
+        segments = _segments(n)
+        serial = run_serial(segments, args.target)
+        fanout = run_fanout(segments, args.target)
+        res = {
+            "segments": n,
+            "latency_ms": args.latency_ms,
+            "serial_ms": round(serial * 1000, 1),
+            "fanout_ms": round(fanout * 1000, 1),
+            "speedup": round(serial / fanout, 2),
+        }
+        print(json.dumps(res), flush=True)
+        report.append(res)
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+# benchmarks/worker_scaling.py
+"""
+/verify throughput at 1, 2, 4 and 8 uvicorn workers.
+
+    python -m benchmarks.worker_scaling                       # budget on, 1/2/4/8 workers
+    python -m benchmarks.worker_scaling --workers 1 4 --compare
+    python -m benchmarks.worker_scaling --claims claims.txt --duration 60
+
+For each worker count a fresh `uvicorn backend.app:app --workers N` is
+started with WEB_CONCURRENCY=N (so backend/thread_budget.py splits the
+cores), warmed up, and driven by --clients closed-loop clients for
+--duration seconds. --compare repeats every run with THREAD_BUDGET=0,
+i.e. every library at its own thread defaults.
+
+The verdict cache is off so every request runs the full pipeline.
+"""
+import argparse
+import json
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+
+DEFAULT_CLAIMS = [
+    "The moon landing in 1969 was staged in a film studio.",
+    "Drinking hot water cures viral infections.",
+    "The government announced a new 2000 rupee note with a GPS chip.",
+    "A bridge collapsed in Mumbai after heavy rain last week.",
+    "The election commission extended voting hours in all states.",
+    "Vaccines cause more deaths than the diseases they prevent.",
+    "Schools will remain closed for the whole month due to floods.",
+    "The WHO declared the outbreak a global health emergency.",
+]
+
+
+def _get(url, timeout=5):
+    with urllib.request.urlopen(url, timeout=timeout) as r:
+        return json.loads(r.read())
+
+
+def _post(url, payload, timeout=120):
+    req = urllib.request.Request(url, json.dumps(payload).encode(), {"Content-Type": "application/json"})
+    with urllib.request.urlopen(req, timeout=timeout) as r:
+        return json.loads(r.read())
+
+
+def start_server(workers, port, budget):
+    base = f"http://127.0.0.1:{port}"
+    try:
+        _get(base + "/healthz", timeout=1)
+    except OSError:
+        pass
+    else:
+        raise RuntimeError(f"something is already serving on port {port}")
+    env = dict(os.environ, WEB_CONCURRENCY=str(workers), THREAD_BUDGET="1" if budget else "0",
+               VERDICT_CACHE_ITEMS="0", SNAPSHOT_POLL_SECONDS="0")
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.app:app", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning"],
+        env=env, start_new_session=True,
+    )
+    deadline = time.time() + 600
+    while time.time() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"server exited with {proc.returncode}")
+        try:
+            _get(base + "/readyz")      # 503 (HTTPError) until the workers are warm
+            return proc, base
+        except OSError:
+            time.sleep(0.5)
+    os.killpg(proc.pid, signal.SIGKILL)
+    raise TimeoutError("server did not come up")
+
+
+def drive(base, claims, clients, duration):
+    """Closed loop: each client sends its next claim as soon as the last one returns."""
+    latencies, errors = [], 0
+    lock = threading.Lock()
+    stop = time.perf_counter() + duration
+
+    def client(i):
+        nonlocal errors
+        n = i
+        while time.perf_counter() < stop:
+            t = time.perf_counter()
+            try:
+                out = _post(base + "/verify", {"claim": claims[n % len(claims)]})
+                ok = out.get("verdict") != "ERROR"
+            except OSError:
+                ok = False
+            with lock:
+                if ok:
+                    latencies.append((time.perf_counter() - t) * 1000)
+                else:
+                    errors += 1
+            n += clients
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(clients) as pool:
+        list(pool.map(client, range(clients)))
+    elapsed = time.perf_counter() - t0
+
+    lat = np.array(latencies) if latencies else np.zeros(1)
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / elapsed, 2),
+        "p50_ms": round(float(np.percentile(lat, 50)), 1),
+        "p95_ms": round(float(np.percentile(lat, 95)), 1),
+        "p99_ms": round(float(np.percentile(lat, 99)), 1),
+    }
+
+
+def run(workers, budget, claims, args):
+    proc, base = start_server(workers, args.port, budget)
+    try:
+        # every worker loads its models on its first requests
+        drive(base, claims, max(args.clients, workers * 2), args.warmup)
+        layout = _get(base + "/admin/threads")
+        result = drive(base, claims, args.clients, args.duration)
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=60)
+        except subprocess.TimeoutExpired:
+            os.killpg(proc.pid, signal.SIGKILL)       # the workers too
+            proc.wait()
+    result["layout"] = {k: layout[k] for k in ("cores", "cores_per_worker", "model_concurrency",
+                                                "intra_op_threads", "torch_threads", "faiss_threads")}
+    return result
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    ap.add_argument("--clients", type=int, default=16, help="concurrent closed-loop clients")
+    ap.add_argument("--duration", type=float, default=30, help="measured seconds per run")
+    ap.add_argument("--warmup", type=float, default=10, help="unmeasured seconds per run")
+    ap.add_argument("--claims", help="claims, one per line")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--compare", action="store_true", help="also run with THREAD_BUDGET=0")
+    args = ap.parse_args()
+
+    if args.claims:
+        with open(args.claims, encoding="utf-8") as f:
+            claims = [line.strip() for line in f if line.strip()]
+    else:
+        claims = DEFAULT_CLAIMS
+
+    report = {"cpu_count": os.cpu_count(), "clients": args.clients, "runs": []}
+    for workers in args.workers:
+        for budget in ([True, False] if args.compare else [True]):
+            result = run(workers, budget, claims, args)
+            result.update({"workers": workers, "thread_budget": budget})
+            report["runs"].append(result)
+            print(f"workers={workers} budget={'on' if budget else 'off'}: "
+                  f"{result['throughput_rps']} req/s, p50 {result['p50_ms']} ms, "
+                  f"p99 {result['p99_ms']} ms, errors {result['errors']}", flush=True)
+    print(json.dumps(report, indent=2))
+    return report
+
+
+if __name__ == "__main__":
+    main()
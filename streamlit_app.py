@@ -169,132 +169,209 @@ claim = st.text_area("Enter a claim:", uploaded_text, height=120)
 run = st.button("🚀 Run Fact Check")
 
 # ================================================================
-# PROCESS CLAIM
+# RESULT VIEW
 # ================================================================
-if run:
-    if not claim.strip():
-        st.error("Please enter a claim first.")
+badge_map = {
+    "TRUE": "badge-true",
+    "FAKE": "badge-fake",
+    "USE_ML_MODEL": "badge-fallback",
+    "UNVERIFIED": "badge-unverified",
+}
+
+
+def render_result(data):
+    verdict = data.get("verdict", "")
+    conf = data.get("confidence", 0)
+    reason = data.get("reason", "")
+    evidence = data.get("evidence", [])
+
+    st.write("---")
+
+    # ============================================================
+    # VERDICT BADGE
+    # ============================================================
+    st.subheader("🏁 Final Verdict")
+    cls = badge_map.get(verdict, "badge-unverified")
+    st.markdown(f"<span class='{cls}'>{verdict}</span>", unsafe_allow_html=True)
+
+    # ============================================================
+    # ML FALLBACK UI (special view)
+    # ============================================================
+    if verdict == "USE_ML_MODEL":
+
+        st.markdown("### 🤖 ML Fallback Activated")
+
+        st.markdown("""
+            <div class='card' style='border-left: 6px solid #8b5cf6;'>
+                <h4 style='color:#d7c9ff;'>ML Classifier Used Instead of RAG</h4>
+                <p>
+                    The RAG retriever found evidence, but it was weak or irrelevant.
+                    A high-accuracy NLI classifier was used to determine the factuality.
+                </p>
+                <p style='font-size:13px;color:#9aa0a6;'>
+                    Model: <b>MoritzLaurer/DeBERTa-v3-base-mnli-fever-anli</b>
+                </p>
+            </div>
+        """, unsafe_allow_html=True)
+
+        # ML confidence bar
+        st.markdown("### 🎯 ML Confidence")
+
+        st.markdown(f"""
+            <div class="card" style="border-left:5px solid #8b5cf6;">
+                <div class="progress">
+                    <div class="bar" style="width:{conf}%; background:linear-gradient(90deg,#8b5cf6,#6366f1);height:14px;border-radius:8px;"></div>
+                </div>
+                <p style="margin-top:6px;"><b>{conf:.2f}% confidence</b></p>
+            </div>
+        """, unsafe_allow_html=True)
+
+        # ML reason
+        st.markdown("### 🧠 ML Explanation")
+        st.markdown(f"""
+            <div class="card" style="border-left:5px solid #8b5cf6;">
+                {reason}
+            </div>
+        """, unsafe_allow_html=True)
+
+        # No evidence section for ML fallback
+        st.subheader("🔍 Evidence Skipped")
+        st.info("RAG evidence was ignored because it failed evaluation. ML model handled the verdict.")
+
+        st.write("---")
+
     else:
-        with st.spinner("Analyzing with RAG + Stance + ML Fallback..."):
-            res = requests.post(f"{BACKEND_URL}/verify", json={"claim": claim})
+        # ============================================================
+        # NORMAL RAG UI
+        # ============================================================
+        st.markdown("### 🎯 Confidence Level")
+        st.progress(min(conf / 100, 1))
+        st.write(f"**{conf:.2f}% confidence**")
 
-        if not res.ok:
-            st.error("Backend Error!")
-            st.text(res.text)
-        else:
-            data = res.json()
-
-            verdict = data.get("verdict", "")
-            conf = data.get("confidence", 0)
-            reason = data.get("reason", "")
-            evidence = data.get("evidence", [])
-
-            st.write("---")
-
-            # ============================================================
-            # VERDICT BADGE
-            # ============================================================
-            badge_map = {
-                "TRUE": "badge-true",
-                "FAKE": "badge-fake",
-                "USE_ML_MODEL": "badge-fallback",
-                "UNVERIFIED": "badge-unverified",
-            }
-
-            st.subheader("🏁 Final Verdict")
-            cls = badge_map.get(verdict, "badge-unverified")
-            st.markdown(f"<span class='{cls}'>{verdict}</span>", unsafe_allow_html=True)
-
-            # ============================================================
-            # ML FALLBACK UI (special view)
-            # ============================================================
-            if verdict == "USE_ML_MODEL":
-
-                st.markdown("### 🤖 ML Fallback Activated")
-
-                st.markdown("""
-                    <div class='card' style='border-left: 6px solid #8b5cf6;'>
-                        <h4 style='color:#d7c9ff;'>ML Classifier Used Instead of RAG</h4>
-                        <p>
-                            The RAG retriever found evidence, but it was weak or irrelevant.
-                            A high-accuracy NLI classifier was used to determine the factuality.
-                        </p>
-                        <p style='font-size:13px;color:#9aa0a6;'>
-                            Model: <b>MoritzLaurer/DeBERTa-v3-base-mnli-fever-anli</b>
-                        </p>
-                    </div>
-                """, unsafe_allow_html=True)
+        st.markdown("### 🧠 Reason")
+        st.markdown(f"<div class='card'>{reason}</div>", unsafe_allow_html=True)
+
+        st.write("---")
 
-                # ML confidence bar
-                st.markdown("### 🎯 ML Confidence")
+        # ============================
+        # EVIDENCE SECTION
+        # ============================
+        st.subheader("🔍 Retrieved Evidence")
 
-                st.markdown(f"""
-                    <div class="card" style="border-left:5px solid #8b5cf6;">
-                        <div class="progress">
-                            <div class="bar" style="width:{conf}%; background:linear-gradient(90deg,#8b5cf6,#6366f1);height:14px;border-radius:8px;"></div>
+        if len(evidence) == 0:
+            st.info("No evidence available.")
+        else:
+            cols_per_row = 3
+            for i in range(0, len(evidence), cols_per_row):
+                cols = st.columns(cols_per_row)
+                for col, ev in zip(cols, evidence[i:i+cols_per_row]):
+                    text = (
+                        ev.get("summary_translated")
+                        or ev.get("summary_en")
+                        or "(translation unavailable)"
+                    )
+                    col.markdown(
+                        f"""
+                        <div class="card">
+                            <h4>📌 Evidence</h4>
+                            <p>{text}</p>
                         </div>
-                        <p style="margin-top:6px;"><b>{conf:.2f}% confidence</b></p>
-                    </div>
-                """, unsafe_allow_html=True)
+                        """,
+                        unsafe_allow_html=True
+                    )
+
+        st.write("---")
+
+    # ============================================================
+    # RAW JSON VIEW
+    # ============================================================
+    with st.expander("🛠 Developer View (Raw JSON Response)"):
+        timing = data.get("debug")
+        if timing:
+            st.markdown(f"**Stage timings** (total {timing.get('total_ms', 0):.0f} ms)")
+            stages = timing.get("stages_ms", {})
+            if stages:
+                st.bar_chart(stages)
+            if timing.get("counts"):
+                st.table([{"counter": k, "value": v} for k, v in timing["counts"].items()])
+        st.json(data)
 
-                # ML reason
-                st.markdown("### 🧠 ML Explanation")
-                st.markdown(f"""
-                    <div class="card" style="border-left:5px solid #8b5cf6;">
-                        {reason}
+
+# ================================================================
+# STREAMED PROGRESS
+# ================================================================
+def render_evidence_preview(box, evidence, stances, translations):
+    with box.container():
+        st.subheader("🔍 Retrieved Evidence")
+        cols_per_row = 3
+        for i in range(0, len(evidence), cols_per_row):
+            cols = st.columns(cols_per_row)
+            for col, ev in zip(cols, evidence[i:i+cols_per_row]):
+                text = translations.get(ev["summary_en"]) or ev["summary_en"]
+                stance = stances.get(ev["idx"], {}).get("stance") or "…"
+                col.markdown(
+                    f"""
+                    <div class="card">
+                        <h4>📌 Evidence · {stance}</h4>
+                        <p>{text}</p>
                     </div>
-                """, unsafe_allow_html=True)
-
-                # No evidence section for ML fallback
-                st.subheader("🔍 Evidence Skipped")
-                st.info("RAG evidence was ignored because it failed evaluation. ML model handled the verdict.")
-
-                st.write("---")
-
-            else:
-                # ============================================================
-                # NORMAL RAG UI
-                # ============================================================
-                st.markdown("### 🎯 Confidence Level")
-                st.progress(min(conf / 100, 1))
-                st.write(f"**{conf:.2f}% confidence**")
-
-                st.markdown("### 🧠 Reason")
-                st.markdown(f"<div class='card'>{reason}</div>", unsafe_allow_html=True)
-
-                st.write("---")
-
-                # ============================
-                # EVIDENCE SECTION
-                # ============================
-                st.subheader("🔍 Retrieved Evidence")
-
-                if len(evidence) == 0:
-                    st.info("No evidence available.")
-                else:
-                    cols_per_row = 3
-                    for i in range(0, len(evidence), cols_per_row):
-                        cols = st.columns(cols_per_row)
-                        for col, ev in zip(cols, evidence[i:i+cols_per_row]):
-                            text = (
-                                ev.get("summary_translated")
-                                or ev.get("summary_en")
-                                or "(translation unavailable)"
-                            )
-                            col.markdown(
-                                f"""
-                                <div class="card">
-                                    <h4>📌 Evidence</h4>
-                                    <p>{text}</p>
-                                </div>
-                                """,
-                                unsafe_allow_html=True
-                            )
-
-                st.write("---")
-
-            # ============================================================
-            # RAW JSON VIEW
-            # ============================================================
-            with st.expander("🛠 Developer View (Raw JSON Response)"):
-                st.json(data)
+                    """,
+                    unsafe_allow_html=True
+                )
+
+
+def stream_verify(claim):
+    """Show each stage of /verify/stream as it arrives; returns the final response."""
+    status = st.empty()
+    verdict_box = st.empty()
+    evidence_box = st.empty()
+    evidence, stances, translations = [], {}, {}
+    data = None
+
+    status.info("Detecting language...")
+    with requests.post(f"{BACKEND_URL}/verify/stream", json={"claim": claim},
+                       headers={"X-Debug-Timing": "1"}, stream=True) as res:
+        if not res.ok:
+            status.empty()
+            st.error("Backend Error!")
+            st.text(res.text)
+            return None
+        for line in res.iter_lines():
+            if not line:
+                continue
+            event = json.loads(line)
+            kind = event.pop("event")
+            if kind == "language":
+                status.info(f"Language: {event['lang']} • retrieving evidence...")
+            elif kind == "evidence":
+                evidence = event["items"]
+                status.info("Evidence retrieved • classifying stance...")
+            elif kind == "stance":
+                stances[event["idx"]] = event
+            elif kind == "verdict":
+                cls = badge_map.get(event["verdict"], "badge-unverified")
+                verdict_box.markdown(f"<span class='{cls}'>{event['verdict']}</span>", unsafe_allow_html=True)
+                status.info("Verdict ready • translating evidence...")
+            elif kind == "translation":
+                translations[event["text_en"]] = event["translated"]
+            elif kind == "result":
+                data = event
+            if kind in ("evidence", "stance", "translation") and evidence:
+                render_evidence_preview(evidence_box, evidence, stances, translations)
+
+    status.empty()
+    verdict_box.empty()
+    evidence_box.empty()
+    return data
+
+
+# ================================================================
+# PROCESS CLAIM
+# ================================================================
+if run:
+    if not claim.strip():
+        st.error("Please enter a claim first.")
+    else:
+        data = stream_verify(claim)
+        if data is not None:
+            render_result(data)
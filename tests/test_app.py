@@ -0,0 +1,80 @@
+# tests/test_app.py
+import asyncio
+import json
+import weakref
+from types import SimpleNamespace
+import httpx
+import numpy as np
+import pytest
+from backend import app as app_module
+from backend.verdict_cache import VerdictCache
+
+PIPELINE_EVENTS = ["claim", "evidence", "stance", "verdict", "translation"]
+
+
+@pytest.fixture
+def pipeline(monkeypatch):
+    """The app with the model stages replaced; records pipeline runs and their peak concurrency."""
+    state = SimpleNamespace(runs=[], running=0, peak=0)
+
+    async def translate_to_english(text, source=None, **_):
+        return text
+
+    async def run_pipeline(claim_en, claim_vec, user_lang, emit):
+        state.runs.append(claim_en)
+        state.running += 1
+        state.peak = max(state.peak, state.running)
+        try:
+            emit("evidence", items=[{"idx": 1, "summary_en": "a fact"}])
+            await asyncio.sleep(0.05)           # a second stream joins while this runs
+            emit("stance", idx=1, stance="refute", stance_confidence=90.0, best_sentence_en="a fact")
+            emit("verdict", verdict="False", confidence=90.0, fallback=False)
+            emit("translation", text_en="a fact", translated="a fact")
+            return {"verdict": "False", "confidence": 90.0, "evidence": []}
+        finally:
+            state.running -= 1
+
+    monkeypatch.setattr(app_module, "verdict_cache", VerdictCache(ttl=60, max_items=10, sim_threshold=1))
+    monkeypatch.setattr(app_module, "detect_lang", lambda text: "en")
+    monkeypatch.setattr(app_module, "translate_to_english_async", translate_to_english)
+    monkeypatch.setattr(app_module, "embed_queries", lambda texts: np.zeros((len(texts), 4), "float32"))
+    monkeypatch.setattr(app_module, "_run_pipeline", run_pipeline)
+    monkeypatch.setattr(app_module.snapshots, "version", lambda: 0)
+    return state
+
+
+def _run(*requests):
+    """Send (path, body, delay) requests concurrently; their responses in order."""
+    async def one(client, path, body, delay):
+        await asyncio.sleep(delay)
+        return await client.post(path, json=body)
+
+    async def main():
+        transport = httpx.ASGITransport(app=app_module.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await asyncio.gather(*(one(client, *r) for r in requests))
+    return asyncio.run(main())
+
+
+def test_coalesced_streams_get_every_event(pipeline):
+    responses = _run(("/verify/stream", {"claim": "The moon is cheese"}, 0),
+                     ("/verify/stream", {"claim": "the moon is  cheese"}, 0.02))
+
+    assert len(pipeline.runs) == 1          # one pipeline run for both streams
+    for response in responses:
+        events = [json.loads(line) for line in response.text.splitlines()]
+        assert [e["event"] for e in events] == ["language"] + PIPELINE_EVENTS + ["result"]
+        assert events[-1]["verdict"] == "False"
+        assert "ttfub_ms" in next(e for e in events if e["event"] == "evidence")
+
+
+def test_verify_batch_caps_claims_in_flight(pipeline, monkeypatch):
+    monkeypatch.setattr(app_module, "VERIFY_BATCH_CONCURRENCY", 3)
+    monkeypatch.setattr(app_module, "_batch_slots", weakref.WeakKeyDictionary())
+    claims = [f"claim number {i}" for i in range(10)]
+
+    (response,) = _run(("/verify-batch", {"claims": claims}, 0))
+
+    assert [r["verdict"] for r in response.json()["results"]] == ["False"] * 10
+    assert sorted(pipeline.runs) == sorted(claims)
+    assert pipeline.peak == 3
@@ -0,0 +1,106 @@
+# tests/test_batching.py
+import threading
+import time
+import pytest
+from backend.batching import MicroBatcher
+
+
+def _submit_together(batcher, requests):
+    """Submit every request from its own thread at once; [(result or exception)] in order."""
+    out = [None] * len(requests)
+    barrier = threading.Barrier(len(requests))
+
+    def call(i):
+        barrier.wait()
+        try:
+            out[i] = batcher.submit(requests[i])
+        except Exception as e:
+            out[i] = e
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(len(requests))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(timeout=10)
+    return out
+
+
+def test_every_caller_gets_its_own_slice():
+    batches = []
+
+    def double(items):
+        batches.append(list(items))
+        return [x * 2 for x in items]
+
+    batcher = MicroBatcher(double, name="test", max_batch_size=4, max_wait_ms=200)
+    requests = [[10 * i + j for j in range(i % 3 + 1)] for i in range(6)]
+    out = _submit_together(batcher, requests)
+
+    assert out == [[x * 2 for x in r] for r in requests]
+    assert len(batches) < len(requests)
+    assert all(len(b) <= 4 for b in batches)
+    assert sorted(x for b in batches for x in b) == sorted(x for r in requests for x in r)
+
+
+def test_oversized_request_runs_alone():
+    batches = []
+    batcher = MicroBatcher(lambda items: batches.append(list(items)) or list(items),
+                           name="test", max_batch_size=2, max_wait_ms=0)
+    assert batcher.submit(range(5)) == [0, 1, 2, 3, 4]
+    assert batches == [[0, 1, 2, 3, 4]]
+    assert batcher.submit([]) == []
+
+
+def test_error_reaches_every_caller_in_the_batch():
+    calls = []
+
+    def fail(items):
+        calls.append(list(items))
+        raise ValueError("model failed")
+
+    batcher = MicroBatcher(fail, name="test", max_batch_size=64, max_wait_ms=200)
+    out = _submit_together(batcher, [["a"], ["b", "c"], ["d"]])
+
+    assert all(isinstance(e, ValueError) and str(e) == "model failed" for e in out)
+    assert sum(len(c) for c in calls) == 4
+
+    # the worker survives a failed batch
+    batcher.fn = lambda items: [x.upper() for x in items]
+    assert batcher.submit(["e"]) == ["E"]
+
+
+# the worker re-raises the KeyboardInterrupt on purpose
+@pytest.mark.filterwarnings("ignore::pytest.PytestUnhandledThreadExceptionWarning")
+def test_base_exception_fails_the_waiting_callers_and_the_worker_restarts():
+    started, release = threading.Event(), threading.Event()
+
+    def interrupted(items):
+        if items == ["first"]:
+            started.set()
+            release.wait(5)
+            raise KeyboardInterrupt
+        return [x.upper() for x in items]
+
+    batcher = MicroBatcher(interrupted, name="test", max_batch_size=1, max_wait_ms=0)
+    out = {}
+
+    def call(name):
+        try:
+            out[name] = batcher.submit([name])
+        except BaseException as e:
+            out[name] = e
+
+    first = threading.Thread(target=call, args=("first",))
+    first.start()
+    assert started.wait(5)
+    queued = threading.Thread(target=call, args=("queued",))      # waits behind the interrupted batch
+    queued.start()
+    while not batcher._pending:
+        time.sleep(0.001)
+    release.set()
+    first.join(5)
+    queued.join(5)
+
+    assert isinstance(out["first"], KeyboardInterrupt)
+    assert isinstance(out["queued"], KeyboardInterrupt)
+    assert batcher.submit(["later"]) == ["LATER"]
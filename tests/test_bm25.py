@@ -0,0 +1,82 @@
+# tests/test_bm25.py
+import numpy as np
+import pytest
+from backend.bm25 import BM25Index, SparseIndex, build_bm25
+from benchmarks.offline.synthetic import make_rows
+
+
+def _zipf_corpus(n_docs, vocab, seed):
+    rng = np.random.default_rng(seed)
+    words = [f"w{i}" for i in range(vocab)]
+    docs = []
+    for _ in range(n_docs):
+        ids = np.minimum(rng.zipf(1.3, size=rng.integers(3, 40)), vocab) - 1
+        docs.append(" ".join(words[i] for i in ids))
+    return docs, words
+
+
+def _queries(words, n, seed):
+    rng = np.random.default_rng(seed)
+    # common and rare terms together, so some lists get probed
+    return [" ".join(words[int(i)] for i in np.minimum(rng.zipf(1.1, size=rng.integers(1, 6)), len(words)) - 1)
+            for _ in range(n)]
+
+
+def _segments(tmp_path, texts, n_segments, block):
+    bounds = np.linspace(0, len(texts), n_segments + 1).astype(int)
+    parts = []
+    for i in range(n_segments):
+        out = tmp_path / f"seg{i}"
+        build_bm25(texts[bounds[i]:bounds[i + 1]], str(out), block=block)
+        parts.append((int(bounds[i]), BM25Index(str(out))))
+    return SparseIndex(parts)
+
+
+def _assert_same_top_k(index, query, k):
+    scores, ids = index.search(query, k)
+    exact_scores, exact_ids = index.search(query, k, prune=False)
+    np.testing.assert_allclose(scores, exact_scores, rtol=1e-9, atol=1e-9)
+    if len(exact_scores) == 0:
+        return
+    # rows tied with the k-th best score may come back in either order
+    sure = exact_scores > exact_scores[-1] + 1e-9
+    assert set(ids[sure].tolist()) == set(exact_ids[sure].tolist())
+
+
+@pytest.mark.parametrize("n_segments", [1, 3])
+@pytest.mark.parametrize("k", [1, 10, 50])
+def test_maxscore_matches_exhaustive(tmp_path, n_segments, k):
+    texts, words = _zipf_corpus(3000, 400, seed=0)
+    index = _segments(tmp_path, texts, n_segments, block=16)
+    for query in _queries(words, 200, seed=1):
+        _assert_same_top_k(index, query, k)
+
+
+def test_maxscore_matches_exhaustive_on_synthetic_summaries(tmp_path):
+    texts = make_rows(2000, seed=0)["summary_en"]
+    index = _segments(tmp_path, texts, 2, block=32)
+    for query in texts[:100:5] + ["minister election 2021", "vaccine", "no such words here"]:
+        _assert_same_top_k(index, query, 10)
+
+
+def test_postings_and_probe_round_trip(tmp_path):
+    # gaps wide enough to need u16 and u32 lists
+    texts = ["" for _ in range(70000)]
+    for d in (0, 5, 300, 301, 65000, 69999):
+        texts[d] = "rare common"
+    for d in range(0, 70000, 7):
+        texts[d] = (texts[d] + " common").strip()
+    build_bm25(texts, str(tmp_path), block=8)
+    index = BM25Index(str(tmp_path))
+
+    from backend.bm25 import term_hash
+    for term in ("rare", "common"):
+        t = index.term(term_hash(term))
+        docs, impacts = index.postings(t)
+        expected = [d for d, text in enumerate(texts) if term in text.split()]
+        assert docs.tolist() == expected
+        probe_at = np.array(sorted({0, 1, 5, 300, 64999, 65000, 69999}), dtype=np.int64)
+        probed = index.probe(t, probe_at)
+        assert ((probed > 0) == np.isin(probe_at, docs)).all()
+        assert (probed[probed > 0] == impacts[np.searchsorted(docs, probe_at[probed > 0])]).all()
+    assert index.term(term_hash("absent")) is None
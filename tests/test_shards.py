@@ -0,0 +1,47 @@
+# tests/test_shards.py
+import numpy as np
+import pytest
+from backend import index_factory
+from backend.shards import build_shards, merge_topk, open_shards, search_index
+
+ROWS, DIM = 90, 16
+
+
+@pytest.fixture(scope="module")
+def data(tmp_path_factory):
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((ROWS, DIM)).astype("float32")
+    queries = rng.standard_normal((7, DIM)).astype("float32")
+    out = tmp_path_factory.mktemp("shards")
+    manifest = build_shards(vectors, str(out), 3, kind="flat", metric="l2")
+    assert [(s["start"], s["end"]) for s in manifest["shards"]] == [(0, 30), (30, 60), (60, 90)]
+    flat = index_factory.build_index(vectors, kind="flat", metric="l2")
+    return str(out), flat, queries
+
+
+@pytest.mark.parametrize("mode", ["local", "process"])
+@pytest.mark.parametrize("k", [1, 10, 45, 120])           # 45 > one shard's rows, 120 > all rows
+def test_sharded_search_matches_one_flat_index(data, mode, k):
+    directory, flat, queries = data
+    D_ref, I_ref = index_factory.search(flat, queries, k)
+    index = open_shards(directory, mode=mode)
+    try:
+        D, I = search_index(index, queries, k)
+    finally:
+        index.close()
+
+    assert I.shape == (len(queries), k)
+    np.testing.assert_array_equal(I, I_ref)
+    found = I >= 0
+    np.testing.assert_allclose(D[found], D_ref[found], rtol=1e-5, atol=1e-5)
+    assert found.sum(axis=1).tolist() == [min(k, ROWS)] * len(queries)
+    assert np.isinf(D[~found]).all()
+
+
+def test_merge_topk_pads_short_shards():
+    a = (np.array([[0.1, 0.5]], "float32"), np.array([[3, -1]]))
+    b = (np.array([[0.2, 0.3]], "float32"), np.array([[7, 8]]))
+    D, I = merge_topk([a, b], 4)
+    assert I.tolist() == [[3, 7, 8, -1]]
+    np.testing.assert_allclose(D[0, :3], [0.1, 0.2, 0.3])
+    assert np.isinf(D[0, 3])
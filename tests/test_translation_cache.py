@@ -0,0 +1,128 @@
+# tests/test_translation_cache.py
+import sqlite3
+import pytest
+from backend import translate, translation_cache
+from backend.translation_cache import TranslationCache
+
+
+class CountingTranslator:
+    def __init__(self, fail=False):
+        self.calls = []
+        self.fail = fail
+
+    def __call__(self, texts, source, target):
+        self.calls.append(list(texts))
+        if self.fail:
+            raise ConnectionError("translator unreachable")
+        return [f"[{target}] {t}" for t in texts]
+
+
+@pytest.fixture
+def translator():
+    old_translator, old_cache = translate._translator, translate.get_cache()
+    stub = CountingTranslator()
+    translate.set_translator(stub)
+    translate.set_cache(TranslationCache(path=None))
+    yield stub
+    translate.set_translator(old_translator)
+    translate.set_cache(old_cache)
+
+
+def _rows(path):
+    with sqlite3.connect(path) as db:
+        return db.execute("SELECT text FROM translations ORDER BY last_used").fetchall()
+
+
+def test_duplicates_are_translated_once_then_cached(translator):
+    out = translate.translate_batch(["Hello  world", "hello world", " Hello world ", "bye"], "en", "fr")
+    assert out == ["[fr] Hello world", "[fr] hello world", "[fr] Hello world", "[fr] bye"]
+    assert translator.calls == [["Hello world", "hello world", "bye"]]
+
+    assert translate.translate_batch(["Hello world", "bye"], "en", "fr") == ["[fr] Hello world", "[fr] bye"]
+    assert len(translator.calls) == 1
+    assert translate.get_cache().stats()["hits_memory"] == 2
+
+    # another direction is another key
+    translate.translate_batch(["bye"], "en", "de")
+    assert translator.calls[-1] == ["bye"]
+
+
+def test_disk_tier_survives_a_new_cache(translator, tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    translate.set_cache(TranslationCache(path=path))
+    translate.translate_batch(["one", "two"], "en", "fr")
+
+    reopened = TranslationCache(path=path, memory_items=10)
+    translate.set_cache(reopened)
+    assert translate.translate_batch(["two", "one"], "en", "fr") == ["[fr] two", "[fr] one"]
+    assert len(translator.calls) == 1
+    assert reopened.stats()["hits_disk"] == 2
+
+
+def test_memory_tier_is_an_lru():
+    cache = TranslationCache(path=None, memory_items=2)
+    cache.put("a", "en", "fr", "A")
+    cache.put("b", "en", "fr", "B")
+    assert cache.get_many(["a"], "en", "fr") == {"a": "A"}      # a is now the most recent
+    cache.put("c", "en", "fr", "C")
+    assert cache.get_many(["a", "b", "c"], "en", "fr") == {"a": "A", "c": "C"}
+
+
+def test_disk_tier_evicts_least_recently_used_past_the_cap(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    # each row is 10 + 10 bytes; the cap holds 4 of them, eviction trims to 90%
+    cache = TranslationCache(path=path, max_mb=80 / 2**20, memory_items=1)
+    for i in range(4):
+        cache.put(f"text {i:05d}", "en", "fr", f"tran {i:05d}")
+    cache.get_many(["text 00000"], "en", "fr")                  # refresh row 0 on disk
+    cache.put("text 00004", "en", "fr", "tran 00004")
+
+    texts = [t for (t,) in _rows(path)]
+    assert texts == ["text 00002", "text 00003", "text 00000", "text 00004"][-len(texts):]
+    assert "text 00001" not in texts
+    assert cache.stats()["disk_bytes"] <= 80
+
+
+def test_size_counts_rows_written_by_other_processes(tmp_path, monkeypatch):
+    monkeypatch.setattr(translation_cache, "SIZE_REFRESH_SECONDS", 0)     # re-read on every write
+    path = str(tmp_path / "cache.sqlite")
+    ours = TranslationCache(path=path, max_mb=100 / 2**20, memory_items=1)
+    ours.put("ours", "en", "fr", "ours")
+    theirs = TranslationCache(path=path, max_mb=0)               # another worker, no cap of its own
+    theirs.put_many([(f"row {i:06d}", f"out {i:06d}") for i in range(8)], "en", "fr")
+
+    ours.put("next", "en", "fr", "next")
+    assert ours.stats()["disk_bytes"] <= 100
+    assert len(_rows(path)) < 10
+
+
+def test_strict_raises_when_the_translator_fails(translator):
+    translator.fail = True
+    assert translate.translate_batch(["text"], "en", "fr") == ["text"]
+    with pytest.raises(RuntimeError, match="translation en→fr failed"):
+        translate.translate_batch(["text"], "en", "fr", strict=True)
+    assert translate.get_cache().get_many(["text"], "en", "fr") == {}
+
+
+def test_strict_raises_on_missing_segments(translator):
+    translate.set_translator(lambda texts, source, target: [""] * len(texts))
+    with pytest.raises(RuntimeError, match="no text"):
+        translate.translate_batch(["text"], "en", "fr", strict=True)
+
+
+def test_locked_database_falls_back_to_uncached(translator, tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    cache = TranslationCache(path=path)
+    translate.set_cache(cache)
+    translate.translate_batch(["warm"], "en", "fr")              # opens the file
+
+    lock = sqlite3.connect(path, timeout=0)
+    lock.execute("BEGIN EXCLUSIVE")
+    try:
+        cache._db.execute("PRAGMA busy_timeout = 0")
+        assert translate.translate_batch(["fresh"], "en", "fr") == ["[fr] fresh"]
+    finally:
+        lock.rollback()
+        lock.close()
+    assert translate.translate_batch(["fresh"], "en", "fr") == ["[fr] fresh"]
+    assert translator.calls[-1] == ["fresh"] and len(translator.calls) == 2   # kept in memory
@@ -0,0 +1,146 @@
+# tests/test_verdict_cache.py
+import asyncio
+from types import SimpleNamespace
+import pytest
+from backend import verdict_cache
+from backend.verdict_cache import VerdictCache, claim_key
+from benchmarks.offline.stubs import StubEmbedder
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = SimpleNamespace(t=1000.0)
+    monkeypatch.setattr(verdict_cache, "time", SimpleNamespace(time=lambda: now.t))
+    return now
+
+
+@pytest.fixture(scope="module")
+def embedder():
+    return StubEmbedder(dim=64)
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = VerdictCache(ttl=10, max_items=100, sim_threshold=1)
+    key = claim_key("  The  moon is made of cheese ", "en")
+    cache.put(key, {"verdict": "False"})
+
+    clock.t += 9
+    assert cache.get(claim_key("the moon is made of cheese", "en")) == {"verdict": "False", "cache": "exact"}
+    clock.t += 2
+    assert cache.get(key) is None
+    # expired entries are dropped by the next put
+    cache.put(claim_key("another claim", "en"), {"verdict": "True"})
+    assert cache.stats()["items"] == 1
+
+
+def test_oldest_entries_are_evicted_with_their_vectors(clock, embedder):
+    cache = VerdictCache(ttl=3600, max_items=2, sim_threshold=0.97)
+    claims = ["vaccines cause autism", "the earth is flat", "5g spreads viruses"]
+    for claim in claims:
+        clock.t += 1
+        cache.put(claim_key(claim, "en"), {"claim": claim}, vec=embedder.encode(claim))
+
+    assert cache.get(claim_key(claims[0], "en")) is None
+    assert cache.get(claim_key(claims[2], "en"))["claim"] == claims[2]
+    assert cache.stats()["vectors"] == 2
+    assert cache.get_similar(embedder.encode(claims[0]), "en") is None
+
+    hit = cache.get_similar(embedder.encode(claims[1]), "en")
+    assert hit["claim"] == claims[1] and hit["cache"] == "semantic"
+    assert cache.get_similar(embedder.encode(claims[1]), "fr") is None
+
+
+def test_put_from_an_older_snapshot_is_ignored(clock):
+    cache = VerdictCache(ttl=3600, max_items=10, sim_threshold=1)
+    cache.invalidate(version=2)
+    cache.put(claim_key("claim", "en"), {"verdict": "True"}, version=1)
+    assert cache.get(claim_key("claim", "en")) is None
+
+
+def test_single_flight_computes_once():
+    cache = VerdictCache()
+    calls = []
+
+    async def compute(emit):
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"verdict": "False"}
+
+    async def main():
+        return await asyncio.gather(*(cache.single_flight("k", compute) for _ in range(5)))
+
+    assert asyncio.run(main()) == [{"verdict": "False"}] * 5
+    assert len(calls) == 1
+    assert cache.stats()["coalesced"] == 4
+    assert cache.stats()["in_flight"] == 0
+
+
+def test_cancelled_caller_does_not_cancel_the_others():
+    cache = VerdictCache()
+    started = []
+
+    async def compute(emit):
+        started.append(1)
+        await asyncio.sleep(0.05)
+        return "done"
+
+    async def main():
+        leader = asyncio.ensure_future(cache.single_flight("k", compute))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(cache.single_flight("k", compute))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await follower
+
+    assert asyncio.run(main()) == "done"
+    assert len(started) == 1
+
+
+def test_computation_is_cancelled_once_nobody_waits():
+    cache = VerdictCache()
+    cancelled = []
+
+    async def compute(emit):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(1)
+            raise
+
+    async def main():
+        callers = [asyncio.ensure_future(cache.single_flight("k", compute)) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        for c in callers:
+            c.cancel()
+        await asyncio.gather(*callers, return_exceptions=True)
+        await asyncio.sleep(0)
+
+    asyncio.run(main())
+    assert cancelled == [1]
+    assert cache.stats()["in_flight"] == 0
+
+
+def test_every_caller_gets_the_events_late_joiners_replayed():
+    cache = VerdictCache()
+    seen = {"first": [], "late": []}
+
+    async def compute(emit):
+        emit("claim", text="a")
+        await asyncio.sleep(0.02)
+        emit("verdict", verdict="False")
+        return "done"
+
+    def recorder(name):
+        return lambda event, **data: seen[name].append((event, data))
+
+    async def main():
+        first = asyncio.ensure_future(cache.single_flight("k", compute, recorder("first")))
+        await asyncio.sleep(0.01)
+        late = asyncio.ensure_future(cache.single_flight("k", compute, recorder("late")))
+        return await asyncio.gather(first, late)
+
+    assert asyncio.run(main()) == ["done", "done"]
+    expected = [("claim", {"text": "a"}), ("verdict", {"verdict": "False"})]
+    assert seen == {"first": expected, "late": expected}